@@ -1,9 +1,30 @@
 """Budget application package split from budget.py.
 
 Modules:
-- config: configuration and DB path persistence
+- config: configuration and DB path persistence, kept in memory and flushed to budget.ini with debounced atomic writes
 - db: connection helpers
 - repository: data access functions (years, categories, budgets)
+- store: columnar in-memory transactions with NumPy aggregations
+- currency: as-of conversion of account amounts to the base currency
+- cache: warm-start cache written on exit, memory-mapped on launch
+- distribution: budget distribution rules, even or seasonal, per category or batched (Qt-free)
+- rolling: N-month windows spanning budget years
+- periods: weekly (ISO) and daily columns of a year, with budgets spread over days
+- schedule: projection of scheduled transactions (BILLSDEPOSITS_V1)
+- balances: daily running balance per account, projected with the scheduled transactions
+- forecast: year-end forecast per category (actuals, schedules, seasonality)
+- simulate: Monte Carlo year-end percentiles over a process pool
+- suggest: budget suggestions and seasonal profiles from the previous years' actuals
+- anomaly: robust z-scores (median/MAD) of monthly actuals against each category's history
+- search: full-text transaction search in an FTS5 sidecar index
+- tags: actuals per MMEX tag and per (tag, category) for the tag grid dimension
+- payees: per-payee monthly actuals of a category for the detail dialog
+- report: headless budget-vs-actual report rows
+- batch: parallel multi-database reports
+- consolidate: multi-database aggregates merged by category path
+- tasks: background work for the GUI
+- watcher: debounced DB change notifications
+- cli: `python -m budget_app` entry point
 - ui: UI helpers (items, delegates)
 """
 
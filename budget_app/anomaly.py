@@ -0,0 +1,129 @@
+"""Statistical outliers among the monthly actuals of every category.
+
+Each (category, month) actual is scored against the same category's
+previous N years of monthly actuals with a robust z-score: distance from the
+median in units of the scaled median absolute deviation (MAD), falling back
+to the mean absolute deviation where more than half of the months are equal.
+Months before the first recorded actual do not count as history, and months
+after today are not scored. All categories and months are scored at once
+from sliding windows over the year x month x category cube of the
+transaction store; scores are cached until the store changes.
+"""
+
+import threading
+import warnings
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .repository import fetch_actuals_for_years
+
+HISTORY_YEARS = 3
+# Iglewicz and Hoaglin's cut-off for the modified z-score
+OUTLIER_THRESHOLD = 3.5
+MIN_HISTORY_MONTHS = 6
+# Scale factors that make the MAD and the mean absolute deviation estimate the standard deviation
+_MAD_SCALE = 1.4826
+_MEAN_AD_SCALE = 1.2533
+
+_LOCK = threading.Lock()
+_cache: dict[tuple, tuple[int, "AnomalyScores"]] = {}
+
+
+@dataclass
+class AnomalyScores:
+    months: list[str]  # "YYYY-MM", in column order
+    categids: np.ndarray  # CATEGID, sorted
+    actual: np.ndarray  # category x month
+    median: np.ndarray  # category x month, of each month's history
+    spread: np.ndarray  # category x month, scaled MAD of each month's history
+    scores: np.ndarray  # category x month, NaN where the month cannot be scored
+
+    def row(self, categid) -> int | None:
+        idx = int(np.searchsorted(self.categids, int(categid)))
+        if idx < len(self.categids) and self.categids[idx] == int(categid):
+            return idx
+        return None
+
+    def outliers(self, threshold: float = OUTLIER_THRESHOLD) -> np.ndarray:
+        """category x month mask of the scores at or beyond ``threshold``."""
+        with np.errstate(invalid="ignore"):
+            return np.abs(self.scores) >= threshold
+
+
+def _month_position(month: str) -> int:
+    return int(month[:4]) * 12 + int(month[5:7]) - 1
+
+
+def _score(series: np.ndarray, positions: np.ndarray, window: int):
+    """(median, spread, scores) of ``series[positions]`` (month x category) against the previous ``window`` months."""
+    samples = sliding_window_view(series, window, axis=0)[positions - window]  # month x category x window
+    actual = series[positions]
+    with warnings.catch_warnings():
+        # Categories without history are all-NaN slices
+        warnings.simplefilter("ignore", RuntimeWarning)
+        median = np.nanmedian(samples, axis=2)
+        deviation = np.abs(samples - median[..., None])
+        spread = _MAD_SCALE * np.nanmedian(deviation, axis=2)
+        flat = ~(spread > 0)
+        spread[flat] = _MEAN_AD_SCALE * np.nanmean(deviation, axis=2)[flat]
+    count = np.count_nonzero(~np.isnan(samples), axis=2)
+    scores = np.full(actual.shape, np.nan)
+    np.divide(actual - median, spread, out=scores, where=(count >= MIN_HISTORY_MONTHS) & (spread > 0.005))
+    scores[np.isnan(actual)] = np.nan
+    return median, spread, scores
+
+
+def anomaly_scores(
+    months: list[str], account_ids=None, store=None, years: int = HISTORY_YEARS, as_of: date | None = None
+) -> AnomalyScores:
+    """Robust z-scores of the actuals of ``months`` ("YYYY-MM", ascending).
+
+    ``store`` is a ``TransactionStore``; without one the actuals come from
+    SQL and the result is not cached.
+    """
+    months = [str(m) for m in months if len(str(m)) == 7 and str(m)[:4].isdigit()]
+    accounts = tuple(sorted(int(a) for a in account_ids)) if account_ids else ()
+    as_of = as_of or date.today()
+    window = max(int(years), 1) * 12
+    key = (tuple(months), accounts, window, as_of.year * 12 + as_of.month - 1)
+    if store is not None:
+        with _LOCK:
+            cached = _cache.get(key)
+        if cached is not None and cached[0] == store.generation:
+            return cached[1]
+        generation = store.generation
+    if not months:
+        empty = np.zeros((0, 0))
+        return AnomalyScores(months, np.zeros(0, dtype=np.int64), empty, empty, empty, empty)
+
+    first_year, last_year = int(months[0][:4]) - window // 12, int(months[-1][:4])
+    if store is not None:
+        _, categids, cube = store.year_cube(first_year, last_year, list(accounts) or None)
+    else:
+        _, categids, cube = fetch_actuals_for_years(first_year, last_year, list(accounts) or None)
+    categids = np.asarray(categids, dtype=np.int64)
+    series = cube.reshape(len(cube) * 12, len(categids)).astype(float)  # month x category from January of first_year
+    # Months before the first actual or after today are unknown, not zero
+    origin = first_year * 12
+    observed = np.flatnonzero(series.any(axis=1))
+    known = np.arange(len(series))
+    known = (known >= (observed[0] if len(observed) else len(series))) & (known <= key[3] - origin)
+    series[~known] = np.nan
+
+    positions = np.array([_month_position(m) - origin for m in months], dtype=np.int64)
+    median, spread, scores = _score(series, positions, window)
+    result = AnomalyScores(
+        months=months,
+        categids=categids,
+        actual=np.nan_to_num(series[positions]).T,
+        median=median.T,
+        spread=spread.T,
+        scores=scores.T,
+    )
+    if store is not None:
+        with _LOCK:
+            _cache[key] = (generation, result)
+    return result
@@ -2,7 +2,9 @@ import sys
 import sqlite3
 from pathlib import Path
 from typing import Any
-from datetime import datetime
+from datetime import date, datetime
+
+import numpy as np
 
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
@@ -10,21 +12,46 @@ from PyQt6.QtWidgets import (
     QSizePolicy, QAbstractItemView, QToolButton, QStyle, QFrame,
     QDialog, QTableWidget, QTableWidgetItem, QAbstractScrollArea,
     QToolTip, QListView, QStyledItemDelegate, QStyleOptionViewItem,
+    QDateEdit, QSpinBox, QCheckBox, QDialogButtonBox, QFormLayout, QTableView, QCompleter,
+    QTabWidget,
 )
 from PyQt6.QtGui import QStandardItemModel, QColor, QFont, QBrush, QIcon, QStandardItem, QCursor
-from PyQt6.QtCore import Qt, QTimer, QModelIndex, QSize, QEvent
+from PyQt6.QtCore import Qt, QTimer, QModelIndex, QSize, QEvent, QDate
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
+from matplotlib import colormaps
+from matplotlib.ticker import FuncFormatter
 from . import config
+from .db import enable_memory_snapshot, disable_memory_snapshot
 from .repository import (
     load_budgetyear_map,
     load_categories,
     load_accounts,
     fetch_actuals_for_year,
+    fetch_actuals_for_years,
+    fetch_transaction_page,
     load_budgets_for_year,
     upsert_budget_entry,
     delete_budget_entry,
 )
+from .distribution import carried_balances, compute_budget_distribution
+from .consolidate import load_sources, merge_sources
+from .tasks import run_in_background
+from .watcher import DbChangeWatcher
+from .store import TransactionStore
+from .cache import check_fresh, load_warm_cache, save_warm_cache
+from .rolling import window_entries, window_frames, window_months
+from .schedule import projected_actuals
+from .forecast import year_end_forecast
+from .simulate import simulate_year_end
+from .suggest import SUGGEST_METHODS, seasonal_profiles, suggest_monthly_budgets
+from .search import SearchIndex
+from .tags import tag_aggregates
+from .payees import DEFAULT_TOP as PAYEE_TOP, OTHERS_LABEL as PAYEE_OTHERS_LABEL, payee_breakdown
+from .report import category_paths
+from .balances import BalanceLedger
+from .anomaly import OUTLIER_THRESHOLD, anomaly_scores
+from .periods import cumulative_daily_budget, period_bins, period_labels, prorate_budgets
 from .ui import (
     make_item,
     PeriodDelegate,
@@ -34,6 +61,8 @@ from .ui import (
     SummaryHeaderView,
     BudgetTreeView,
     CategoryDetailDelegate,
+    TransactionPageModel,
+    PeriodGridModel,
 )
 from .style import (
     CATEGORY_COLUMN_WIDTH,
@@ -54,6 +83,7 @@ from .style import (
     SUMMARY_ACTUAL_NEGATIVE_COLOR,
     SUMMARY_BUDGET_POSITIVE_COLOR,
     SUMMARY_BUDGET_NEGATIVE_COLOR,
+    SUMMARY_PROJECTED_COLOR,
     SUMMARY_DIFF_POSITIVE_COLOR,
     SUMMARY_DIFF_NEGATIVE_BG_COLOR,
     SUMMARY_DIFF_NEGATIVE_FG_COLOR,
@@ -82,6 +112,8 @@ MONTH_NAME_TO_NUMBER = {name: int(code) for code, name in ITALIAN_MONTH_NAMES.it
 ATTN_BASE_FORE_ROLE = Qt.ItemDataRole.UserRole + 10
 ATTN_BASE_BACK_ROLE = Qt.ItemDataRole.UserRole + 11
 ATTN_DIM_ROLE = Qt.ItemDataRole.UserRole + 12
+# Set on 'Reale' cells carrying an anomaly score tooltip
+ANOMALY_TIP_ROLE = Qt.ItemDataRole.UserRole + 13
 
 
 def get_resource_path(name: str) -> Path:
@@ -99,86 +131,6 @@ def diff_background(value: float) -> QBrush:
     return QBrush(DIFF_POSITIVE_COLOR if value >= 0 else DIFF_NEGATIVE_COLOR)
 
 
-def annual_total_from_period(amount, period, months_count):
-    months = months_count or 12
-    if amount is None:
-        return 0.0
-    amount = float(amount)
-    if period == "Yearly":
-        return amount
-    if period == "Quarterly":
-        return amount * 4.0
-    if period == "Weekly":
-        return amount * 52.0
-    return amount * months
-
-
-def compute_budget_distribution(year_amount, year_period, month_bids, overrides):
-    months_count = len(month_bids) or 0
-    expected_counts = {
-        "Monthly": 12,
-        "Yearly": 12,
-        "Weekly": 12,
-        "Quarterly": 4,
-    }
-    expected_count = expected_counts.get(year_period, 12 if months_count == 0 else months_count)
-    months_for_total = expected_count or months_count or 12
-
-    annual_total = annual_total_from_period(year_amount, year_period, months_for_total)
-    overrides = {bid: float(val) for bid, val in overrides.items() if val is not None}
-    sum_overrides = sum(overrides.values())
-    missing_bids = [bid for bid in month_bids if bid not in overrides]
-
-    has_annual = year_amount is not None and (year_period not in (None, "", "None"))
-    if not has_annual:
-        values = {}
-        for bid in month_bids:
-            values[bid] = overrides.get(bid, 0.0)
-        return values, sum_overrides, False, set(overrides.keys())
-
-    limited_view = bool(expected_count) and 0 < len(month_bids) < expected_count
-    over_limit = False
-    if annual_total is not None:
-        over_limit = abs(sum_overrides) > abs(annual_total)
-
-    values = {}
-    if limited_view:
-        for bid in month_bids:
-            values[bid] = overrides.get(bid, 0.0) or 0.0
-        if year_amount is not None:
-            total_display = annual_total
-        else:
-            total_display = sum(values.values())
-            over_limit = False
-        return values, total_display, over_limit, set(overrides.keys())
-
-    if over_limit:
-        total_display = sum_overrides
-        for bid in month_bids:
-            values[bid] = overrides.get(bid, 0.0)
-        return values, total_display, over_limit, set(overrides.keys())
-
-    total_display = annual_total
-    if not missing_bids:
-        for bid in month_bids:
-            values[bid] = overrides.get(bid, 0.0)
-        return values, sum_overrides, over_limit, set(overrides.keys())
-
-    remainder = annual_total - sum_overrides
-    share = remainder / len(missing_bids) if missing_bids else 0.0
-    for bid in month_bids:
-        if bid in overrides:
-            values[bid] = overrides[bid]
-        else:
-            values[bid] = share
-    if missing_bids:
-        diff = total_display - sum(values.values())
-        if abs(diff) > 1e-6:
-            last = missing_bids[-1]
-            values[last] += diff
-    return values, total_display, over_limit, set(overrides.keys())
-
-
 class AccountItemDelegate(QStyledItemDelegate):
     def paint(self, painter, option, index):
         opt = QStyleOptionViewItem(option)
@@ -189,13 +141,45 @@ class AccountItemDelegate(QStyledItemDelegate):
 
 
 class CategoryDetailDialog(QDialog):
-    def __init__(self, parent, category_name: str, main_category_name: str, year_text: str, data_provider, copy_handler, value_handler):
+    def __init__(
+        self,
+        parent,
+        category_name: str,
+        main_category_name: str,
+        year_text: str,
+        data_provider,
+        copy_handler,
+        value_handler,
+        source_provider=None,
+        seasonal_handler=None,
+        seasonal_checked: bool = False,
+        rollover_handler=None,
+        rollover_checked: bool = False,
+        drilldown_handler=None,
+        payee_provider=None,
+        period_series=None,
+        burndown_provider=None,
+    ):
         super().__init__(parent)
         self.setModal(True)
         self.setWindowTitle(f"Dettaglio categoria - {category_name}")
         self.data_provider = data_provider
         self.copy_handler = copy_handler
         self.value_handler = value_handler
+        self.source_provider = source_provider
+        self.seasonal_handler = seasonal_handler
+        self.rollover_handler = rollover_handler
+        self.drilldown_handler = drilldown_handler
+        self.payee_provider = payee_provider
+        # (granularity, labels, actuals, budgets) when the grid shows weeks or days
+        self.period_series = period_series
+        # () -> (year, cumulative actuals per day, 12 month budgets) or None
+        self.burndown_provider = burndown_provider
+        # Line2D artists of the burn-down chart, kept while it stays on screen
+        self._burndown_artists = None
+        # Fetched the first time the payee chart is shown
+        self._payee_breakdown = None
+        self._chart_rows: list[dict[str, Any]] = []
         self._category_name = category_name
         self._main_category_name = main_category_name
         self._bulk_budget_indexes: list[QModelIndex] = []
@@ -246,6 +230,24 @@ class CategoryDetailDialog(QDialog):
         self.match_all_btn = QPushButton("Pareggia tutto")
         self.match_all_btn.clicked.connect(self._match_actual_values)
         value_controls_layout.addWidget(self.match_all_btn)
+        if self.seasonal_handler is not None:
+            self.seasonal_check = QCheckBox("Stagionale")
+            self.seasonal_check.setToolTip(
+                "Distribuisce il budget annuale sui mesi senza importo\n"
+                "secondo la stagionalità degli anni precedenti"
+            )
+            self.seasonal_check.setChecked(seasonal_checked)
+            self.seasonal_check.toggled.connect(self._on_seasonal_toggled)
+            value_controls_layout.addWidget(self.seasonal_check)
+        if self.rollover_handler is not None:
+            self.rollover_check = QCheckBox("Riporto")
+            self.rollover_check.setToolTip(
+                "Aggiunge la riga Disponibile: quanto resta (o è sforato)\n"
+                "di ogni mese si riporta ai mesi successivi"
+            )
+            self.rollover_check.setChecked(rollover_checked)
+            self.rollover_check.toggled.connect(self.rollover_handler)
+            value_controls_layout.addWidget(self.rollover_check)
 
         header_layout = QHBoxLayout()
         header_layout.setContentsMargins(0, 0, 0, 0)
@@ -286,6 +288,75 @@ class CategoryDetailDialog(QDialog):
         layout.addWidget(self.table, alignment=Qt.AlignmentFlag.AlignHCenter)
         layout.addSpacing(12)
 
+        self.sources_table: QTableWidget | None = None
+        if self.source_provider is not None:
+            sources_label = QLabel("Dettaglio per database:")
+            sources_label.setFont(header_font)
+            layout.addWidget(sources_label)
+            self.sources_table = QTableWidget(0, 4, self)
+            self.sources_table.setHorizontalHeaderLabels(["Database", "Reale", "Budget", "Diff"])
+            self.sources_table.setFont(popup_font)
+            self.sources_table.horizontalHeader().setFont(popup_font)
+            self.sources_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+            self.sources_table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+            self.sources_table.verticalHeader().setVisible(False)
+            self.sources_table.setSizeAdjustPolicy(QAbstractScrollArea.SizeAdjustPolicy.AdjustToContents)
+            for col, width in enumerate((260, 120, 110, 120)):
+                self.sources_table.setColumnWidth(col, width)
+            layout.addWidget(self.sources_table, alignment=Qt.AlignmentFlag.AlignHCenter)
+            layout.addSpacing(12)
+
+        self.chart_mode_cb: QComboBox | None = None
+        self.budget_line_cb: QComboBox | None = None
+        self.payees_table: QTableWidget | None = None
+        if self.payee_provider is not None or self.burndown_provider is not None:
+            chart_mode_layout = QHBoxLayout()
+            chart_mode_layout.setContentsMargins(0, 0, 0, 0)
+            chart_mode_label = QLabel("Grafico:")
+            chart_mode_label.setFont(self._item_font)
+            chart_mode_layout.addWidget(chart_mode_label)
+            self.chart_mode_cb = QComboBox()
+            self.chart_mode_cb.addItem("Andamento", "trend")
+            tooltip_lines = []
+            if self.burndown_provider is not None:
+                self.chart_mode_cb.addItem("Burn-down giornaliero", "burndown")
+                tooltip_lines.append("Burn-down: reale cumulativo giorno per giorno contro la linea di budget")
+            if self.payee_provider is not None:
+                self.chart_mode_cb.addItem("Beneficiari", "payees")
+                tooltip_lines.append(
+                    f"Beneficiari: i primi {PAYEE_TOP} beneficiari per mese e per anno,\n"
+                    "gli altri raggruppati in \"Altri\""
+                )
+            self.chart_mode_cb.setToolTip("\n".join(tooltip_lines))
+            self.chart_mode_cb.currentIndexChanged.connect(self._on_chart_mode_changed)
+            chart_mode_layout.addWidget(self.chart_mode_cb)
+            if self.burndown_provider is not None:
+                self.budget_line_cb = QComboBox()
+                self.budget_line_cb.addItem("Budget stagionale", "seasonal")
+                self.budget_line_cb.addItem("Budget lineare", "linear")
+                self.budget_line_cb.setToolTip(
+                    "Stagionale: ogni mese consuma il proprio budget;\n"
+                    "lineare: il budget annuale distribuito uniformemente sui giorni"
+                )
+                self.budget_line_cb.currentIndexChanged.connect(lambda _: self._update_chart(self._chart_rows))
+                self.budget_line_cb.setVisible(False)
+                chart_mode_layout.addWidget(self.budget_line_cb)
+            chart_mode_layout.addStretch()
+            layout.addLayout(chart_mode_layout)
+        if self.payee_provider is not None:
+            self.payees_table = QTableWidget(0, 3, self)
+            self.payees_table.setHorizontalHeaderLabels(["Beneficiario", "Reale", "%"])
+            self.payees_table.setFont(popup_font)
+            self.payees_table.horizontalHeader().setFont(popup_font)
+            self.payees_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+            self.payees_table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+            self.payees_table.verticalHeader().setVisible(False)
+            self.payees_table.setSizeAdjustPolicy(QAbstractScrollArea.SizeAdjustPolicy.AdjustToContents)
+            for col, width in enumerate((260, 120, 70)):
+                self.payees_table.setColumnWidth(col, width)
+            self.payees_table.setVisible(False)
+            layout.addWidget(self.payees_table, alignment=Qt.AlignmentFlag.AlignHCenter)
+
         self.chart_figure = Figure(figsize=(5.6, 4.8), dpi=100)
         self.chart_canvas = FigureCanvasQTAgg(self.chart_figure)
         self.chart_canvas.setMinimumHeight(440)
@@ -312,7 +383,9 @@ class CategoryDetailDialog(QDialog):
 
         self._reloading = False
         self.table.itemChanged.connect(self._on_item_changed)
+        self.table.cellDoubleClicked.connect(self._on_cell_double_clicked)
         self._reload()
+        self._populate_sources()
 
     def _compose_header_text(self) -> str:
         main_name = (self._main_category_name or "").strip()
@@ -351,6 +424,7 @@ class CategoryDetailDialog(QDialog):
             label_item.setForeground(QBrush(QColor("#111")))
             label_item.setFlags(label_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
             label_item.setFont(self._item_font)
+            label_item.setData(Qt.ItemDataRole.UserRole, row.get("column"))
             self.table.setItem(row_idx, 0, label_item)
 
             actual_item = QTableWidgetItem(row.get("actual_text", "0"))
@@ -472,6 +546,27 @@ class CategoryDetailDialog(QDialog):
         self.table.setMaximumHeight(total_height)
         self._reloading = False
 
+    def _populate_sources(self):
+        if self.sources_table is None:
+            return
+        rows = self.source_provider() or []
+        self.sources_table.setRowCount(len(rows))
+        for row_idx, (source_name, actual_value, budget_value) in enumerate(rows):
+            diff_value = actual_value - budget_value
+            cells = [
+                QTableWidgetItem(source_name),
+                QTableWidgetItem(format_diff_value(actual_value)),
+                QTableWidgetItem(format_diff_value(budget_value)),
+                QTableWidgetItem(format_diff_value(diff_value)),
+            ]
+            cells[3].setBackground(diff_background(diff_value))
+            for col, cell in enumerate(cells):
+                cell.setFont(self._item_font)
+                if col > 0:
+                    cell.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.sources_table.setItem(row_idx, col, cell)
+        self.sources_table.resizeRowsToContents()
+
     def _copy_and_refresh(self, model_index):
         if self.copy_handler:
             self.copy_handler(model_index)
@@ -492,6 +587,15 @@ class CategoryDetailDialog(QDialog):
     def _update_chart(self, rows: list[dict[str, Any]]):
         if not hasattr(self, "chart_figure"):
             return
+        self._chart_rows = rows or []
+        mode = self.chart_mode_cb.currentData() if self.chart_mode_cb is not None else "trend"
+        if mode == "burndown":
+            self._update_burndown_chart()
+            return
+        self._burndown_artists = None
+        if mode == "payees":
+            self._update_payee_chart()
+            return
         QToolTip.hideText()
         self.chart_figure.clear()
         self.chart_figure.set_facecolor("#f8fafc")
@@ -503,39 +607,42 @@ class CategoryDetailDialog(QDialog):
         actual_values: list[float] = []
         budget_values: list[float] = []
 
-        for row in rows or []:
-            if row.get("row_role") != "month":
-                continue
-            label = str(row.get("label", "")).strip()
-            actual_val = row.get("actual_value")
-            if actual_val is None:
-                try:
-                    text = str(row.get("actual_text", "0")).replace(" ", "").replace(",", "")
-                    actual_val = float(text) if text else 0.0
-                except Exception:
-                    actual_val = 0.0
-            budget_val = None
-            try:
-                budget_val = float(row.get("budget_value"))  # type: ignore[arg-type]
-            except (TypeError, ValueError):
+        if self.period_series is not None:
+            _, labels, actual_values, budget_values = self.period_series
+        else:
+            for row in rows or []:
+                if row.get("row_role") != "month":
+                    continue
+                label = str(row.get("label", "")).strip()
+                actual_val = row.get("actual_value")
+                if actual_val is None:
+                    try:
+                        text = str(row.get("actual_text", "0")).replace(" ", "").replace(",", "")
+                        actual_val = float(text) if text else 0.0
+                    except Exception:
+                        actual_val = 0.0
                 budget_val = None
-            if budget_val is None:
                 try:
-                    budget_text = str(row.get("budget_text", "0")).replace(" ", "").replace(",", "")
-                    budget_val = float(budget_text) if budget_text else 0.0
-                except Exception:
-                    budget_val = 0.0
-            try:
-                actual_float = float(actual_val)
-            except (TypeError, ValueError):
-                actual_float = 0.0
-            try:
-                budget_float = float(budget_val)
-            except (TypeError, ValueError):
-                budget_float = 0.0
-            labels.append(label or "")
-            actual_values.append(actual_float)
-            budget_values.append(budget_float)
+                    budget_val = float(row.get("budget_value"))  # type: ignore[arg-type]
+                except (TypeError, ValueError):
+                    budget_val = None
+                if budget_val is None:
+                    try:
+                        budget_text = str(row.get("budget_text", "0")).replace(" ", "").replace(",", "")
+                        budget_val = float(budget_text) if budget_text else 0.0
+                    except Exception:
+                        budget_val = 0.0
+                try:
+                    actual_float = float(actual_val)
+                except (TypeError, ValueError):
+                    actual_float = 0.0
+                try:
+                    budget_float = float(budget_val)
+                except (TypeError, ValueError):
+                    budget_float = 0.0
+                labels.append(label or "")
+                actual_values.append(actual_float)
+                budget_values.append(budget_float)
 
         if not labels:
             QToolTip.hideText()
@@ -564,13 +671,16 @@ class CategoryDetailDialog(QDialog):
             budget_cumulative.append(running_budget)
 
         xs = list(range(len(labels)))
+        # Weeks and days: no markers, one tick label every few points
+        dense = len(xs) > 60
+        tick_step = max(1, len(xs) // 26)
         ax.plot(
             xs,
             actual_cumulative,
             color="#14b8a6",
             marker="o",
             linewidth=2.0,
-            markersize=5,
+            markersize=0 if dense else 5,
             markerfacecolor="#ffffff",
             markeredgewidth=1.4,
             markeredgecolor="#14b8a6",
@@ -582,16 +692,19 @@ class CategoryDetailDialog(QDialog):
             color="#3b82f6",
             marker="s",
             linewidth=2.0,
-            markersize=4.5,
+            markersize=0 if dense else 4.5,
             markerfacecolor="#ffffff",
             markeredgewidth=1.4,
             markeredgecolor="#3b82f6",
             label="Budget cumulativo",
         )
-        ax.set_xticks(xs)
-        ax.set_xticklabels(labels, rotation=45, ha="right", fontsize=8, color="#475569")
+        ax.set_xticks(xs[::tick_step])
+        ax.set_xticklabels(labels[::tick_step], rotation=45, ha="right", fontsize=8, color="#475569")
         ax.tick_params(axis="y", labelsize=8, colors="#475569")
-        ax.set_title("Andamento cumulativo reale vs budget", fontsize=10, color="#111827", pad=8)
+        title = "Andamento cumulativo reale vs budget"
+        if self.period_series is not None:
+            title += " per settimana" if self.period_series[0] == "week" else " per giorno"
+        ax.set_title(title, fontsize=10, color="#111827", pad=8)
         ax.set_ylabel("Importo cumulativo", fontsize=8, color="#475569")
         ax.grid(axis="y", color="#e2e8f0", linestyle="-", linewidth=0.8, alpha=0.9)
         ax.set_axisbelow(True)
@@ -617,6 +730,169 @@ class CategoryDetailDialog(QDialog):
             self._chart_hover_cid = self.chart_canvas.mpl_connect("motion_notify_event", self._on_chart_hover)
         self.chart_canvas.draw_idle()
 
+    def _on_chart_mode_changed(self):
+        mode = self.chart_mode_cb.currentData() if self.chart_mode_cb is not None else "trend"
+        if self.payees_table is not None:
+            self.payees_table.setVisible(mode == "payees")
+        if self.budget_line_cb is not None:
+            self.budget_line_cb.setVisible(mode == "burndown")
+        self._update_chart(self._chart_rows)
+
+    def _update_burndown_chart(self):
+        QToolTip.hideText()
+        self._chart_hover_last_index = None
+        data = self.burndown_provider() if self.burndown_provider is not None else None
+        if data is None:
+            self._burndown_artists = None
+            self._chart_hover_payload = None
+            self.chart_figure.clear()
+            self.chart_figure.set_facecolor("#f8fafc")
+            ax = self.chart_figure.add_subplot(111)
+            ax.axis("off")
+            ax.text(0.5, 0.5, "Nessun dato disponibile", ha="center", va="center", fontsize=9, color="#4b5563")
+            self.chart_canvas.draw_idle()
+            return
+        year, actual_cumulative, month_budgets = data
+        seasonal = self.budget_line_cb is None or self.budget_line_cb.currentData() == "seasonal"
+        budget_cumulative = cumulative_daily_budget(year, month_budgets, seasonal)
+        days = np.arange(len(actual_cumulative))
+        today = date.today()
+        # The current year's actuals stop at today
+        shown = today.timetuple().tm_yday if today.year == int(year) else len(days)
+        if self._burndown_artists is None:
+            self.chart_figure.clear()
+            self.chart_figure.set_facecolor("#f8fafc")
+            ax = self.chart_figure.add_subplot(111)
+            ax.set_facecolor("#ffffff")
+            (actual_line,) = ax.plot([], [], color="#14b8a6", linewidth=2.0, label="Reale cumulativo")
+            (budget_line,) = ax.plot([], [], color="#3b82f6", linewidth=1.6, linestyle="--", label="Budget cumulativo")
+            if shown < len(days):
+                ax.axvline(shown - 1, color="#94a3b8", linewidth=0.8, linestyle=":")
+            jan1 = date(int(year), 1, 1).toordinal()
+            ax.set_xticks([date(int(year), m, 1).toordinal() - jan1 for m in range(1, 13)])
+            ax.set_xticklabels(
+                [ITALIAN_MONTH_NAMES[f"{m:02d}"][:3] for m in range(1, 13)], fontsize=8, color="#475569"
+            )
+            ax.tick_params(axis="y", labelsize=8, colors="#475569")
+            ax.set_title("Burn-down giornaliero reale vs budget", fontsize=10, color="#111827", pad=8)
+            ax.set_ylabel("Importo cumulativo", fontsize=8, color="#475569")
+            ax.grid(axis="y", color="#e2e8f0", linestyle="-", linewidth=0.8, alpha=0.9)
+            ax.set_axisbelow(True)
+            for spine in ("top", "right"):
+                ax.spines[spine].set_visible(False)
+            ax.spines["bottom"].set_color("#e2e8f0")
+            ax.spines["left"].set_color("#e2e8f0")
+            ax.legend(loc="upper left", fontsize=8, frameon=False)
+            self.chart_figure.subplots_adjust(left=0.12, right=0.97, top=0.88, bottom=0.18)
+            self._burndown_artists = (ax, actual_line, budget_line)
+        ax, actual_line, budget_line = self._burndown_artists
+        actual_line.set_data(days[:shown], actual_cumulative[:shown])
+        budget_line.set_data(days, budget_cumulative)
+        ax.relim()
+        ax.autoscale_view()
+        ax.margins(x=0.01, y=0.1)
+        jan1 = date(int(year), 1, 1).toordinal()
+        self._chart_hover_payload = {
+            "axes": ax,
+            "xs": days.tolist(),
+            "labels": [date.fromordinal(jan1 + int(day)).strftime("%d/%m/%Y") for day in days],
+            "series": [
+                ("Reale cumulativo", actual_cumulative.tolist()),
+                ("Budget cumulativo", budget_cumulative.tolist()),
+            ],
+        }
+        if self._chart_hover_cid is None:
+            self._chart_hover_cid = self.chart_canvas.mpl_connect("motion_notify_event", self._on_chart_hover)
+        self.chart_canvas.draw_idle()
+
+    def _load_payee_breakdown(self):
+        if self._payee_breakdown is None and self.payee_provider is not None:
+            try:
+                self._payee_breakdown = self.payee_provider()
+            except Exception as exc:
+                QMessageBox.warning(self, "Beneficiari", f"Impossibile leggere i beneficiari:\n{exc}")
+                return None
+        return self._payee_breakdown
+
+    def _populate_payees(self, breakdown):
+        if self.payees_table is None:
+            return
+        names, values = breakdown.top(PAYEE_TOP)
+        totals = values.sum(axis=1)
+        grand_total = float(totals.sum())
+        self.payees_table.setRowCount(len(names))
+        for row_idx, (name, total) in enumerate(zip(names, totals.tolist())):
+            share = f"{total / grand_total * 100:.1f}" if grand_total else ""
+            cells = [QTableWidgetItem(name), QTableWidgetItem(format_diff_value(total)), QTableWidgetItem(share)]
+            for col, cell in enumerate(cells):
+                cell.setFont(self._item_font)
+                if col > 0:
+                    cell.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.payees_table.setItem(row_idx, col, cell)
+        self.payees_table.resizeRowsToContents()
+
+    def _update_payee_chart(self):
+        QToolTip.hideText()
+        self.chart_figure.clear()
+        self.chart_figure.set_facecolor("#f8fafc")
+        ax = self.chart_figure.add_subplot(111)
+        ax.set_facecolor("#ffffff")
+        self._chart_hover_payload = None
+        self._chart_hover_last_index = None
+        breakdown = self._load_payee_breakdown()
+        if breakdown is None or not breakdown.payees:
+            if self.payees_table is not None:
+                self.payees_table.setRowCount(0)
+            self.chart_figure.subplots_adjust(left=0.1, right=0.9, top=0.85, bottom=0.25)
+            ax.axis("off")
+            ax.text(0.5, 0.5, "Nessun movimento", ha="center", va="center", fontsize=9, color="#4b5563")
+            self.chart_canvas.draw_idle()
+            return
+        self._populate_payees(breakdown)
+        month_labels = [
+            str(row.get("label", "")).strip() for row in self._chart_rows if row.get("row_role") == "month"
+        ]
+        if len(month_labels) != len(breakdown.months):
+            month_labels = list(breakdown.months)
+        names, values = breakdown.top(PAYEE_TOP)
+        # Expenses are negative: stack their magnitude, refunds only shorten a bar
+        sign = -1.0 if values.sum() < 0 else 1.0
+        heights = np.clip(values * sign, 0.0, None)
+        xs = list(range(len(month_labels)))
+        bottom = np.zeros(len(xs))
+        palette = colormaps["tab10"]
+        for idx, (name, row) in enumerate(zip(names, heights)):
+            color = "#cbd5e1" if name == PAYEE_OTHERS_LABEL else palette(idx % 10)
+            total = float(values[idx].sum())
+            ax.bar(xs, row, bottom=bottom, width=0.7, color=color, label=f"{name} ({format_diff_value(total)})")
+            bottom += row
+        ax.set_xticks(xs)
+        ax.set_xticklabels(month_labels, rotation=45, ha="right", fontsize=8, color="#475569")
+        ax.tick_params(axis="y", labelsize=8, colors="#475569")
+        ax.set_title("Reale per beneficiario", fontsize=10, color="#111827", pad=8)
+        ax.set_ylabel("Uscite" if sign < 0 else "Entrate", fontsize=8, color="#475569")
+        ax.grid(axis="y", color="#e2e8f0", linestyle="-", linewidth=0.8, alpha=0.9)
+        ax.set_axisbelow(True)
+        for spine in ("top", "right"):
+            ax.spines[spine].set_visible(False)
+        ax.spines["bottom"].set_color("#e2e8f0")
+        ax.spines["left"].set_color("#e2e8f0")
+        ax.legend(loc="upper left", fontsize=7, frameon=False)
+        ax.margins(x=0.03, y=0.25)
+        self.chart_figure.subplots_adjust(left=0.12, right=0.97, top=0.88, bottom=0.32)
+        self._chart_hover_payload = {
+            "axes": ax,
+            "xs": xs,
+            "labels": month_labels,
+            "lines": [
+                [f"{name}: {format_diff_value(amount)}" for name, amount in breakdown.month_top(idx, PAYEE_TOP)]
+                for idx in xs
+            ],
+        }
+        if self._chart_hover_cid is None:
+            self._chart_hover_cid = self.chart_canvas.mpl_connect("motion_notify_event", self._on_chart_hover)
+        self.chart_canvas.draw_idle()
+
     def _on_chart_hover(self, event):
         payload = getattr(self, "_chart_hover_payload", None)
         if not payload:
@@ -643,7 +919,9 @@ class CategoryDetailDialog(QDialog):
             return
         labels = payload["labels"]
         text_lines = [labels[nearest_idx]]
-        for series_label, series_values in payload["series"]:
+        if "lines" in payload:
+            text_lines.extend(payload["lines"][nearest_idx])
+        for series_label, series_values in payload.get("series", []):
             try:
                 value = series_values[nearest_idx]
             except IndexError:
@@ -706,6 +984,19 @@ class CategoryDetailDialog(QDialog):
             rounded_values[-1] += diff
         self._apply_values_to_indexes(rounded_values)
 
+    def _on_cell_double_clicked(self, row: int, col: int):
+        # The budget column edits on double-click; the others open the transactions
+        if self.drilldown_handler is None or col == 2:
+            return
+        label_item = self.table.item(row, 0)
+        grid_column = label_item.data(Qt.ItemDataRole.UserRole) if label_item else None
+        if grid_column is not None:
+            self.drilldown_handler(grid_column)
+
+    def _on_seasonal_toggled(self, checked: bool):
+        self.seasonal_handler(checked)
+        self._reload()
+
     def _apply_values_to_indexes(self, values: list[float]):
         if not self.value_handler:
             return
@@ -774,11 +1065,12 @@ class CategoryDetailDialog(QDialog):
 
 
 class AllCategoriesDiffDialog(QDialog):
-    def __init__(self, parent, year_text: str, data_provider):
+    def __init__(self, parent, year_text: str, data_provider, simulation_provider=None):
         super().__init__(parent)
         self.setModal(True)
         self.setWindowTitle("Dettaglio differenze - tutte le categorie")
         self.data_provider = data_provider
+        self.simulation_provider = simulation_provider
         self._year_text = year_text or ""
         popup_font = QFont(DETAIL_FONT_FAMILY, DETAIL_FONT_SIZE)
         self.setFont(popup_font)
@@ -823,6 +1115,31 @@ class AllCategoriesDiffDialog(QDialog):
         layout.addWidget(self.table, alignment=Qt.AlignmentFlag.AlignHCenter)
         layout.addSpacing(10)
 
+        if simulation_provider is not None:
+            sim_layout = QHBoxLayout()
+            self.simulation_btn = QPushButton("Simula rischio fine anno")
+            self.simulation_btn.setToolTip("Percentili P10/P50/P90 del totale di fine anno per categoria")
+            self.simulation_btn.clicked.connect(self._run_simulation)
+            sim_layout.addWidget(self.simulation_btn)
+            self.simulation_label = QLabel(self)
+            self.simulation_label.setStyleSheet("color: #4b5563;")
+            sim_layout.addWidget(self.simulation_label, 1)
+            layout.addLayout(sim_layout)
+            self.simulation_table = QTableWidget(0, 5, self)
+            self.simulation_table.setHorizontalHeaderLabels(["Categoria", "P10", "P50", "P90", "Budget"])
+            self.simulation_table.setFont(popup_font)
+            self.simulation_table.horizontalHeader().setFont(popup_font)
+            self.simulation_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+            self.simulation_table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+            self.simulation_table.verticalHeader().setVisible(False)
+            self.simulation_table.setColumnWidth(0, 220)
+            for col in range(1, 5):
+                self.simulation_table.setColumnWidth(col, 110)
+            self.simulation_table.setMaximumHeight(240)
+            self.simulation_table.setVisible(False)
+            layout.addWidget(self.simulation_table)
+            layout.addSpacing(8)
+
         self.chart_figure = Figure(figsize=(5.6, 4.8), dpi=100)
         self.chart_canvas = FigureCanvasQTAgg(self.chart_figure)
         self.chart_canvas.setMinimumHeight(420)
@@ -927,6 +1244,39 @@ class AllCategoriesDiffDialog(QDialog):
         self.table.setMinimumHeight(total_height)
         self.table.setMaximumHeight(total_height)
 
+    def _run_simulation(self):
+        self.simulation_btn.setEnabled(False)
+        self.simulation_label.setText("Simulazione in corso...")
+        run_in_background(self.simulation_provider, self._show_simulation, self._on_simulation_failed)
+
+    def _on_simulation_failed(self, exc: BaseException):
+        self.simulation_btn.setEnabled(True)
+        self.simulation_label.setText(f"Simulazione non riuscita: {exc}")
+
+    def _show_simulation(self, payload):
+        rows, info = payload
+        self.simulation_btn.setEnabled(True)
+        self.simulation_label.setText(info)
+        table = self.simulation_table
+        table.setRowCount(len(rows))
+        for row_idx, row in enumerate(rows):
+            is_total = row.get("row_role") == "total"
+            label_item = QTableWidgetItem(str(row.get("label", "")))
+            cells = [label_item]
+            for key in ("p10", "p50", "p90", "budget"):
+                item = QTableWidgetItem(format_diff_value(float(row.get(key, 0.0))))
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                cells.append(item)
+            # The pessimistic end against the year budget
+            cells[1].setBackground(diff_background(float(row.get("p10", 0.0)) - float(row.get("budget", 0.0))))
+            for col, item in enumerate(cells):
+                font = QFont(self._item_font)
+                font.setBold(is_total)
+                item.setFont(font)
+                table.setItem(row_idx, col, item)
+        table.resizeRowsToContents()
+        table.setVisible(True)
+
     def _update_chart(self, rows: list[dict[str, Any]]):
         if not hasattr(self, "chart_figure"):
             return
@@ -1092,6 +1442,109 @@ class AllCategoriesDiffDialog(QDialog):
         self._chart_hover_last_index = nearest_idx
 
 
+class SuggestBudgetsDialog(QDialog):
+    """Options for the budget suggestions computed from previous years."""
+
+    def __init__(self, parent, year_text: str):
+        super().__init__(parent)
+        self.setModal(True)
+        self.setWindowTitle(f"Suggerisci budget - {year_text}" if year_text else "Suggerisci budget")
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+        self.method_cb = QComboBox()
+        for key, label in SUGGEST_METHODS.items():
+            self.method_cb.addItem(label, key)
+        form.addRow("Metodo:", self.method_cb)
+        self.percentile_spin = QSpinBox()
+        self.percentile_spin.setRange(1, 99)
+        self.percentile_spin.setValue(50)
+        self.percentile_spin.setSuffix(" %")
+        form.addRow("Percentile:", self.percentile_spin)
+        self.years_spin = QSpinBox()
+        self.years_spin.setRange(1, 10)
+        self.years_spin.setValue(3)
+        self.years_spin.setSuffix(" anni")
+        form.addRow("Storico:", self.years_spin)
+        self.trend_check = QCheckBox("Correggi per il trend annuale")
+        form.addRow("", self.trend_check)
+        self.seasonal_check = QCheckBox("Distribuisci sui mesi secondo la stagionalità")
+        form.addRow("", self.seasonal_check)
+        self.only_empty_check = QCheckBox("Solo categorie senza budget")
+        self.only_empty_check.setChecked(True)
+        form.addRow("", self.only_empty_check)
+        layout.addLayout(form)
+        hint = QLabel("I valori proposti diventano modifiche da rivedere e salvare con 'Save Budgets'.")
+        hint.setWordWrap(True)
+        hint.setStyleSheet("color: #4b5563;")
+        layout.addWidget(hint)
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        self.method_cb.currentIndexChanged.connect(self._update_percentile_state)
+        self._update_percentile_state()
+
+    def _update_percentile_state(self, *_):
+        self.percentile_spin.setEnabled(self.method_cb.currentData() == "percentile")
+
+    def options(self) -> dict[str, Any]:
+        return {
+            "method": self.method_cb.currentData(),
+            "percentile": float(self.percentile_spin.value()),
+            "years": self.years_spin.value(),
+            "trend": self.trend_check.isChecked(),
+            "seasonal": self.seasonal_check.isChecked(),
+            "only_empty": self.only_empty_check.isChecked(),
+        }
+
+
+class TransactionsDialog(QDialog):
+    """Transactions behind one category cell, loaded a page at a time while scrolling."""
+
+    def __init__(self, parent, title: str, fetch_page, cell_total: float):
+        super().__init__(parent)
+        self.setWindowTitle(f"Movimenti - {title}")
+        self.resize(900, 560)
+        self._cell_total = cell_total
+        layout = QVBoxLayout(self)
+        header = QLabel(title)
+        header_font = QFont(header.font())
+        header_font.setBold(True)
+        header.setFont(header_font)
+        layout.addWidget(header)
+        self.model = TransactionPageModel(fetch_page, parent=self)
+        self.table = QTableView(self)
+        self.table.setModel(self.model)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setWordWrap(False)
+        for col, width in enumerate((90, 160, 200, 300, 100)):
+            self.table.setColumnWidth(col, width)
+        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #4b5563;")
+        layout.addWidget(self.status_label)
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addStretch()
+        close_btn = QPushButton("Chiudi")
+        close_btn.clicked.connect(self.close)
+        buttons_layout.addWidget(close_btn)
+        layout.addLayout(buttons_layout)
+        self.model.rowsInserted.connect(self._update_status)
+        self._update_status()
+
+    def _update_status(self, *_):
+        count = self.model.rowCount()
+        text = f"{count} movimenti, totale {self.model.loaded_total:,.2f}"
+        if self.model.all_loaded():
+            text += f" (cella: {self._cell_total:,.2f})"
+        else:
+            text += " finora - scorri per caricarne altri"
+        self.status_label.setText(text)
+
+
 class BudgetApp(QWidget):
     def __init__(self):
         super().__init__()
@@ -1116,6 +1569,31 @@ class BudgetApp(QWidget):
         self._attention_filter_enabled = False
         self._pending_db_error: str | None = None
         self._should_prompt_db_dialog = False
+        self._consolidated = None
+        self._consolidated_paths: list[Path] = []
+        self._consolidated_cid_to_path: dict[int, str] = {}
+        self.transaction_store: TransactionStore | None = None
+        self._warm_cache = None
+        # Set when a warm start served stale lookups while edits were pending
+        self._lookups_stale = False
+        self.search_index: SearchIndex | None = None
+        # Loaded the first time the balances tab is shown
+        self.balance_ledger: BalanceLedger | None = None
+        self._balance_request = 0
+        self._search_hits: list = []
+        # "" for categories, "tag" or "tag_category"; the category tree is parked while tags are shown
+        self._tag_dimension = ""
+        self._category_tree = None
+        self._tag_cache = None
+        self.comparison_map: dict[str, dict[tuple[int, int], float]] = {}
+        self._rolling_months: list[str] = []
+        self.projected_map: dict[tuple[int, int], float] = {}
+        self.forecast_map: dict[int, tuple[float, float, float, float]] = {}
+        self.seasonal_categories: set[int] = set(config.load_seasonal_categories())
+        self.seasonal_profile_map: dict[int, np.ndarray] = {}
+        self.rollover_categories: set[int] = set(config.load_rollover_categories())
+        self.header_month_numbers: list[int | None] = []
+        self.header_month_names: list[str] = []
         self._load_data_for_current_db(show_errors=False)
         self.edits = {}
         self._recalc_guard = False  # prevents saving of auto-calculated updates
@@ -1170,6 +1648,18 @@ class BudgetApp(QWidget):
         self.db_label.setMaximumWidth(260)
         self.db_label.setAlignment(Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft)
         top_row.addWidget(self.db_label)
+        self.consolidate_btn = QPushButton("Consolida DB")
+        self.consolidate_btn.setMinimumWidth(110)
+        self.consolidate_btn.setToolTip("Apri più database e mostra i totali combinati per categoria")
+        self.consolidate_btn.clicked.connect(self._toggle_consolidated_mode)
+        top_row.addWidget(self.consolidate_btn)
+        self.memory_snapshot_check = QCheckBox("DB in memoria")
+        self.memory_snapshot_check.setToolTip(
+            "Legge il database da una copia in RAM; le scritture vanno sul file e sulla copia."
+        )
+        self.memory_snapshot_check.setChecked(config.load_memory_snapshot())
+        self.memory_snapshot_check.toggled.connect(self._on_memory_snapshot_toggled)
+        top_row.addWidget(self.memory_snapshot_check)
         top_row.addWidget(_make_v_sep())
 
         year_label = QLabel("Year:")
@@ -1217,6 +1707,12 @@ class BudgetApp(QWidget):
         self.all_diff_btn.clicked.connect(self._open_all_categories_diff)
         top_row.addWidget(self.all_diff_btn)
 
+        self.suggest_btn = QPushButton("Suggerisci budget")
+        self.suggest_btn.setMinimumWidth(120)
+        self.suggest_btn.setToolTip("Propone i budget dell'anno dai reali degli anni precedenti")
+        self.suggest_btn.clicked.connect(self._open_budget_suggestions)
+        top_row.addWidget(self.suggest_btn)
+
         self.refresh_btn = QPushButton("Refresh")
         self.refresh_btn.setMinimumWidth(100)
         self.refresh_btn.clicked.connect(self.refresh)
@@ -1314,6 +1810,111 @@ class BudgetApp(QWidget):
         )
         self.attention_toggle.toggled.connect(self._on_attention_toggle)
         accounts_row.addWidget(self.attention_toggle)
+        self.attention_mode_cb = QComboBox()
+        self.attention_mode_cb.setToolTip(
+            "Diff mensile: mesi con diff negativa.\n"
+            "Saldo riportato: mesi in cui il saldo cumulato da inizio periodo è negativo.\n"
+            "Anomalie: mesi in cui il reale si discosta dallo storico della categoria (z-score robusto)."
+        )
+        self.attention_mode_cb.addItem("Diff mensile", "monthly")
+        self.attention_mode_cb.addItem("Saldo riportato", "carried")
+        self.attention_mode_cb.addItem("Anomalie", "anomaly")
+        self.attention_mode_cb.currentIndexChanged.connect(lambda _: self._apply_attention_filter())
+        accounts_row.addWidget(self.attention_mode_cb)
+        accounts_row.addWidget(_make_v_sep())
+
+        compare_label = QLabel("Confronto:")
+        compare_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        compare_label.setFixedWidth(70)
+        compare_label.setStyleSheet(
+            "background-color: #f3e8ff; color: #4c1d95; border: 1px solid #ddd6fe; border-radius: 3px; padding: 1px 4px;"
+        )
+        accounts_row.addWidget(compare_label)
+        self.compare_cb = QComboBox()
+        self.compare_cb.setFixedWidth(105)
+        self.compare_cb.setStyleSheet(
+            "QComboBox { background-color: #f3e8ff; border: 1px solid #c4b5fd; border-radius: 4px; padding: 2px 6px; } "
+            "QComboBox QAbstractItemView { selection-background-color: #ddd6fe; selection-color: #4c1d95; }"
+        )
+        self.compare_cb.setToolTip("Aggiunge il reale degli anni precedenti e la variazione rispetto all'anno prima.")
+        self.compare_cb.addItem("Nessuno", 0)
+        self.compare_cb.addItem("1 anno", 1)
+        for n in range(2, 6):
+            self.compare_cb.addItem(f"{n} anni", n)
+        self._compare_index = 0
+        self.compare_cb.currentIndexChanged.connect(self._on_compare_changed)
+        accounts_row.addWidget(self.compare_cb)
+        accounts_row.addWidget(_make_v_sep())
+
+        self.dimension_cb = QComboBox()
+        self.dimension_cb.setToolTip("Righe per categoria, per tag MMEX o per tag e categoria (sola lettura).")
+        self.dimension_cb.addItem("Categorie", "")
+        self.dimension_cb.addItem("Tag", "tag")
+        self.dimension_cb.addItem("Tag × categoria", "tag_category")
+        self.dimension_cb.currentIndexChanged.connect(self._on_dimension_changed)
+        accounts_row.addWidget(self.dimension_cb)
+        self.granularity_cb = QComboBox()
+        self.granularity_cb.setToolTip("Colonne per mese, per settimana (ISO) o per giorno; settimane e giorni in sola lettura.")
+        self.granularity_cb.addItem("Mesi", "month")
+        self.granularity_cb.addItem("Settimane", "week")
+        self.granularity_cb.addItem("Giorni", "day")
+        self.granularity_cb.currentIndexChanged.connect(lambda _: self._update_period_view())
+        accounts_row.addWidget(self.granularity_cb)
+        accounts_row.addWidget(_make_v_sep())
+
+        self.rolling_toggle = QToolButton()
+        self.rolling_toggle.setCheckable(True)
+        self.rolling_toggle.setText("Finestra mobile")
+        self.rolling_toggle.setToolTip(
+            "Mostra N mesi consecutivi anche a cavallo di due anni di budget (sola lettura)."
+        )
+        self.rolling_toggle.setStyleSheet(
+            "QToolButton { background-color: #ccfbf1; border: 1px solid #5eead4; "
+            "border-radius: 4px; padding: 2px 8px; color: #134e4a; } "
+            "QToolButton:checked { background-color: #0f766e; border-color: #115e59; color: #ffffff; }"
+        )
+        self.rolling_toggle.toggled.connect(self._on_rolling_changed)
+        accounts_row.addWidget(self.rolling_toggle)
+        self.rolling_start_edit = QDateEdit()
+        self.rolling_start_edit.setDisplayFormat("MM/yyyy")
+        self.rolling_start_edit.setFixedWidth(90)
+        self.rolling_start_edit.setToolTip("Primo mese della finestra")
+        self.rolling_start_edit.setDate(QDate.currentDate().addMonths(-11))
+        self.rolling_start_edit.setEnabled(False)
+        self.rolling_start_edit.dateChanged.connect(self._on_rolling_changed)
+        accounts_row.addWidget(self.rolling_start_edit)
+        self.rolling_months_spin = QSpinBox()
+        self.rolling_months_spin.setRange(1, 36)
+        self.rolling_months_spin.setValue(12)
+        self.rolling_months_spin.setSuffix(" mesi")
+        self.rolling_months_spin.setFixedWidth(80)
+        self.rolling_months_spin.setEnabled(False)
+        self.rolling_months_spin.valueChanged.connect(self._on_rolling_changed)
+        accounts_row.addWidget(self.rolling_months_spin)
+        accounts_row.addWidget(_make_v_sep())
+
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Cerca movimenti…")
+        self.search_edit.setToolTip("Note, beneficiario, numero o tag; Invio o clic su un risultato per andare alla cella.")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.setFixedWidth(220)
+        self.search_edit.setStyleSheet(
+            "QLineEdit { background-color: #fefce8; border: 1px solid #fde68a; border-radius: 4px; padding: 2px 6px; }"
+        )
+        self.search_model = QStandardItemModel(self)
+        self.search_completer = QCompleter(self.search_model, self)
+        self.search_completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.search_completer.setMaxVisibleItems(15)
+        # Attached with setWidget rather than setCompleter so picking a hit leaves the query as typed
+        self.search_completer.setWidget(self.search_edit)
+        self.search_completer.activated[QModelIndex].connect(self._on_search_hit_activated)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self._run_search)
+        self.search_edit.textEdited.connect(lambda _: self.search_timer.start())
+        self.search_edit.returnPressed.connect(self._run_search)
+        accounts_row.addWidget(self.search_edit)
         accounts_row.addStretch()
 
         control_layout.addLayout(accounts_row)
@@ -1324,7 +1925,27 @@ class BudgetApp(QWidget):
         self.canvas = FigureCanvasQTAgg(self.figure)
         self.canvas.setFixedHeight(CHART_HEIGHT)
         self.canvas.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-        layout.addWidget(self.canvas)
+
+        balance_tab = QWidget()
+        balance_layout = QVBoxLayout(balance_tab)
+        balance_layout.setContentsMargins(0, 2, 0, 0)
+        balance_layout.setSpacing(2)
+        self.balance_projection_check = QCheckBox("Proiezione programmati")
+        self.balance_projection_check.setToolTip("Da oggi in poi aggiunge ai saldi le operazioni programmate.")
+        self.balance_projection_check.setChecked(True)
+        self.balance_projection_check.toggled.connect(lambda _: self._update_balance_chart())
+        balance_layout.addWidget(self.balance_projection_check, alignment=Qt.AlignmentFlag.AlignRight)
+        self.balance_figure = Figure(figsize=(6, CHART_HEIGHT / 100), dpi=100)
+        self.balance_canvas = FigureCanvasQTAgg(self.balance_figure)
+        self.balance_canvas.setFixedHeight(CHART_HEIGHT)
+        self.balance_canvas.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        balance_layout.addWidget(self.balance_canvas)
+        self.chart_tabs = QTabWidget()
+        self.chart_tabs.addTab(self.canvas, "Riepilogo")
+        self.chart_tabs.addTab(balance_tab, "Saldi conti")
+        self.chart_tabs.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.chart_tabs.currentChanged.connect(lambda _: self._update_balance_chart())
+        layout.addWidget(self.chart_tabs)
 
         self.view = BudgetTreeView()
         self.summary_header = SummaryHeaderView(self.view)
@@ -1345,6 +1966,23 @@ class BudgetApp(QWidget):
         header.setDefaultSectionSize(NUMERIC_COLUMN_WIDTH)
         layout.addWidget(self.view)
 
+        # Weekly/daily columns: a table over NumPy arrays in place of the tree
+        self.period_view = QTableView()
+        self.period_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.period_view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.period_view.setHorizontalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.period_view.verticalHeader().setVisible(False)
+        self.period_view.horizontalHeader().setDefaultSectionSize(NUMERIC_COLUMN_WIDTH)
+        self.period_view.horizontalHeader().setMinimumSectionSize(MIN_COLUMN_WIDTH)
+        self.period_view.doubleClicked.connect(self._on_period_view_double_clicked)
+        self.period_view.setVisible(False)
+        layout.addWidget(self.period_view)
+        self._period_model: PeriodGridModel | None = None
+        # (granularity, year, date range per column, CATEGID -> model row)
+        self._period_layout = None
+        # (year, accounts, store generation), CATEGIDs, category x day running actuals
+        self._daily_cumulative_cache = None
+
         self.default_delegate = self.view.itemDelegate()
         self.budget_amount_delegate = BudgetAmountDelegate(self.view)
         self.period_delegate = PeriodDelegate()
@@ -1357,10 +1995,18 @@ class BudgetApp(QWidget):
         self.category_label_items: dict[Any, QStandardItem] = {}
         self.category_totals: dict[int, dict[str, float]] = {}
         self._partial_budget_month_columns: list[int] = []
+        # Coalesces chart redraws when many categories are recalculated in one go
+        self._chart_timer = QTimer(self)
+        self._chart_timer.setSingleShot(True)
+        self._chart_timer.setInterval(0)
+        self._chart_timer.timeout.connect(self.update_summary_chart)
         self.apply_light_theme()
         self._db_label_fulltext = ""
         self._set_db_path_label(config.DB_PATH)
         self._populate_account_selector()
+        self.db_watcher = DbChangeWatcher(self)
+        self.db_watcher.changed.connect(self._on_db_changed)
+        self.db_watcher.watch(config.DB_PATH)
         QTimer.singleShot(0, self._update_db_label_text)
         if initial_year:
             self._on_year_changed(initial_year)
@@ -1618,6 +2264,8 @@ class BudgetApp(QWidget):
         previous_guard = self._recalc_guard
         self._recalc_guard = True
         try:
+            self._clear_anomaly_tooltips(root)
+            problem_map = self._attention_problem_columns(root)
             problem_roots: set[int] = set()
             for row in range(root.rowCount()):
                 cat_item = root.child(row, 0)
@@ -1629,7 +2277,7 @@ class BudgetApp(QWidget):
                 depth = meta[2] if len(meta) > 2 else 0
                 if (depth or 0) == 0:
                     continue
-                problem_cols = self._problem_columns_for_category(cat_item)
+                problem_cols = problem_map.get(row)
                 if problem_cols:
                     root_id = meta[3] if len(meta) > 3 else meta[1]
                     try:
@@ -1658,7 +2306,7 @@ class BudgetApp(QWidget):
                             self._set_item_dim(item, not has_problem)
                     continue
 
-                problem_cols = self._problem_columns_for_category(cat_item)
+                problem_cols = problem_map.get(row)
                 if problem_cols is None:
                     continue
                 has_problem = bool(problem_cols)
@@ -1687,6 +2335,7 @@ class BudgetApp(QWidget):
         previous_guard = self._recalc_guard
         self._recalc_guard = True
         try:
+            self._clear_anomaly_tooltips(root)
             for row in range(root.rowCount()):
                 for col in range(self.model.columnCount()):
                     item = root.child(row, col)
@@ -1788,24 +2437,109 @@ class BudgetApp(QWidget):
         dim_color.setAlpha(alpha)
         return QBrush(dim_color)
 
-    def _problem_columns_for_category(self, cat_item: QStandardItem) -> set[int] | None:
-        diff_row_idx = None
+    def _diff_row_values(self, cat_item: QStandardItem) -> list[float] | None:
+        """Diff row amounts from column 3 on; None for rows without a Diff row."""
         for rr in range(cat_item.rowCount()):
             label_item = cat_item.child(rr, 0)
             if label_item and label_item.text() == "Diff":
-                diff_row_idx = rr
-                break
-        if diff_row_idx is None:
+                return [
+                    self._parse_amount_text(cell.text()) if cell else 0.0
+                    for cell in (cat_item.child(rr, col) for col in range(3, cat_item.columnCount()))
+                ]
+        return None
+
+    @staticmethod
+    def _diff_problem_columns(values: list[float] | None) -> set[int] | None:
+        if values is None:
             return None
-        problem_cols: set[int] = set()
-        for col in range(3, cat_item.columnCount()):
-            cell = cat_item.child(diff_row_idx, col)
-            if not cell:
+        return {col for col, value in enumerate(values, start=3) if value < -1e-6}
+
+    def _attention_problem_columns(self, root: QStandardItem) -> dict[int, set[int] | None]:
+        """Row -> columns to highlight for every category row.
+
+        In "Saldo riportato" mode the month columns follow the carried-forward
+        balance, from one cumulative sum over the category x month Diff values.
+        """
+        rows, values = [], []
+        for row in range(root.rowCount()):
+            cat_item = root.child(row, 0)
+            if cat_item:
+                rows.append(row)
+                values.append(self._diff_row_values(cat_item))
+        problem_map = {row: self._diff_problem_columns(row_values) for row, row_values in zip(rows, values)}
+        mode = self.attention_mode_cb.currentData()
+        if mode == "anomaly":
+            return self._anomaly_problem_columns(root, problem_map)
+        if mode != "carried":
+            return problem_map
+        month_count = max(len(self.header_ids) - 1, 0)
+        with_diff = [(row, row_values) for row, row_values in zip(rows, values) if row_values is not None]
+        if not with_diff or not month_count:
+            return problem_map
+        diffs = np.array([row_values[:month_count] for _, row_values in with_diff], dtype=float)
+        balances = carried_balances(diffs, 0.0)
+        for (row, _), balance in zip(with_diff, balances):
+            month_cols = {col for col, value in enumerate(balance, start=3) if value < -1e-6}
+            problem_map[row] = {col for col in problem_map[row] if col >= 3 + month_count} | month_cols
+        return problem_map
+
+    def _anomaly_problem_columns(self, root: QStandardItem, problem_map: dict[int, set[int] | None]):
+        """Month columns whose actual is a statistical outlier for its category.
+
+        Scores need real CATEGIDs and the store's history, so the
+        consolidated and tag views keep the monthly diff columns.
+        """
+        if self._consolidated is not None or self._tag_dimension or not self.header_month_names:
+            return problem_map
+        try:
+            scores = anomaly_scores(self.header_month_names, self._get_account_filter_ids(), self.transaction_store)
+        except (sqlite3.Error, OSError, RuntimeError):
+            # No readable database: keep the monthly diff columns
+            return problem_map
+        outliers = scores.outliers()
+        columns = [3 + self.header_month_names.index(month) for month in scores.months]
+        for row in problem_map:
+            cat_item = root.child(row, 0)
+            meta = cat_item.data(Qt.ItemDataRole.UserRole)
+            if problem_map[row] is None or not isinstance(meta, tuple) or meta[0] != "category_label":
+                continue
+            idx = scores.row(meta[1])
+            if idx is None:
+                problem_map[row] = set()
                 continue
-            value = self._parse_amount_text(cell.text())
-            if value < -1e-6:
-                problem_cols.add(col)
-        return problem_cols
+            problem_map[row] = {columns[month] for month in np.flatnonzero(outliers[idx]).tolist()}
+            for rr in range(cat_item.rowCount()):
+                label_item = cat_item.child(rr, 0)
+                if label_item and label_item.text() == "Reale":
+                    self._set_anomaly_tooltips(cat_item, rr, columns, scores, idx)
+                    break
+        return problem_map
+
+    @staticmethod
+    def _set_anomaly_tooltips(cat_item: QStandardItem, rr: int, columns: list[int], scores, idx: int):
+        for month, (col, score) in enumerate(zip(columns, scores.scores[idx].tolist())):
+            cell = cat_item.child(rr, col)
+            if cell is None or np.isnan(score):
+                continue
+            heading = "Anomalia" if abs(score) >= OUTLIER_THRESHOLD else "Nella norma"
+            cell.setToolTip(
+                f"{heading} (z-score robusto {score:+.1f}, soglia ±{OUTLIER_THRESHOLD:g})\n"
+                f"Mediana storica: {scores.median[idx, month]:,.2f}\n"
+                f"Dispersione (MAD): {scores.spread[idx, month]:,.2f}"
+            )
+            cell.setData(True, ANOMALY_TIP_ROLE)
+
+    def _clear_anomaly_tooltips(self, root: QStandardItem):
+        for row in range(root.rowCount()):
+            cat_item = root.child(row, 0)
+            if not cat_item:
+                continue
+            for rr in range(cat_item.rowCount()):
+                for col in range(3, cat_item.columnCount()):
+                    cell = cat_item.child(rr, col)
+                    if cell is not None and cell.data(ANOMALY_TIP_ROLE):
+                        cell.setToolTip("")
+                        cell.setData(None, ANOMALY_TIP_ROLE)
 
     def _parse_amount_text(self, text: str) -> float:
         cleaned = (text or "").replace(" ", "").replace(",", "")
@@ -1827,7 +2561,7 @@ class BudgetApp(QWidget):
                 continue
             if name == "Period":
                 continue
-            if str(name).upper() == "TOTAL":
+            if col >= self._total_column(header_names):
                 continue
             month_columns.append(col)
             month_labels.append(str(name))
@@ -1863,6 +2597,11 @@ class BudgetApp(QWidget):
         self._should_prompt_db_dialog = False
         self.accounts = []
         self._account_id_name = {}
+        self.transaction_store = None
+        self._warm_cache = None
+        self.search_index = None
+        self.balance_ledger = None
+        self._balance_request += 1
         db_path = config.DB_PATH
         if not db_path:
             message = "Nessun database configurato. Usa 'Select DB' per scegliere un file Money Manager (.mmb)."
@@ -1881,12 +2620,24 @@ class BudgetApp(QWidget):
             self._should_prompt_db_dialog = True
             return False
         try:
-            years, per_year_entries, name_to_id = load_budgetyear_map()
-            id2name, children_map, root_ids = load_categories()
-            try:
-                accounts = load_accounts()
-            except Exception:
-                accounts = []
+            if config.load_memory_snapshot():
+                enable_memory_snapshot(db_path)
+            else:
+                disable_memory_snapshot()
+            warm = load_warm_cache(db_path)
+            if warm is not None:
+                years, per_year_entries, name_to_id = warm.budgetyear_map()
+                id2name, children_map, root_ids = warm.categories()
+                accounts = warm.accounts()
+                store = warm.transaction_store()
+            else:
+                years, per_year_entries, name_to_id = load_budgetyear_map()
+                id2name, children_map, root_ids = load_categories()
+                try:
+                    accounts = load_accounts()
+                except Exception:
+                    accounts = []
+                store = TransactionStore.load()
         except sqlite3.Error as exc:
             message = f"Errore durante la lettura del database:\n{exc}"
             if show_errors:
@@ -1903,6 +2654,14 @@ class BudgetApp(QWidget):
                 self._pending_db_error = message
             self._should_prompt_db_dialog = True
             return False
+        self.transaction_store = store
+        self._warm_cache = warm
+        if warm is not None:
+            run_in_background(
+                lambda: check_fresh(warm, store),
+                lambda result: self._on_warm_cache_checked(warm, result),
+                lambda exc: self._on_warm_cache_checked(warm, (False, True)),
+            )
         self.years = years
         self.per_year_entries = per_year_entries
         self.name_to_id = name_to_id
@@ -1910,8 +2669,83 @@ class BudgetApp(QWidget):
         self.children_map = children_map
         self.root_ids = root_ids
         self.accounts = accounts
+        self._tag_cache = None
+        if self._tag_dimension:
+            self._category_tree = (id2name, children_map, root_ids)
+        self.search_index = SearchIndex(db_path)
+        self._sync_search_index()
         return True
 
+    def _sync_search_index(self):
+        index = self.search_index
+        if index is None:
+            return
+        run_in_background(index.sync, lambda _: None, lambda exc: None)
+
+    def _run_search(self):
+        self.search_timer.stop()
+        text = self.search_edit.text()
+        hits = []
+        if self.search_index is not None and self._consolidated is None and not self._tag_dimension:
+            hits = self.search_index.search(text, self._get_account_filter_ids())
+        self._search_hits = hits
+        self.search_model.clear()
+        for idx, hit in enumerate(hits):
+            parts = [hit.payee, hit.notes, hit.number and f"#{hit.number}", hit.tags and f"[{hit.tags}]"]
+            detail = " · ".join(part for part in parts if part)
+            item = QStandardItem(
+                f"{hit.date}  {hit.amount:,.2f}  {self.id2name.get(hit.categid, f'(id:{hit.categid})')} — {detail}"
+            )
+            item.setData(idx, Qt.ItemDataRole.UserRole)
+            item.setEditable(False)
+            self.search_model.appendRow(item)
+        if hits:
+            self.search_completer.complete()
+        else:
+            self.search_completer.popup().hide()
+
+    def _on_search_hit_activated(self, index: QModelIndex):
+        idx = index.data(Qt.ItemDataRole.UserRole)
+        if idx is None or not 0 <= int(idx) < len(self._search_hits):
+            return
+        self._jump_to_search_hit(self._search_hits[int(idx)])
+
+    def _jump_to_search_hit(self, hit):
+        """Select the Reale cell of the hit's category and month, switching year if needed."""
+        if hit.month not in self.header_month_names:
+            year = hit.date[:4]
+            if self._rolling_active() or year not in self.years:
+                QMessageBox.information(
+                    self, "Ricerca", f"Il mese {hit.month} non è nella vista corrente né in un anno di budget."
+                )
+                return
+            if not self._confirm_discard_edits("Passare all'anno del movimento"):
+                return
+            self.year_cb.setCurrentText(year)
+            if hit.month not in self.header_month_names:
+                return
+        cat_item = self.category_label_items.get(hit.categid)
+        if cat_item is None:
+            return
+        meta = cat_item.data(Qt.ItemDataRole.UserRole)
+        root_cid = meta[3] if meta and len(meta) > 3 and meta[3] is not None else hit.categid
+        if root_cid in self._collapsed_main:
+            self._collapsed_main.discard(root_cid)
+            self._apply_main_collapse_states()
+        self.view.setExpanded(cat_item.index(), True)
+        column = 3 + self.header_month_names.index(hit.month)
+        target = None
+        for row in range(cat_item.rowCount()):
+            child = cat_item.child(row, 0)
+            if child is not None and child.text() == "Reale":
+                target = self.model.index(row, column, cat_item.index())
+                break
+        if target is None:
+            target = cat_item.index().siblingAtColumn(column)
+        self.view.setCurrentIndex(target)
+        self.view.scrollTo(target, QAbstractItemView.ScrollHint.PositionAtCenter)
+        self.view.setFocus()
+
     def _show_pending_db_error(self):
         if not self._pending_db_error:
             return
@@ -1924,9 +2758,155 @@ class BudgetApp(QWidget):
     def _display_header_name(self, raw: str) -> str:
         if isinstance(raw, str) and len(raw) == 7 and raw[4] == "-":
             month_code = raw[5:]
-            return ITALIAN_MONTH_NAMES.get(month_code, raw)
+            name = ITALIAN_MONTH_NAMES.get(month_code, raw)
+            if self._rolling_active() and name != raw:
+                # The window can hold the same month of two years
+                return f"{name} {raw[2:4]}"
+            return name
         return raw
 
+    def _store_year(self) -> str:
+        """Year of an editable twelve-month grid backed by the transaction store; "" otherwise."""
+        year = self.year_cb.currentText()
+        if self._is_read_only_view() or not year.isdigit() or self.transaction_store is None:
+            return ""
+        if self.header_month_names != [f"{year}-{m:02d}" for m in range(1, 13)]:
+            return ""
+        return year
+
+    def _period_granularity(self) -> str:
+        """Active weekly/daily granularity, "" when the month grid is shown."""
+        granularity = self.granularity_cb.currentData() or "month"
+        return "" if granularity == "month" or not self._store_year() else granularity
+
+    def _daily_cumulative(self, year: str, account_filter) -> tuple[np.ndarray, np.ndarray]:
+        """(CATEGIDs, category x day running actuals) of ``year``, kept until the store changes."""
+        store = self.transaction_store
+        key = (year, tuple(account_filter or ()), store.generation)
+        if self._daily_cumulative_cache is None or self._daily_cumulative_cache[0] != key:
+            categ_ids, matrix = store.day_matrix(year, account_filter)
+            self._daily_cumulative_cache = (key, categ_ids, np.cumsum(matrix, axis=1))
+        return self._daily_cumulative_cache[1], self._daily_cumulative_cache[2]
+
+    def _burndown_data(self, cid) -> tuple[str, np.ndarray, np.ndarray] | None:
+        """(year, running actuals per day, month budgets of the grid) for the detail burn-down chart."""
+        year = self._store_year()
+        if not year:
+            return None
+        categ_ids, cumulative = self._daily_cumulative(year, self._get_account_filter_ids())
+        pos = int(np.searchsorted(categ_ids, cid))
+        if pos < len(categ_ids) and categ_ids[pos] == cid:
+            actual = cumulative[pos]
+        else:
+            actual = np.zeros(cumulative.shape[1])
+        return year, actual, self._grid_month_budgets([cid])[0]
+
+    def _grid_month_budgets(self, cids: list[int]) -> np.ndarray:
+        """(category x 12) budgets as shown in the month grid, pending edits included."""
+        budgets = np.zeros((len(cids), 12))
+        for row_idx, cid in enumerate(cids):
+            cat_item = self.category_label_items.get(cid)
+            if cat_item is None:
+                continue
+            for child_row in range(cat_item.rowCount()):
+                label_item = cat_item.child(child_row, 0)
+                if label_item is None or label_item.text() != "Budget":
+                    continue
+                for month_idx in range(12):
+                    item = cat_item.child(child_row, 3 + month_idx)
+                    budgets[row_idx, month_idx] = self._parse_amount_text(item.text() if item else "")
+                break
+        return budgets
+
+    def _update_period_view(self):
+        granularity = self._period_granularity()
+        self.view.setVisible(not granularity)
+        self.period_view.setVisible(bool(granularity))
+        if not granularity:
+            self.period_view.setModel(None)
+            self._period_model = None
+            self._period_layout = None
+            return
+        year = self.year_cb.currentText()
+        rows: list[tuple[str, int, int]] = []
+
+        def add_rows(cid, depth=0):
+            rows.append((self.id2name.get(cid, f"(id:{cid})"), int(cid), depth))
+            for ch in sorted(self.children_map.get(cid, []), key=lambda x: self.id2name.get(x, "")):
+                add_rows(ch, depth + 1)
+
+        for root in self.root_ids:
+            add_rows(root)
+        cids = [cid for _, cid, _ in rows]
+        categ_ids, matrix = self.transaction_store.aggregate(year, self._get_account_filter_ids(), granularity)
+        pos = np.clip(np.searchsorted(categ_ids, cids), 0, max(len(categ_ids) - 1, 0))
+        found = (categ_ids[pos] == np.asarray(cids)) if len(categ_ids) else np.zeros(len(cids), dtype=bool)
+        actual = np.where(found[:, None], matrix[pos], 0.0) if len(categ_ids) else np.zeros((len(cids), matrix.shape[1]))
+        budget = prorate_budgets(year, granularity, self._grid_month_budgets(cids))
+        periods = period_labels(year, granularity)
+        self._period_model = PeriodGridModel(
+            rows, periods, actual, budget, diff_background, QBrush(MAIN_CATEGORY_BG), self.period_view
+        )
+        self.period_view.setModel(self._period_model)
+        first, step, count = period_bins(year, granularity)
+        start, end = date(int(year), 1, 1).toordinal(), date(int(year), 12, 31).toordinal()
+        ranges = [
+            (
+                date.fromordinal(max(first + idx * step, start)).isoformat(),
+                date.fromordinal(min(first + (idx + 1) * step, end + 1)).isoformat(),
+            )
+            for idx in range(count)
+        ]
+        self._period_layout = (granularity, year, ranges, {cid: row for row, cid in enumerate(cids)})
+        self.period_view.setColumnWidth(0, CATEGORY_COLUMN_WIDTH)
+        today = date.today()
+        if today.year == int(year):
+            # Bring the current week or day into view
+            column = 2 + (today.toordinal() - first) // step
+            self.period_view.scrollTo(self._period_model.index(0, column))
+
+    def _period_series(self, cid) -> tuple[str, list[str], list[float], list[float]] | None:
+        """(granularity, labels, actuals, budgets) of one category in the weekly/daily grid."""
+        if self._period_model is None or self._period_layout is None:
+            return None
+        granularity, _, _, cid_rows = self._period_layout
+        row = cid_rows.get(int(cid))
+        if row is None:
+            return None
+        labels, actuals, budgets = [], [], []
+        for column in range(2, self._period_model.columnCount()):
+            labels.append(str(self._period_model.headerData(column, Qt.Orientation.Horizontal)))
+            actual, budget = self._period_model.values(row, column)
+            actuals.append(actual)
+            budgets.append(budget)
+        return granularity, labels, actuals, budgets
+
+    def _on_period_view_double_clicked(self, index: QModelIndex):
+        if self._period_model is None or self._period_layout is None or not index.isValid():
+            return
+        cid = self._period_model.category_at(index.row())
+        if cid is None:
+            return
+        if index.column() == 0:
+            self._open_category_detail(cid)
+            return
+        _, year, ranges, _ = self._period_layout
+        if index.column() == 1:
+            date_range = (f"{year}-01-01", f"{int(year) + 1}-01-01")
+        else:
+            date_range = ranges[index.column() - 2]
+        label = self._period_model.headerData(index.column(), Qt.Orientation.Horizontal)
+        tooltip = self._period_model.headerData(index.column(), Qt.Orientation.Horizontal, Qt.ItemDataRole.ToolTipRole)
+        account_filter = self._get_account_filter_ids()
+        actual, _ = self._period_model.values(index.row(), index.column())
+        dialog = TransactionsDialog(
+            self,
+            f"{self.id2name.get(cid, f'(id:{cid})')} - {tooltip or label}",
+            lambda after, limit: fetch_transaction_page(cid, date_range, account_filter, after, limit),
+            actual,
+        )
+        dialog.exec()
+
     def _apply_column_widths(self, header_names):
         header = self.view.header()
         for col, name in enumerate(header_names):
@@ -1944,9 +2924,11 @@ class BudgetApp(QWidget):
         if not self.current_headers:
             return
         year_text = self.year_cb.currentText() if hasattr(self, "year_cb") else ""
+        now = datetime.now()
+        if self._rolling_active():
+            year_text = str(now.year)
         if not year_text or len(year_text) != 4 or not year_text.isdigit():
             return
-        now = datetime.now()
         month_code = f"{year_text}-{now.month:02d}"
         candidates = {month_code, self._display_header_name(month_code)}
         target_idx = None
@@ -1956,7 +2938,7 @@ class BudgetApp(QWidget):
                 break
         if target_idx is None:
             return
-        if target_idx < 3 or target_idx >= len(self.current_headers) - 1:
+        if target_idx < 3 or target_idx >= self._total_column():
             return
         self.view.set_highlighted_columns({target_idx})
         self.summary_header.set_highlighted_sections({target_idx})
@@ -1964,8 +2946,699 @@ class BudgetApp(QWidget):
     def _on_year_changed(self, year: str):
         if year:
             config.save_last_budget_year(year)
+        if self._consolidated is not None and year and year != self._consolidated.year:
+            self._load_consolidated(year)
+            return
         self.refresh()
 
+    def _rolling_active(self) -> bool:
+        return bool(self._rolling_months) and self._consolidated is None
+
+    def _is_read_only_view(self) -> bool:
+        return self._consolidated is not None or self._rolling_active() or bool(self._tag_dimension)
+
+    def _confirm_discard_edits(self, action: str) -> bool:
+        """True when there are no unsaved edits or the user agrees to drop them."""
+        if not self.edits:
+            return True
+        reply = QMessageBox.question(
+            self,
+            "Modifiche non salvate",
+            f"{action} scarta le modifiche non salvate. Continuare?",
+        )
+        return reply == QMessageBox.StandardButton.Yes
+
+    def _on_compare_changed(self, index: int):
+        if index == self._compare_index:
+            return
+        if not self._confirm_discard_edits("Cambiare il confronto con gli anni precedenti"):
+            self.compare_cb.blockSignals(True)
+            self.compare_cb.setCurrentIndex(self._compare_index)
+            self.compare_cb.blockSignals(False)
+            return
+        self._compare_index = index
+        self.refresh()
+
+    def _on_dimension_changed(self, *_):
+        dimension = self.dimension_cb.currentData() or ""
+        if dimension == self._tag_dimension:
+            return
+        if not self._confirm_discard_edits("Cambiare le righe della griglia"):
+            self.dimension_cb.blockSignals(True)
+            self.dimension_cb.setCurrentIndex(self.dimension_cb.findData(self._tag_dimension))
+            self.dimension_cb.blockSignals(False)
+            return
+        if not self._tag_dimension:
+            self._category_tree = (self.id2name, self.children_map, self.root_ids)
+        elif not dimension and self._category_tree is not None:
+            self.id2name, self.children_map, self.root_ids = self._category_tree
+            self._category_tree = None
+        self._tag_dimension = dimension
+        self.rolling_toggle.setEnabled(not dimension)
+        self.compare_cb.setEnabled(not dimension)
+        self.search_edit.setEnabled(not dimension)
+        self._apply_edit_mode()
+        self.refresh()
+
+    def _load_tag_view(self, year: str, account_filter):
+        """Put the tag tree in place of the categories and return its frames.
+
+        The per-year aggregates are kept, so switching between the two tag
+        layouts only rebuilds the grid.
+        """
+        by_category = self._tag_dimension == "tag_category"
+        store = self.transaction_store
+        key = (year, tuple(account_filter or ()), store.generation if store is not None else None)
+        if self._tag_cache is None or self._tag_cache[0] != key:
+            self._tag_cache = (key, tag_aggregates(year, account_filter, store))
+        aggregates = self._tag_cache[1]
+        names, children, roots = self._category_tree
+        category_names = dict(category_paths(names, children, roots))
+        for cid in roots:
+            category_names.setdefault(int(cid), names.get(cid, f"(id:{cid})"))
+        self.id2name, self.children_map, self.root_ids = aggregates.layout(category_names, by_category)
+        return aggregates.frames(by_category)
+
+    def _apply_edit_mode(self):
+        read_only = self._is_read_only_view()
+        self.save_btn.setEnabled(not read_only)
+        self.suggest_btn.setEnabled(not read_only)
+        self.granularity_cb.setEnabled(not read_only)
+        if read_only:
+            self.view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        else:
+            self.view.setEditTriggers(
+                QAbstractItemView.EditTrigger.DoubleClicked | QAbstractItemView.EditTrigger.EditKeyPressed
+            )
+
+    def _on_rolling_changed(self, *_):
+        if self.rolling_toggle.isChecked() or self._rolling_months:
+            if not self._confirm_discard_edits("Cambiare la finestra mobile"):
+                self._restore_rolling_controls()
+                return
+        enabled = self.rolling_toggle.isChecked()
+        self.rolling_start_edit.setEnabled(enabled)
+        self.rolling_months_spin.setEnabled(enabled)
+        self.year_cb.setEnabled(not enabled)
+        self.compare_cb.setEnabled(not enabled)
+        self.dimension_cb.setEnabled(not enabled)
+        if not enabled and not self._rolling_months:
+            return
+        if enabled:
+            start = self.rolling_start_edit.date()
+            self._rolling_months = window_months(f"{start.year()}-{start.month():02d}", self.rolling_months_spin.value())
+        else:
+            self._rolling_months = []
+        self._apply_edit_mode()
+        self.refresh()
+
+    def _restore_rolling_controls(self):
+        """Put the rolling toggle, start and length back to the window on screen."""
+        controls = (self.rolling_toggle, self.rolling_start_edit, self.rolling_months_spin)
+        for widget in controls:
+            widget.blockSignals(True)
+        months = self._rolling_months
+        self.rolling_toggle.setChecked(bool(months))
+        if months:
+            self.rolling_start_edit.setDate(QDate(int(months[0][:4]), int(months[0][5:7]), 1))
+            self.rolling_months_spin.setValue(len(months))
+        for widget in controls:
+            widget.blockSignals(False)
+
+    def _on_memory_snapshot_toggled(self, checked: bool):
+        config.save_memory_snapshot(checked)
+        if not checked:
+            disable_memory_snapshot()
+            return
+        if config.DB_PATH and Path(config.DB_PATH).exists():
+            try:
+                enable_memory_snapshot(config.DB_PATH)
+            except sqlite3.Error as exc:
+                QMessageBox.warning(self, "DB in memoria", f"Impossibile copiare il database in memoria:\n{exc}")
+                self.memory_snapshot_check.setChecked(False)
+
+    def _toggle_consolidated_mode(self):
+        if self._consolidated is not None:
+            self._exit_consolidated_mode()
+            return
+        if not self._confirm_discard_edits("Aprire il consolidato"):
+            return
+        if self.rolling_toggle.isChecked():
+            self.rolling_toggle.setChecked(False)
+        if self._tag_dimension:
+            self.dimension_cb.setCurrentIndex(0)
+        start_dir = str(config.DB_PATH.parent) if config.DB_PATH else str(Path.home())
+        files, _ = QFileDialog.getOpenFileNames(self, "Database da consolidare", start_dir, "SQLite (*.mmb *.db)")
+        if not files:
+            return
+        self._consolidated_paths = [Path(f) for f in files]
+        year = self.year_cb.currentText() or (self.years[0] if self.years else str(datetime.now().year))
+        self._load_consolidated(year)
+
+    def _load_consolidated(self, year: str):
+        paths = list(self._consolidated_paths)
+        self.consolidate_btn.setEnabled(False)
+        self.setCursor(Qt.CursorShape.BusyCursor)
+        run_in_background(
+            lambda: merge_sources(load_sources(paths, year)),
+            self._on_consolidated_loaded,
+            self._on_consolidated_failed,
+        )
+
+    def _on_consolidated_loaded(self, consolidated):
+        self.unsetCursor()
+        self.consolidate_btn.setEnabled(True)
+        self._consolidated = consolidated
+        (
+            self.id2name,
+            self.children_map,
+            self.root_ids,
+            self.per_year_entries,
+            self.name_to_id,
+            self._consolidated_cid_to_path,
+        ) = consolidated.layout()
+        self.years = consolidated.years
+        self.consolidate_btn.setText("Chiudi consolidato")
+        self.save_btn.setEnabled(False)
+        self.accounts_cb.setEnabled(False)
+        self.rolling_toggle.setEnabled(False)
+        self.search_edit.setEnabled(False)
+        self.dimension_cb.setEnabled(False)
+        self.granularity_cb.setEnabled(False)
+        self.view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self._set_db_path_label(f"consolidato ({len(consolidated.sources)}) - " + ", ".join(consolidated.sources))
+        self.year_cb.blockSignals(True)
+        self.year_cb.clear()
+        self.year_cb.addItems(self.years)
+        self.year_cb.setCurrentText(consolidated.year)
+        self.year_cb.blockSignals(False)
+        self.refresh()
+
+    def _on_consolidated_failed(self, exc: BaseException):
+        self.unsetCursor()
+        self.consolidate_btn.setEnabled(True)
+        QMessageBox.critical(self, "Errore database", f"Impossibile consolidare i database:\n{exc}")
+
+    def _reset_consolidated_state(self):
+        self._consolidated = None
+        self._consolidated_cid_to_path = {}
+        self.consolidate_btn.setText("Consolida DB")
+        self.rolling_toggle.setEnabled(True)
+        self.search_edit.setEnabled(True)
+        self.dimension_cb.setEnabled(True)
+        self._apply_edit_mode()
+
+    def _exit_consolidated_mode(self):
+        self._reset_consolidated_state()
+        self._load_data_for_current_db(show_errors=True)
+        self._set_db_path_label(config.DB_PATH)
+        self.db_watcher.watch(config.DB_PATH)
+        self._populate_account_selector()
+        selected = self._populate_year_combobox()
+        if selected:
+            self._on_year_changed(selected)
+        else:
+            self.refresh()
+
+    def _balance_range(self) -> tuple[date, date] | None:
+        """First and last day of the months on screen."""
+        months = [name for name in getattr(self, "header_month_names", []) if len(name) == 7 and name[:4].isdigit()]
+        if not months:
+            return None
+        last_year, last_month = int(months[-1][:4]), int(months[-1][5:7])
+        end = date(last_year + last_month // 12, last_month % 12 + 1, 1).toordinal() - 1
+        return date(int(months[0][:4]), int(months[0][5:7]), 1), date.fromordinal(end)
+
+    def _update_balance_chart(self):
+        """Redraw the balances tab in the background; skipped while another tab is shown."""
+        if self.chart_tabs.currentIndex() != 1:
+            return
+        self._balance_request += 1
+        request = self._balance_request
+        span = self._balance_range()
+        if self._consolidated is not None or span is None or not config.DB_PATH:
+            self._draw_balance_chart(None)
+            return
+        account_filter = self._get_account_filter_ids()
+        project_from = date.today() if self.balance_projection_check.isChecked() else None
+        ledger = self.balance_ledger
+
+        def compute():
+            current = ledger if ledger is not None else BalanceLedger()
+            current.refresh()
+            return current, current.timeline(span[0], span[1], account_filter, project_from)
+
+        def done(result):
+            if request != self._balance_request:
+                return
+            if ledger is self.balance_ledger:
+                self.balance_ledger = result[0]
+            self._draw_balance_chart(result[1])
+
+        def failed(exc):
+            if request == self._balance_request:
+                self._draw_balance_chart(None, str(exc))
+
+        run_in_background(compute, done, failed)
+
+    def _draw_balance_chart(self, timeline, error: str | None = None):
+        self.balance_figure.clear()
+        self.balance_figure.set_facecolor("#f8fafc")
+        ax = self.balance_figure.add_subplot(111)
+        ax.set_facecolor("#ffffff")
+        if timeline is None or not timeline.account_ids:
+            ax.axis("off")
+            message = "Saldi non disponibili nel consolidato" if self._consolidated is not None else "Nessun dato disponibile"
+            ax.text(0.5, 0.5, error or message, ha="center", va="center", fontsize=9, color="#4b5563")
+            self.balance_canvas.draw_idle()
+            return
+        xs = np.arange(len(timeline.total))
+        split = timeline.projected_from if timeline.projected_from is not None else len(xs)
+        if len(timeline.account_ids) <= 8:
+            palette = colormaps["tab10"]
+            for idx, name in enumerate(timeline.names):
+                ax.plot(xs, timeline.balances[idx], color=palette(idx % 10), linewidth=0.9, alpha=0.75, label=name)
+        ax.plot(xs[: split + 1], timeline.total[: split + 1], color="#111827", linewidth=2.0, label="Totale")
+        if split < len(xs):
+            ax.plot(xs[split:], timeline.total[split:], color="#111827", linewidth=2.0, linestyle="--", label="Totale previsto")
+            ax.axvline(split, color="#94a3b8", linewidth=0.8, linestyle=":")
+        days = timeline.days
+        month_starts = [idx for idx, day in enumerate(days.tolist()) if date.fromordinal(day).day == 1]
+        ax.set_xticks(month_starts)
+        ax.set_xticklabels(
+            [ITALIAN_MONTH_NAMES[f"{date.fromordinal(int(days[idx])).month:02d}"][:3] for idx in month_starts],
+            fontsize=8,
+            color="#475569",
+        )
+        ax.tick_params(axis="y", labelsize=8, colors="#475569")
+        ax.yaxis.set_major_formatter(FuncFormatter(lambda value, _: f"{value:,.0f}"))
+        ax.set_title(f"Saldo a fine periodo: {timeline.total[-1]:,.2f}", fontsize=10, color="#111827", pad=6)
+        ax.grid(axis="y", color="#e2e8f0", linestyle="-", linewidth=0.8, alpha=0.9)
+        ax.set_axisbelow(True)
+        for spine in ("top", "right"):
+            ax.spines[spine].set_visible(False)
+        ax.spines["bottom"].set_color("#e2e8f0")
+        ax.spines["left"].set_color("#e2e8f0")
+        ax.margins(x=0.01)
+        ax.legend(loc="center left", bbox_to_anchor=(1.0, 0.5), fontsize=7, frameon=False)
+        self.balance_figure.subplots_adjust(left=0.07, right=0.82, top=0.86, bottom=0.14)
+        self.balance_canvas.draw_idle()
+
+    def _on_db_changed(self):
+        if self._consolidated is not None:
+            return
+        self._sync_search_index()
+        self._update_balance_chart()
+        if self._rolling_active() or self._tag_dimension:
+            # Read-only view without edits to preserve: just rebuild it
+            self._tag_cache = None
+            store = self.transaction_store
+            if store is not None:
+                run_in_background(store.refresh, lambda _: self.refresh(), lambda exc: None)
+            else:
+                self.refresh()
+            return
+        year = self.year_cb.currentText()
+        if not year or not getattr(self, "header_ids", None):
+            return
+        account_filter = self._get_account_filter_ids()
+        with_forecast = "Forecast" in self.current_headers
+        run_in_background(
+            lambda: (
+                self._fetch_actuals(year, account_filter, refresh=True),
+                self._load_projected(year, account_filter),
+                year_end_forecast(year, account_filter, self.transaction_store) if with_forecast else None,
+            ),
+            lambda result: self._patch_actuals(year, account_filter, *result),
+            lambda exc: None,
+        )
+
+    def _patch_actuals(self, year: str, account_filter, df_actual, df_projected=None, df_forecast=None):
+        """Apply freshly fetched actuals to the visible grid, keeping unsaved edits."""
+        if year != self.year_cb.currentText() or account_filter != self._get_account_filter_ids():
+            return
+        if self._is_read_only_view():
+            return
+        colname_to_bid = {name: bid for bid, name in self.per_year_entries.get(year, [])}
+        if df_projected is not None and not self.edits:
+            if self._projected_map(df_projected, colname_to_bid) != self.projected_map:
+                # Executed schedules add or drop 'Previsto' rows: rebuild instead of patching
+                self.refresh()
+                return
+        new_map = {
+            (int(r["categid"]), colname_to_bid.get(r["month"])): float(r["amount"])
+            for _, r in df_actual.iterrows()
+            if colname_to_bid.get(r["month"])
+        }
+        old_map = getattr(self, "actual_map", {})
+        changed = {key[0] for key in set(new_map) | set(old_map) if new_map.get(key, 0.0) != old_map.get(key, 0.0)}
+        self.actual_map = new_map
+        if df_forecast is not None:
+            new_forecast = self._forecast_map(df_forecast)
+            changed |= {
+                cid
+                for cid in set(new_forecast) | set(self.forecast_map)
+                if new_forecast.get(cid) != self.forecast_map.get(cid)
+            }
+            self.forecast_map = new_forecast
+        for cid in changed:
+            cat_item = self.category_label_items.get(cid)
+            if cat_item is None:
+                continue
+            self._update_actual_row(cat_item, cid)
+            self._update_comparison_rows(cat_item, cid)
+            self.recalc_category(cid)
+        if self._period_model is not None:
+            # The store is already refreshed: weekly/daily bins need no SQL
+            self._update_period_view()
+
+    def _load_projected(self, year: str, account_filter):
+        """Scheduled transactions projected over the visible months (none for consolidated or tag views)."""
+        if self._consolidated is not None or self._tag_dimension:
+            return None
+        if self._rolling_active():
+            return projected_actuals(self._rolling_months[0][:4], self._rolling_months[-1][:4], account_filter)
+        if not year.isdigit():
+            return None
+        return projected_actuals(year, account_ids=account_filter)
+
+    @staticmethod
+    def _projected_map(df_projected, colname_to_bid) -> dict[tuple[int, int], float]:
+        if df_projected is None:
+            return {}
+        return {
+            (int(cid), colname_to_bid[month]): float(amount)
+            for month, cid, amount in zip(df_projected["month"], df_projected["categid"], df_projected["amount"])
+            if month in colname_to_bid
+        }
+
+    def _projected_row(self, cid: int) -> list[QStandardItem]:
+        """'Previsto' row for categories with scheduled amounts in the visible months."""
+        values = [self.projected_map.get((cid, bid), 0.0) for bid in self.header_ids[1:]]
+        if not any(values):
+            return []
+        italic = QFont(UI_FONT_FAMILY, UI_BASE_FONT_SIZE)
+        italic.setItalic(True)
+        row = [make_item("Previsto", False, color=QColor("#6d28d9")), make_item("", False), make_item("", False)]
+        for val in values + [sum(values)]:
+            col = QColor("#1b5e20") if val > 0 else QColor("#b71c1c") if val < 0 else QColor("#000")
+            cell = make_item(f"{val:,.2f}" if val else "", False, color=col)
+            cell.setFont(italic)
+            row.append(cell)
+        row[0].setFont(italic)
+        return row
+
+    def _rollover_row(self, month_actuals: list[float], month_budgets: list[float]) -> list[QStandardItem]:
+        """'Disponibile' row: what is left of the budget (or overspent), carried month to month."""
+        italic = QFont(UI_FONT_FAMILY, DIFF_FONT_SIZE)
+        italic.setItalic(True)
+        row = [make_item("Disponibile", False, color=QColor("#0f766e")), make_item("", False), make_item("", False)]
+        row[0].setFont(italic)
+        cells = [make_item("", False) for _ in range(len(month_actuals) + 1)]
+        for cell in cells:
+            cell.setFont(italic)
+        self._set_rollover_values(cells, month_actuals, month_budgets)
+        return row + cells
+
+    @staticmethod
+    def _set_rollover_values(cells, month_actuals: list[float], month_budgets: list[float]):
+        """Month cells get the running balance, the last (TOTAL) cell the balance carried out."""
+        balances = carried_balances(month_actuals, month_budgets).tolist()
+        if balances:
+            balances.append(balances[-1])
+        for cell, balance in zip(cells, balances):
+            if cell:
+                cell.setText(format_diff_value(balance))
+                cell.setBackground(diff_background(balance))
+
+    def _set_category_rollover(self, cid, enabled: bool):
+        if enabled:
+            self.rollover_categories.add(cid)
+        else:
+            self.rollover_categories.discard(cid)
+        config.save_rollover_categories(sorted(self.rollover_categories))
+        cat_item = self.category_label_items.get(cid)
+        if cat_item is None:
+            return
+        rows = {}
+        for rr in range(cat_item.rowCount()):
+            label_item = cat_item.child(rr, 0)
+            if label_item:
+                rows[label_item.text()] = rr
+        if not enabled and "Disponibile" in rows:
+            cat_item.removeRow(rows["Disponibile"])
+        elif enabled and "Disponibile" not in rows and "Diff" in rows:
+            empty = [0.0] * (len(self.header_ids) - 1)
+            cat_item.insertRow(rows["Diff"] + 1, self._rollover_row(empty, empty))
+            self.recalc_category(cid)
+
+    def _load_forecast(self, year: str, account_filter):
+        """Year-end forecast frame; None when the view gets no Forecast column."""
+        if self._is_read_only_view() or not year.isdigit() or int(year) < datetime.now().year:
+            return None
+        return year_end_forecast(year, account_filter, self.transaction_store)
+
+    def _load_seasonal_profiles(self, year: str, account_filter) -> dict[int, np.ndarray]:
+        """Month weights of the seasonal categories; rolling views get them from ``window_frames``."""
+        if not self.seasonal_categories or self._is_read_only_view() or not year.isdigit():
+            return {}
+        profiles = seasonal_profiles(year, account_filter, self.transaction_store)
+        return {cid: weights for cid, weights in profiles.items() if cid in self.seasonal_categories}
+
+    def _month_weights(self, cid) -> dict[int, float] | None:
+        """Month bid -> seasonal weight for ``compute_budget_distribution``; None spreads evenly."""
+        profile = self.seasonal_profile_map.get(cid)
+        if profile is None:
+            return None
+        return {
+            bid: float(profile[month - 1])
+            for bid, month in zip(self.header_ids[1:], self.header_month_numbers)
+            if month
+        }
+
+    def _set_category_seasonal(self, cid, enabled: bool):
+        if enabled:
+            self.seasonal_categories.add(cid)
+        else:
+            self.seasonal_categories.discard(cid)
+        config.save_seasonal_categories(sorted(self.seasonal_categories))
+        self.seasonal_profile_map = self._load_seasonal_profiles(
+            self.year_cb.currentText(), self._get_account_filter_ids()
+        )
+        self.recalc_category(cid)
+
+    @staticmethod
+    def _forecast_map(df_forecast) -> dict[int, tuple[float, float, float, float]]:
+        """CATEGID -> (forecast, actual to date, scheduled remainder, seasonal remainder)."""
+        if df_forecast is None:
+            return {}
+        return {
+            int(cid): (float(forecast), float(actual), float(scheduled), float(seasonal))
+            for cid, actual, scheduled, seasonal, forecast in zip(
+                df_forecast["categid"],
+                df_forecast["actual"],
+                df_forecast["scheduled"],
+                df_forecast["seasonal"],
+                df_forecast["forecast"],
+            )
+        }
+
+    def _total_column(self, header_names: list[str] | None = None) -> int:
+        """Index of TOTAL; trailing columns after it (Forecast) hold no month data."""
+        header_names = self.current_headers if header_names is None else header_names
+        if "TOTAL" in header_names:
+            return header_names.index("TOTAL")
+        return len(header_names) - 1
+
+    def _fill_forecast_cells(self, actual_cell, diff_cell, cid: int, budget_total: float):
+        """Forecast on the 'Reale' row, forecast minus the year budget on the 'Diff' row."""
+        forecast, actual, scheduled, seasonal = self.forecast_map.get(cid, (0.0, 0.0, 0.0, 0.0))
+        if actual_cell is not None:
+            actual_cell.setText(f"{forecast:,.2f}")
+            actual_cell.setForeground(
+                QBrush(QColor("#1b5e20") if forecast > 0 else QColor("#b71c1c") if forecast < 0 else QColor("#000"))
+            )
+            actual_cell.setToolTip(
+                f"Reale a oggi: {actual:,.2f}\n"
+                f"Programmato restante: {scheduled:,.2f}\n"
+                f"Stagionale restante: {seasonal:,.2f}"
+            )
+        if diff_cell is not None:
+            diff = forecast - budget_total
+            diff_cell.setText(format_diff_value(diff))
+            diff_cell.setFont(QFont(UI_FONT_FAMILY, DIFF_FONT_SIZE))
+            diff_cell.setBackground(diff_background(diff))
+
+    def _load_comparison_map(self, year: str, account_filter) -> dict[str, dict[tuple[int, int], float]]:
+        """Previous-year actuals per (CATEGID, month number), most recent year first."""
+        count = self.compare_cb.currentData() if hasattr(self, "compare_cb") else 0
+        if not count or self._is_read_only_view() or not year.isdigit():
+            return {}
+        first, last = int(year) - int(count), int(year) - 1
+        store = self.transaction_store
+        if store is not None:
+            years, categids, cube = store.year_cube(first, last, account_filter)
+        else:
+            years, categids, cube = fetch_actuals_for_years(first, last, account_filter)
+        comparison = {}
+        for y_idx in range(len(years) - 1, -1, -1):
+            months, cats = np.nonzero(cube[y_idx])
+            comparison[years[y_idx]] = {
+                (int(categids[c]), int(m) + 1): float(cube[y_idx, m, c]) for m, c in zip(months, cats)
+            }
+        return comparison
+
+    def _comparison_values(self, cid: int, year_map: dict[tuple[int, int], float]) -> list[float]:
+        return [year_map.get((cid, month), 0.0) if month else 0.0 for month in self.header_month_numbers]
+
+    def _comparison_rows(self, cid: int) -> list[list[QStandardItem]]:
+        """'Reale <anno>' rows for the compared years plus the 'Δ vs <anno>' row."""
+        if not self.comparison_map:
+            return []
+        label_color = QColor("#6b21a8")
+        rows = []
+        for prev_year, year_map in self.comparison_map.items():
+            values = self._comparison_values(cid, year_map)
+            row = [make_item(f"Reale {prev_year}", False, color=label_color), make_item("", False), make_item("", False)]
+            for val in values:
+                col = QColor("#1b5e20") if val > 0 else QColor("#b71c1c") if val < 0 else QColor("#000")
+                row.append(make_item(f"{val:,.2f}", False, color=col))
+            row.append(make_item(f"{sum(values):,.2f}", False))
+            rows.append(row)
+        prev_year = next(iter(self.comparison_map))
+        delta_row = [make_item(f"Δ vs {prev_year}", False, color=label_color), make_item("", False), make_item("", False)]
+        delta_row.extend(make_item("", False) for _ in range(len(self.header_month_numbers) + 1))
+        rows.append(delta_row)
+        self._fill_delta_row(delta_row, cid)
+        return rows
+
+    def _fill_delta_row(self, cells, cid: int):
+        """Current minus previous-year actual per month column; ``cells`` are the row items."""
+        prev_values = self._comparison_values(cid, next(iter(self.comparison_map.values())))
+        diff_font = QFont(UI_FONT_FAMILY, DIFF_FONT_SIZE)
+        total = 0.0
+        for offset, (bid, prev) in enumerate(zip(self.header_ids[1:], prev_values)):
+            delta = self.actual_map.get((cid, bid), 0.0) - prev
+            total += delta
+            cell = cells[3 + offset]
+            cell.setText(format_diff_value(delta))
+            cell.setFont(diff_font)
+            cell.setBackground(diff_background(delta))
+        cell = cells[3 + len(prev_values)]
+        cell.setText(format_diff_value(total))
+        cell.setFont(diff_font)
+        cell.setBackground(diff_background(total))
+
+    def _update_comparison_rows(self, cat_item: QStandardItem, cid: int):
+        if not self.comparison_map:
+            return
+        for rr in range(cat_item.rowCount()):
+            label_item = cat_item.child(rr, 0)
+            if label_item and label_item.text().startswith("Δ vs "):
+                cells = [cat_item.child(rr, col) for col in range(cat_item.columnCount())]
+                if all(cells):
+                    previous_guard = self._recalc_guard
+                    self._recalc_guard = True
+                    try:
+                        self._fill_delta_row(cells, cid)
+                    finally:
+                        self._recalc_guard = previous_guard
+                return
+
+    def _update_actual_row(self, cat_item: QStandardItem, cid: int):
+        actual_row_idx = None
+        for rr in range(cat_item.rowCount()):
+            label_item = cat_item.child(rr, 0)
+            if label_item and label_item.text() == "Reale":
+                actual_row_idx = rr
+                break
+        if actual_row_idx is None:
+            return
+        previous_guard = self._recalc_guard
+        self._recalc_guard = True
+        try:
+            total_act = 0.0
+            columns = [(1, self.header_ids[0])] + list(enumerate(self.header_ids[1:], start=3))
+            for col, bid in columns:
+                val = self.actual_map.get((cid, bid), 0.0)
+                total_act += val
+                cell = cat_item.child(actual_row_idx, col)
+                if cell:
+                    cell.setText(f"{val:,.2f}")
+                    cell.setForeground(
+                        QBrush(QColor("#1b5e20") if val > 0 else QColor("#b71c1c") if val < 0 else QColor("#000"))
+                    )
+            total_cell = cat_item.child(actual_row_idx, 3 + len(self.header_ids) - 1)
+            if total_cell:
+                total_cell.setText(f"{total_act:,.2f}")
+        finally:
+            self._recalc_guard = previous_guard
+
+    def _fetch_actuals(self, year: str, account_filter, refresh: bool = False):
+        store = self.transaction_store
+        if store is None:
+            return fetch_actuals_for_year(year, account_filter)
+        if refresh:
+            store.refresh()
+        return store.actuals_frame(year, account_filter)
+
+    def _load_year_frames(self, year: str, account_filter):
+        if self._consolidated is not None:
+            return self._consolidated.frames(self._consolidated_cid_to_path, self.name_to_id)
+        if self._tag_dimension:
+            return self._load_tag_view(year, account_filter)
+        if self._rolling_active():
+            return window_frames(
+                self._rolling_months,
+                window_entries(self._rolling_months),
+                account_filter,
+                self.name_to_id,
+                self.per_year_entries,
+                self.transaction_store,
+                self.seasonal_categories,
+            )
+        df_actual = self._fetch_actuals(year, account_filter)
+        if self._warm_cache is not None:
+            df_bud = self._warm_cache.budgets_for_year(year, self.per_year_entries)
+        else:
+            df_bud = load_budgets_for_year(year, self.name_to_id, self.per_year_entries)
+        return df_actual, df_bud
+
+    def _on_warm_cache_checked(self, warm, result):
+        """Background validation of a warm start: reload what the DB changed meanwhile."""
+        if warm is not self._warm_cache:
+            return
+        self._warm_cache = None
+        lookups_fresh, actuals_changed = result
+        if not lookups_fresh and not self.edits:
+            self._reload_current_db()
+            return
+        if not lookups_fresh:
+            # Keep the edits: patch the actuals now, reload the lookups once they are saved or discarded
+            self._lookups_stale = True
+            self._on_db_changed()
+        elif actuals_changed:
+            self._on_db_changed()
+
+    def _reload_current_db(self):
+        self._lookups_stale = False
+        self._load_data_for_current_db(show_errors=True)
+        self._populate_account_selector()
+        selected = self._populate_year_combobox()
+        if selected:
+            self._on_year_changed(selected)
+        else:
+            self.refresh()
+
+    def _save_warm_cache(self):
+        if self._consolidated is not None or self.transaction_store is None or not config.DB_PATH:
+            return
+        try:
+            save_warm_cache(config.DB_PATH, self.transaction_store)
+        except (OSError, sqlite3.Error, ValueError, TypeError):
+            # The cache is only a launch shortcut; closing must not fail on it
+            pass
+
     def _compute_summary_totals(
         self, header_names: list[str]
     ) -> dict[int, dict[str, float]]:
@@ -1982,12 +3655,14 @@ class BudgetApp(QWidget):
 
         root = self.model.invisibleRootItem()
         column_count = self.model.columnCount()
+        total_col = self._total_column(header_names)
         for r in range(root.rowCount()):
             category_item = root.child(r, 0)
             if not category_item:
                 continue
             budget_row_idx = None
             actual_row_idx = None
+            projected_row_idx = None
             for rr in range(category_item.rowCount()):
                 label_item = category_item.child(rr, 0)
                 if not label_item:
@@ -1997,6 +3672,8 @@ class BudgetApp(QWidget):
                     budget_row_idx = rr
                 elif label_text == "Reale":
                     actual_row_idx = rr
+                elif label_text == "Previsto":
+                    projected_row_idx = rr
             if budget_row_idx is None and actual_row_idx is None:
                 continue
             category_name = (category_item.text() or "").strip()
@@ -2009,13 +3686,18 @@ class BudgetApp(QWidget):
                 actual_val = 0.0
                 budget_val = 0.0
                 if budget_row_idx is not None:
-                    cell = category_item.child(budget_row_idx, col)
+                    # Trailing columns compare against the year budget
+                    cell = category_item.child(budget_row_idx, min(col, total_col))
                     if cell:
                         budget_val = _accumulate(bucket, "budget", cell.text())
                 if actual_row_idx is not None:
                     cell = category_item.child(actual_row_idx, col)
                     if cell:
                         actual_val = _accumulate(bucket, "actual", cell.text())
+                if projected_row_idx is not None:
+                    cell = category_item.child(projected_row_idx, col)
+                    if cell:
+                        _accumulate(bucket, "projected", cell.text())
                 diff_value = actual_val - budget_val
                 if abs(diff_value) > 1e-6:
                     bucket.setdefault("contributors", []).append((category_name, diff_value))
@@ -2045,8 +3727,7 @@ class BudgetApp(QWidget):
             return
         totals = self._compute_summary_totals(header_names)
         summary: dict[int, Any] = {}
-        model_column_count = self.model.columnCount()
-        total_col_index = model_column_count - 1 if model_column_count > 0 else len(header_names) - 1
+        total_col_index = self._total_column(header_names)
         summary[0] = {
             "background": QBrush(QColor("#E8EAED")),
             "alignment": Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
@@ -2076,9 +3757,7 @@ class BudgetApp(QWidget):
             diff_by_col[col] = diff_val
             contributors_by_col[col] = list(col_totals.get("contributors", []))
 
-        month_columns = [
-            col for col in ordered_columns if header_names[col].upper() != "TOTAL"
-        ]
+        month_columns = [col for col in ordered_columns if col < total_col_index]
         cumulative_actual_by_col: dict[int, float] = {}
         cumulative_budget_by_col: dict[int, float] = {}
         cumulative_diff_by_col: dict[int, float] = {}
@@ -2223,6 +3902,23 @@ class BudgetApp(QWidget):
                 contributors,
             )
 
+        if self.projected_map:
+            summary[0]["lines"].append({"text": "PREVISTO", "bg": SUMMARY_PROJECTED_COLOR})
+            projected_by_col: dict[int, float] = {}
+            running_projected = 0.0
+            for col in month_columns:
+                value = totals.get(col, {}).get("projected", 0.0)
+                running_projected += value
+                projected_by_col[col] = running_projected if self.summary_cumulative_mode else value
+            if month_columns:
+                projected_by_col[total_col_index] = running_projected
+            else:
+                projected_by_col[total_col_index] = totals.get(total_col_index, {}).get("projected", 0.0)
+            for col, value in projected_by_col.items():
+                entry = summary.get(col)
+                if isinstance(entry, dict) and entry.get("lines"):
+                    entry["lines"].append({"text": format_diff_value(value), "bg": SUMMARY_PROJECTED_COLOR})
+
         if toggle_column is not None and 0 <= toggle_column < len(header_names):
             mode_text = "cumulativa" if self.summary_cumulative_mode else "mensile"
             tooltip_text = (
@@ -2306,6 +4002,22 @@ class BudgetApp(QWidget):
                     main_name = self.id2name.get(main_id, str(main_id))
         if not main_name:
             main_name = name
+        source_provider = None
+        if self._consolidated is not None:
+            path = self._consolidated_cid_to_path.get(cid, "")
+            source_provider = lambda path=path: self._consolidated.source_breakdown(path)
+        seasonal_handler = None
+        if not self._is_read_only_view() and self.year_cb.currentText().isdigit():
+            seasonal_handler = lambda enabled, cid=cid: self._set_category_seasonal(cid, enabled)
+        rollover_handler = drilldown_handler = None
+        if self._consolidated is None and not self._tag_dimension:
+            rollover_handler = lambda enabled, cid=cid: self._set_category_rollover(cid, enabled)
+            drilldown_handler = lambda column, cid=cid: self._open_transactions(cid, column)
+        payee_provider = None
+        if self._consolidated is None and not self._tag_dimension and self.header_month_names:
+            months = list(self.header_month_names)
+            account_filter = self._get_account_filter_ids()
+            payee_provider = lambda cid=cid: payee_breakdown(cid, months, account_filter, self.transaction_store)
         dialog = CategoryDetailDialog(
             self,
             name,
@@ -2314,17 +4026,115 @@ class BudgetApp(QWidget):
             lambda cid=cid: self._category_detail_rows(cid),
             self._copy_budget_from_detail,
             self._update_budget_from_detail,
+            source_provider=source_provider,
+            seasonal_handler=seasonal_handler,
+            seasonal_checked=cid in self.seasonal_categories,
+            rollover_handler=rollover_handler,
+            rollover_checked=cid in self.rollover_categories,
+            drilldown_handler=drilldown_handler,
+            payee_provider=payee_provider,
+            period_series=self._period_series(cid),
+            burndown_provider=(lambda cid=cid: self._burndown_data(cid)) if self._store_year() else None,
+        )
+        dialog.exec()
+
+    def _cell_date_range(self, column: int) -> tuple[str, tuple[str, str], list[int]] | None:
+        """(label, [start, end) dates, month bids) of a month or TOTAL column; None otherwise."""
+        months = self.header_month_names
+        total_col = self._total_column()
+        if 3 <= column < 3 + len(months):
+            picked = [column - 3]
+        elif column == total_col and months:
+            picked = list(range(len(months)))
+        else:
+            return None
+        names = [months[idx] for idx in picked]
+        if not all(len(name) == 7 and name[:4].isdigit() and name[5:7].isdigit() for name in names):
+            return None
+        ordinals = [int(name[:4]) * 12 + int(name[5:7]) for name in names]
+        if ordinals != list(range(ordinals[0], ordinals[0] + len(ordinals))):
+            # TOTAL over months with gaps is not a single date range
+            return None
+        last_year, last_month = int(names[-1][:4]), int(names[-1][5:7])
+        end = f"{last_year + last_month // 12}-{last_month % 12 + 1:02d}-01"
+        label = self.current_headers[column] if column < len(self.current_headers) else names[0]
+        return label, (f"{names[0]}-01", end), [self.header_ids[idx + 1] for idx in picked]
+
+    def _open_transactions(self, cid, column: int):
+        if self._consolidated is not None or self._tag_dimension:
+            return
+        cell = self._cell_date_range(column)
+        if cell is None:
+            return
+        label, date_range, bids = cell
+        cid = int(cid)
+        account_filter = self._get_account_filter_ids()
+        name = self.id2name.get(cid, f"(id:{cid})")
+        cell_total = sum(self.actual_map.get((cid, bid), 0.0) for bid in bids)
+        dialog = TransactionsDialog(
+            self,
+            f"{name} - {label}",
+            lambda after, limit: fetch_transaction_page(cid, date_range, account_filter, after, limit),
+            cell_total,
         )
         dialog.exec()
 
     def _open_all_categories_diff(self):
+        year = self.year_cb.currentText() if hasattr(self, "year_cb") else ""
+        simulation_provider = None
+        if "Forecast" in self.current_headers:
+            # Names and budgets are read here, the simulation runs off the GUI thread
+            account_filter = self._get_account_filter_ids()
+            budgets = {cid: totals.get("budget", 0.0) for cid, totals in self.category_totals.items()}
+            names = {}
+            for cid, item in self.category_label_items.items():
+                meta = item.data(Qt.ItemDataRole.UserRole)
+                name = self.id2name.get(cid, f"(id:{cid})")
+                names[cid] = f"{meta[4]}:{name}" if meta and meta[2] and meta[4] != name else name
+            simulation_provider = lambda: self._simulation_rows(year, account_filter, names, budgets)
         dialog = AllCategoriesDiffDialog(
             self,
-            self.year_cb.currentText() if hasattr(self, "year_cb") else "",
+            year,
             self._all_categories_diff_rows,
+            simulation_provider,
         )
         dialog.exec()
 
+    def _simulation_rows(self, year: str, account_filter, names, budgets) -> tuple[list[dict[str, Any]], str]:
+        """Simulated P10/P50/P90 rows, widest spread first, and a one-line run summary."""
+        result = simulate_year_end(year, account_filter, self.transaction_store)
+        rows = []
+        for cid, (p10, p50, p90) in zip(result.categids.tolist(), result.percentiles):
+            if not (p10 or p50 or p90):
+                continue
+            rows.append(
+                {
+                    "label": names.get(cid, self.id2name.get(cid, f"(id:{cid})")),
+                    "p10": float(p10),
+                    "p50": float(p50),
+                    "p90": float(p90),
+                    "budget": budgets.get(cid, 0.0),
+                    "row_role": "category",
+                }
+            )
+        rows.sort(key=lambda row: row["p90"] - row["p10"], reverse=True)
+        p10, p50, p90 = (float(v) for v in result.overall)
+        rows.append(
+            {
+                "label": "Totale",
+                "p10": p10,
+                "p50": p50,
+                "p90": p90,
+                "budget": sum(budgets.values()),
+                "row_role": "total",
+            }
+        )
+        info = (
+            f"{result.trials:,} prove (seed {result.seed}) in {result.seconds:.2f} s"
+            f" - {result.trials_per_second:,.0f} prove/s"
+        )
+        return rows, info
+
     def _all_categories_diff_rows(self) -> list[dict[str, Any]]:
         header_names = self.current_headers or []
         if not header_names:
@@ -2335,7 +4145,7 @@ class BudgetApp(QWidget):
         running_actual = 0.0
         running_budget = 0.0
         running_diff = 0.0
-        column_count = min(self.model.columnCount(), len(header_names))
+        column_count = min(self.model.columnCount(), self._total_column(header_names) + 1)
         for col in range(1, column_count):
             header_label = header_names[col]
             if header_label == "Period" or col == 1:
@@ -2419,7 +4229,7 @@ class BudgetApp(QWidget):
 
         detail_rows: list[dict[str, Any]] = []
         added_separator = False
-        column_count = min(self.model.columnCount(), len(header_names))
+        column_count = min(self.model.columnCount(), self._total_column(header_names) + 1)
         for col in range(1, column_count):
             header_label = header_names[col]
             if header_label == "Period" or col == 1:
@@ -2440,7 +4250,7 @@ class BudgetApp(QWidget):
             if not diff_bg:
                 diff_bg = diff_background(computed_diff)
             meta = budget_item.data(Qt.ItemDataRole.UserRole) if budget_item else None
-            if meta and isinstance(meta, tuple) and meta[0] == "budget":
+            if meta and isinstance(meta, tuple) and meta[0] == "budget" and not self._is_read_only_view():
                 budget_index = budget_item.index()
             else:
                 budget_index = QModelIndex()
@@ -2456,6 +4266,7 @@ class BudgetApp(QWidget):
                     "diff_text": diff_text or "0",
                     "diff_background": diff_bg,
                     "budget_index": budget_index,
+                    "column": col,
                     "row_role": "total" if is_total else "month",
                 }
             )
@@ -2480,6 +4291,10 @@ class BudgetApp(QWidget):
 
     def refresh(self):
         self.edits.clear()
+        if self._lookups_stale:
+            # Edits saved or discarded: now reload what the warm start served stale
+            self._reload_current_db()
+            return
         self._set_unsaved_changes(False)
         year = self.year_cb.currentText()
         if not year:
@@ -2487,7 +4302,12 @@ class BudgetApp(QWidget):
         self.view.clear_highlighted_columns()
         self.summary_header.set_highlighted_sections(set())
 
-        entries = self.per_year_entries.get(year, [])
+        if self._rolling_active():
+            entries = window_entries(self._rolling_months)
+        else:
+            entries = self.per_year_entries.get(year, [])
+        account_filter = self._get_account_filter_ids()
+        df_forecast = self._load_forecast(year, account_filter) if entries else None
         header_names = ["Category / RowType"]
         header_ids = []
         if entries:
@@ -2499,6 +4319,10 @@ class BudgetApp(QWidget):
                 header_names.append(self._display_header_name(name))
                 header_ids.append(bid)
         header_names.append("TOTAL")
+        total_col = len(header_names) - 1
+        has_forecast = df_forecast is not None
+        if has_forecast:
+            header_names.append("Forecast")
         self.current_headers = header_names[:]
         self._update_partial_budget_months(header_names)
 
@@ -2527,18 +4351,15 @@ class BudgetApp(QWidget):
             self.view.setItemDelegateForColumn(period_col, self.period_delegate)
         budget_columns = []
         if entries:
-            for idx in range(3, len(header_names) - 1):
+            for idx in range(3, total_col):
                 budget_columns.append(idx)
         for col in budget_columns:
             if 0 <= col < self.model.columnCount():
                 self.view.setItemDelegateForColumn(col, self.budget_button_delegate)
-        total_col = len(header_names) - 1
         if 0 <= total_col < self.model.columnCount():
             self.view.setItemDelegateForColumn(total_col, self.total_divider_delegate)
 
-        account_filter = self._get_account_filter_ids()
-        df_actual = fetch_actuals_for_year(year, account_filter)
-        df_bud = load_budgets_for_year(year, self.name_to_id, self.per_year_entries)
+        df_actual, df_bud = self._load_year_frames(year, account_filter)
         colname_to_bid = {name: bid for bid, name in entries}
 
         actual_map = {
@@ -2552,6 +4373,14 @@ class BudgetApp(QWidget):
         }
         # Cache for incremental updates during edits
         self.header_ids = header_ids
+        self.header_month_numbers = [
+            int(name[5:7]) if len(name) == 7 and name[5:7].isdigit() else None for _, name in entries[1:]
+        ]
+        self.header_month_names = [name for _, name in entries[1:]]
+        self.comparison_map = self._load_comparison_map(year, account_filter)
+        self.projected_map = self._projected_map(self._load_projected(year, account_filter), colname_to_bid)
+        self.forecast_map = self._forecast_map(df_forecast)
+        self.seasonal_profile_map = self._load_seasonal_profiles(year, account_filter)
         self.actual_map = actual_map
         self.base_budget_map = budget_map
         self.category_totals = {}
@@ -2603,6 +4432,8 @@ class BudgetApp(QWidget):
                 col = QColor("#1b5e20") if val > 0 else QColor("#b71c1c") if val < 0 else QColor("#000")
                 act_row.append(make_item(f"{val:,.2f}", False, ("actual", cid, bid), color=col))
             act_row.append(make_item(f"{total_act:,.2f}", False))
+            if has_forecast:
+                act_row.append(make_item("", False))
             cat_item.appendRow(act_row)
 
             # Budget row
@@ -2633,7 +4464,7 @@ class BudgetApp(QWidget):
                     overrides[bid] = amt
 
             monthly_value_for_diff, display_total, over_limit, explicit_bids = compute_budget_distribution(
-                year_amt, year_per, month_bids, overrides
+                year_amt, year_per, month_bids, overrides, self._month_weights(cid)
             )
 
             for bid in month_bids:
@@ -2656,6 +4487,8 @@ class BudgetApp(QWidget):
             # Highlight in red if explicit monthly budgets exceed annual budget in absolute value
             if over_limit:
                 tot_item.setBackground(QBrush(QColor("#F8D6D6")))
+            if has_forecast:
+                bud_row.append(make_item("", False))
             cat_item.appendRow(bud_row)
 
             # Diff row
@@ -2664,11 +4497,14 @@ class BudgetApp(QWidget):
            # diff_font.setItalic(True)
             diff_row.append(make_item("", False))
             diff_row.append(make_item("", False))
+            month_actuals, month_budgets = [], []
             for bid in header_ids[1:]:
                 a = actual_map.get((cid, bid), 0.0)
                 b = monthly_value_for_diff.get(bid)
                 if b is None:
                     b = budget_map.get((cid, bid), (0.0,))[0] or 0.0
+                month_actuals.append(a)
+                month_budgets.append(b)
                 d = a - b
                 cell = make_item(format_diff_value(d), False)
                 cell.setFont(diff_font)
@@ -2679,7 +4515,19 @@ class BudgetApp(QWidget):
             tot_cell.setFont(diff_font)
             tot_cell.setBackground(diff_background(total_diff_adjusted))
             diff_row.append(tot_cell)
+            if has_forecast:
+                diff_row.append(make_item("", False))
+                self._fill_forecast_cells(act_row[-1], diff_row[-1], cid, display_total)
             cat_item.appendRow(diff_row)
+            if cid in self.rollover_categories:
+                cat_item.appendRow(self._rollover_row(month_actuals, month_budgets))
+
+            projected_row = self._projected_row(cid)
+            if projected_row:
+                cat_item.appendRow(projected_row)
+
+            for row in self._comparison_rows(cid):
+                cat_item.appendRow(row)
 
             for ch in sorted(self.children_map.get(cid, []), key=lambda x: self.id2name.get(x, "")):
                 add_category(ch, depth + 1, root_cid, root_name)
@@ -2689,6 +4537,8 @@ class BudgetApp(QWidget):
                     "actual": total_act,
                     "budget": display_total,
                 }
+                if has_forecast:
+                    self.category_totals[cid]["forecast"] = self.forecast_map.get(cid, (0.0,))[0]
 
         for r in self.root_ids:
             add_category(r)
@@ -2705,6 +4555,8 @@ class BudgetApp(QWidget):
         self.update_summary_chart()
         self._highlight_current_month_column()
         self._apply_attention_filter()
+        self._update_period_view()
+        self._update_balance_chart()
 
     def update_summary_chart(self):
         totals = {
@@ -2748,6 +4600,12 @@ class BudgetApp(QWidget):
             ("Uscite", abs(budget_expense), "#fb7185"),
             ("Differenza", budget_income + budget_expense, "#0f766e"),
         ]
+        forecasts = [data["forecast"] for data in self.category_totals.values() if "forecast" in data]
+        if forecasts:
+            # Year-end net to set against the budget's "Differenza"
+            actual_bars.append(("Previsione", sum(forecasts), "#7c3aed"))
+            # Empty slot keeps the rows of the Budget panel aligned with the Reale labels
+            budget_bars.append(("Previsione", 0.0, "#7c3aed"))
 
         magnitude_values = [abs(v) for _, v, _ in actual_bars + diff_bars + budget_bars]
         max_limit = max(magnitude_values or [1.0]) or 1.0
@@ -2963,7 +4821,7 @@ class BudgetApp(QWidget):
 
             year_bid = header_ids[0]
             # Discover row indices
-            budget_row_idx = diff_row_idx = actual_row_idx = None
+            budget_row_idx = diff_row_idx = actual_row_idx = rollover_row_idx = None
             for rr in range(target.rowCount()):
                 first = target.child(rr, 0)
                 label = first.text() if first else ""
@@ -2973,6 +4831,8 @@ class BudgetApp(QWidget):
                     diff_row_idx = rr
                 elif label == "Reale":
                     actual_row_idx = rr
+                elif label == "Disponibile":
+                    rollover_row_idx = rr
             if budget_row_idx is None or diff_row_idx is None:
                 return
 
@@ -3013,7 +4873,7 @@ class BudgetApp(QWidget):
 
             # Re-render Budget row cells
             monthly_value_for_diff, display_total, over_limit, explicit_bids = compute_budget_distribution(
-                year_amt, year_per, month_bids, overrides
+                year_amt, year_per, month_bids, overrides, self._month_weights(cid)
             )
 
             for idx, bid in enumerate(month_bids, start=3):
@@ -3057,11 +4917,14 @@ class BudgetApp(QWidget):
                 period_cell.setText("")
                 period_cell.setBackground(QBrush())
             # monthly diffs
+            month_actuals, month_budgets = [], []
             for idx, bid in enumerate(month_bids, start=3):
                 a = actual_map.get((cid, bid), 0.0)
                 b = monthly_value_for_diff.get(bid)
                 if b is None:
                     b = base_budget_map.get((cid, bid), (0.0,))[0] or 0.0
+                month_actuals.append(a)
+                month_budgets.append(b)
                 d = a - b
                 cell = target.child(diff_row_idx, idx)
                 if cell:
@@ -3081,6 +4944,20 @@ class BudgetApp(QWidget):
                # f.setItalic(True)
                 tot_diff_cell.setFont(f)
                 tot_diff_cell.setBackground(diff_background(total_diff_adjusted))
+            if rollover_row_idx is not None:
+                self._set_rollover_values(
+                    [target.child(rollover_row_idx, col) for col in range(3, tot_col + 1)],
+                    month_actuals,
+                    month_budgets,
+                )
+            has_forecast = "Forecast" in self.current_headers
+            if has_forecast:
+                self._fill_forecast_cells(
+                    target.child(actual_row_idx, tot_col + 1) if actual_row_idx is not None else None,
+                    target.child(diff_row_idx, tot_col + 1),
+                    cid,
+                    display_total,
+                )
             if depth == 0 and diff_row_idx is not None:
                 for idx in range(target.columnCount()):
                     cell = target.child(diff_row_idx, idx)
@@ -3091,7 +4968,9 @@ class BudgetApp(QWidget):
                 for bid in month_bids:
                     total_act += actual_map.get((cid, bid), 0.0)
                 self.category_totals[cid] = {"actual": total_act, "budget": display_total}
-                self.update_summary_chart()
+                if has_forecast:
+                    self.category_totals[cid]["forecast"] = self.forecast_map.get(cid, (0.0,))[0]
+                self._chart_timer.start()
             self._update_summary_header()
             if self._attention_filter_enabled:
                 self._refresh_attention_base_for_category(target)
@@ -3100,6 +4979,8 @@ class BudgetApp(QWidget):
             self._recalc_guard = False
 
     def apply_actual_to_budget(self, index):
+        if self._is_read_only_view():
+            return
         meta = index.data(Qt.ItemDataRole.UserRole)
         if not meta or not isinstance(meta, tuple) or meta[0] != "budget":
             return
@@ -3145,6 +5026,8 @@ class BudgetApp(QWidget):
         # ignore changes that come from programmatic recalculation
         if getattr(self, "_recalc_guard", False):
             return
+        if self._is_read_only_view():
+            return
         meta = item.data(Qt.ItemDataRole.UserRole)
         if not meta:
             return
@@ -3224,6 +5107,84 @@ class BudgetApp(QWidget):
             self._set_unsaved_changes(True)
             self.recalc_category(int(cid))
 
+    def _open_budget_suggestions(self):
+        year = self.year_cb.currentText()
+        if self._is_read_only_view() or not year.isdigit() or not getattr(self, "header_ids", None):
+            return
+        dialog = SuggestBudgetsDialog(self, year)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        options = dialog.options()
+        only_empty = options.pop("only_empty")
+        categids, monthly = suggest_monthly_budgets(
+            year, self._get_account_filter_ids(), self.transaction_store, **options
+        )
+        staged = self._stage_budget_suggestions(categids, monthly, options["seasonal"], only_empty)
+        QMessageBox.information(
+            self,
+            "Suggerimenti budget",
+            f"Budget proposti per {staged} categorie: controlla i valori evidenziati e salva con 'Save Budgets'.",
+        )
+
+    def _stage_budget_suggestions(self, categids, monthly, seasonal: bool, only_empty: bool) -> int:
+        """Write suggested budgets into the grid and ``self.edits``; nothing is saved yet."""
+        year_bid = self.header_ids[0]
+        month_columns = [
+            (col, bid, month)
+            for col, (bid, month) in enumerate(zip(self.header_ids[1:], self.header_month_numbers), start=3)
+            if month
+        ]
+        edit_bg = QColor("#FFF3B0")
+        staged = 0
+        for cid, values in zip(categids.tolist(), monthly):
+            cat_item = self.category_label_items.get(cid)
+            if cat_item is None or self.children_map.get(cid):
+                continue
+            has_budget = any((cid, bid) in self.base_budget_map or (bid, cid) in self.edits for bid in self.header_ids)
+            if only_empty and has_budget:
+                continue
+            budget_row_idx = None
+            for rr in range(cat_item.rowCount()):
+                label_item = cat_item.child(rr, 0)
+                if label_item and label_item.text() == "Budget":
+                    budget_row_idx = rr
+                    break
+            if budget_row_idx is None:
+                continue
+            if seasonal:
+                year_amount, period = float(values.sum()), "Yearly"
+                month_amounts = {col: (bid, float(values[month - 1])) for col, bid, month in month_columns}
+            else:
+                # Drop explicit months so the monthly amount spreads evenly
+                year_amount, period = float(values[0]), "Monthly"
+                month_amounts = {
+                    col: (bid, None)
+                    for col, bid, _ in month_columns
+                    if (cid, bid) in self.base_budget_map or (bid, cid) in self.edits
+                }
+            self.edits[(year_bid, cid)] = {"amount": year_amount, "period": period}
+            for bid, amount in month_amounts.values():
+                self.edits[(bid, cid)] = {"amount": amount, "period": "Monthly"}
+            previous_guard = self._recalc_guard
+            self._recalc_guard = True
+            try:
+                cells = {1: f"{year_amount:,.2f}", 2: period}
+                cells.update(
+                    {col: "" if amount is None else format_diff_value(amount) for col, (_, amount) in month_amounts.items()}
+                )
+                for col, text in cells.items():
+                    cell = cat_item.child(budget_row_idx, col)
+                    if cell:
+                        cell.setText(text)
+                        cell.setBackground(edit_bg)
+            finally:
+                self._recalc_guard = previous_guard
+            self.recalc_category(cid)
+            staged += 1
+        if staged:
+            self._set_unsaved_changes(True)
+        return staged
+
     def save_budgets(self):
         if not self.edits:
             QMessageBox.information(self, "No changes", "No budget changes to save.")
@@ -3238,6 +5199,8 @@ class BudgetApp(QWidget):
             != QMessageBox.StandardButton.Yes
         ):
             return
+        # Budgets are about to change: stop serving the launch-time cached rows
+        self._warm_cache = None
         try:
             for (bid, cid), data in self.edits.items():
                 amount = data.get("amount")
@@ -3256,7 +5219,7 @@ class BudgetApp(QWidget):
             return
         if logical_index < 0 or logical_index >= len(self.current_headers):
             return
-        if logical_index < 3 or logical_index >= len(self.current_headers) - 1:
+        if logical_index < 3 or logical_index >= self._total_column():
             return
         header_name = self.current_headers[logical_index]
         if header_name in ("Period", "TOTAL"):
@@ -3273,6 +5236,12 @@ class BudgetApp(QWidget):
         item = self.model.itemFromIndex(first)
         if not item:
             return
+        parent_item = item.parent()
+        if parent_item is not None and item.text() in ("Reale", "Diff", "Disponibile"):
+            parent_meta = parent_item.data(Qt.ItemDataRole.UserRole)
+            if parent_meta and parent_meta[0] == "category_label":
+                self._open_transactions(parent_meta[1], index.column())
+            return
         meta = item.data(Qt.ItemDataRole.UserRole)
         if not meta or meta[0] != "category_label":
             return
@@ -3365,6 +5334,8 @@ class BudgetApp(QWidget):
             elif clicked != discard_button:
                 event.ignore()
                 return
+        self._save_warm_cache()
+        config.flush()
         super().closeEvent(event)
 
     def select_db(self):
@@ -3380,8 +5351,11 @@ class BudgetApp(QWidget):
             config.DB_PATH = previous_path
             self._set_db_path_label(previous_path)
             return
+        if self._consolidated is not None:
+            self._reset_consolidated_state()
         config.save_last_db(new_path)
         self._set_db_path_label(new_path)
+        self.db_watcher.watch(new_path)
         self._populate_account_selector()
         selected = self._populate_year_combobox()
         if selected:
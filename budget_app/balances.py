@@ -0,0 +1,261 @@
+"""Daily running balances per account (ACCOUNTLIST_V1, CHECKINGACCOUNT_V1).
+
+Every non-void transaction becomes one movement per account it touches: the
+signed TRANSAMOUNT on ACCOUNTID and, for transfers, +TOTRANSAMOUNT on
+TOACCOUNTID. A balance on a day is INITIALBAL plus every movement up to that
+day, so a timeline is one ``np.bincount`` per (account, day) and a cumsum
+along the days. Scheduled BILLSDEPOSITS_V1 items can extend it forward from
+a given day, expanded with ``schedule.expand_occurrences``.
+
+Balances stay in account currency; the total of a timeline is converted to
+the base currency day by day. ``BalanceLedger.refresh`` re-reads only the
+transactions whose LASTUPDATEDTIME changed, like ``TransactionStore``, and
+timelines are cached until the ledger or the schedules change.
+"""
+
+import itertools
+import threading
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from .currency import RateTable, rate_table
+from .db import get_conn
+from .schedule import SCHEDULE_DTYPE, expand_occurrences, recurrence, schedules_fingerprint
+
+MOVEMENT_DTYPE = np.dtype(
+    [
+        ("transid", np.int64),
+        ("account", np.int64),  # MMEX 1.8+ ids are timestamps
+        ("date", np.int32),  # day ordinal
+        ("amount", np.int64),  # signed cents, account currency
+    ]
+)
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_CACHE_SIZE = 16
+
+_GENERATIONS = itertools.count(1)
+
+_TRANSACTIONS_SQL = """
+SELECT TRANSID AS transid, ACCOUNTID AS account, TOACCOUNTID AS toaccount, TRANSCODE AS transcode,
+       TRANSAMOUNT AS amount, TOTRANSAMOUNT AS toamount, TRANSDATE AS transdate
+FROM checkingaccount_v1
+WHERE IFNULL(STATUS, '') <> 'V' AND IFNULL(DELETEDTIME, '') = ''{where}
+"""
+
+_ACCOUNTS_SQL = """
+SELECT ACCOUNTID, ACCOUNTNAME, INITIALBAL, INITIALDATE, IFNULL(STATUS, '') FROM accountlist_v1
+"""
+
+_SCHEDULES_SQL = """
+SELECT BDID AS bdid, ACCOUNTID AS account, TOACCOUNTID AS toaccount, TRANSCODE AS transcode,
+       TRANSAMOUNT AS amount, TOTRANSAMOUNT AS toamount,
+       COALESCE(NEXTOCCURRENCEDATE, TRANSDATE) AS transdate, REPEATS AS repeats, NUMOCCURRENCES AS numoccurrences
+FROM billsdeposits_v1
+WHERE IFNULL(STATUS, '') <> 'V'
+"""
+
+
+def _ordinals(values) -> np.ndarray:
+    parsed = pd.to_datetime(pd.Series(values).astype(str).str.slice(0, 10), format="%Y-%m-%d", errors="coerce")
+    days = parsed.to_numpy().astype("datetime64[D]").astype(np.int64) + _EPOCH_ORDINAL
+    return np.where(parsed.notna().to_numpy(), days, -1)
+
+
+def _cents(values) -> np.ndarray:
+    return np.rint(pd.to_numeric(pd.Series(values), errors="coerce").fillna(0.0).to_numpy() * 100).astype(np.int64)
+
+
+def _movements(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(row, account, signed cents, valid date) of every movement of the rows of ``df``."""
+    dates = _ordinals(df["transdate"])
+    account = pd.to_numeric(df["account"], errors="coerce").fillna(-1).to_numpy(dtype=np.int64)
+    toaccount = pd.to_numeric(df["toaccount"], errors="coerce").fillna(-1).to_numpy(dtype=np.int64)
+    transcode = df["transcode"].astype(str).to_numpy()
+    amount = _cents(df["amount"])
+    toamount = _cents(df["toamount"])
+    transfer = (transcode == "Transfer") & (toaccount >= 0)
+    # Older MMEX files leave TOTRANSAMOUNT empty for same-currency transfers
+    toamount = np.where(toamount == 0, amount, toamount)
+    rows = np.arange(len(df))
+    out_rows = np.concatenate([rows, rows[transfer]])
+    out_account = np.concatenate([account, toaccount[transfer]])
+    out_amount = np.concatenate([np.where(transcode == "Deposit", amount, -amount), toamount[transfer]])
+    out_dates = dates[out_rows]
+    return out_rows, out_account, out_amount, out_dates
+
+
+def _load_movements(conn, transids: list[int] | None = None) -> np.ndarray:
+    where, params = "", []
+    if transids is not None:
+        where = f" AND TRANSID IN ({','.join('?' * len(transids))})"
+        params = list(transids)
+    df = pd.read_sql_query(_TRANSACTIONS_SQL.format(where=where), conn, params=params)
+    rows, account, amount, dates = _movements(df)
+    keep = dates >= 0
+    out = np.zeros(int(keep.sum()), dtype=MOVEMENT_DTYPE)
+    out["transid"] = df["transid"].to_numpy(dtype=np.int64)[rows[keep]]
+    out["account"] = account[keep]
+    out["date"] = dates[keep]
+    out["amount"] = amount[keep]
+    return out
+
+
+def _load_scheduled(conn) -> np.ndarray:
+    """BILLSDEPOSITS_V1 as SCHEDULE_DTYPE rows, one per account a schedule moves money on."""
+    df = pd.read_sql_query(_SCHEDULES_SQL, conn)
+    rows, account, amount, dates = _movements(df)
+    kind, remaining, interval = recurrence(df["repeats"], df["numoccurrences"])
+    keep = dates >= 0
+    out = np.zeros(int(keep.sum()), dtype=SCHEDULE_DTYPE)
+    out["bdid"] = df["bdid"].to_numpy(dtype=np.int64)[rows[keep]]
+    out["account"] = account[keep]
+    out["categ"] = -1
+    out["amount"] = amount[keep]
+    out["date"] = dates[keep]
+    out["kind"] = kind[rows[keep]]
+    out["remaining"] = remaining[rows[keep]]
+    out["interval"] = interval[rows[keep]]
+    return out
+
+
+def _load_versions(conn) -> dict[int, str]:
+    cur = conn.execute("SELECT TRANSID, COALESCE(LASTUPDATEDTIME, '') || IFNULL(DELETEDTIME, '') FROM checkingaccount_v1")
+    return {int(tid): str(ts) for tid, ts in cur.fetchall()}
+
+
+@dataclass
+class BalanceTimeline:
+    start: int  # day ordinal of the first column
+    account_ids: list[int]
+    names: list[str]
+    balances: np.ndarray  # account x day, account currency
+    total: np.ndarray  # day, base currency
+    projected_from: int | None  # first column that includes scheduled items
+
+    @property
+    def days(self) -> np.ndarray:
+        return self.start + np.arange(self.balances.shape[1])
+
+
+class BalanceLedger:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._data = np.zeros(0, dtype=MOVEMENT_DTYPE)
+        self._versions: dict[int, str] = {}
+        self._accounts: dict[int, tuple[str, int, int, str]] = {}
+        self.rates: RateTable | None = None
+        self.generation = next(_GENERATIONS)
+        self._timelines: dict[tuple, BalanceTimeline] = {}
+        self._scheduled: tuple[str, np.ndarray] | None = None
+
+    @classmethod
+    def load(cls) -> "BalanceLedger":
+        ledger = cls()
+        ledger.refresh()
+        return ledger
+
+    @staticmethod
+    def _read_accounts(conn) -> dict[int, tuple[str, int, int, str]]:
+        """ACCOUNTID -> (name, initial balance in cents, initial date ordinal, status)."""
+        rows = conn.execute(_ACCOUNTS_SQL).fetchall()
+        initial_dates = _ordinals([row[3] for row in rows]) if rows else []
+        return {
+            int(aid): (str(name or f"(id:{aid})").strip(), int(_cents([initial])[0]), int(day), str(status))
+            for (aid, name, initial, _, status), day in zip(rows, initial_dates)
+        }
+
+    def refresh(self) -> bool:
+        """Re-read the changed transactions and the accounts; True when anything changed."""
+        # Held throughout: GUI refreshes can overlap in background threads
+        with self._lock, get_conn() as conn:
+            versions = _load_versions(conn)
+            accounts = self._read_accounts(conn)
+            rates = rate_table(conn)
+            changed = [tid for tid, ts in versions.items() if self._versions.get(tid) != ts]
+            deleted = [tid for tid in self._versions if tid not in versions]
+            if not changed and not deleted and accounts == self._accounts and rates is self.rates:
+                return False
+            if not self._versions:
+                self._data = _load_movements(conn)
+            elif changed or deleted:
+                stale = np.isin(self._data["transid"], np.asarray(changed + deleted, dtype=np.int64))
+                fresh = [_load_movements(conn, changed[start : start + 500]) for start in range(0, len(changed), 500)]
+                self._data = np.concatenate([self._data[~stale], *fresh])
+            self._versions = versions
+            self._accounts = accounts
+            self.rates = rates
+            self.generation = next(_GENERATIONS)
+            self._timelines.clear()
+        return True
+
+    def accounts(self, include_closed: bool = False) -> list[int]:
+        return sorted(aid for aid, info in self._accounts.items() if include_closed or info[3] != "Closed")
+
+    def _scheduled_items(self) -> np.ndarray:
+        fingerprint = schedules_fingerprint()
+        if self._scheduled is None or self._scheduled[0] != fingerprint:
+            with get_conn() as conn:
+                self._scheduled = (fingerprint, _load_scheduled(conn))
+        return self._scheduled[1]
+
+    def timeline(self, start: date, end: date, account_ids=None, project_from: date | None = None) -> BalanceTimeline:
+        """Balances of every day in [start, end]; scheduled items are added from ``project_from`` on."""
+        accounts = sorted(int(a) for a in account_ids) if account_ids else self.accounts()
+        first, last = start.toordinal(), end.toordinal()
+        project = project_from.toordinal() if project_from is not None and project_from <= end else None
+        schedules_key = schedules_fingerprint() if project is not None else ""
+        key = (first, last, tuple(accounts), project, schedules_key)
+        with self._lock:
+            cached = self._timelines.get(key)
+            if cached is not None:
+                return cached
+            data, info, rates = self._data, dict(self._accounts), self.rates
+        days = last - first + 1
+        acc_ids = np.asarray(accounts, dtype=np.int64)
+        # INITIALBAL counts from INITIALDATE on (from the start when the date is missing)
+        initial = np.zeros(len(accounts), dtype=MOVEMENT_DTYPE)
+        initial["transid"] = -1
+        initial["account"] = acc_ids
+        initial["amount"] = [info.get(aid, ("", 0, -1, ""))[1] for aid in accounts]
+        initial["date"] = [info.get(aid, ("", 0, -1, ""))[2] for aid in accounts]
+        movements = np.concatenate([initial, data[np.isin(data["account"], acc_ids)]])
+        acc_idx = np.searchsorted(acc_ids, movements["account"])
+        before = movements["date"] < first
+        opening = np.bincount(acc_idx[before], weights=movements["amount"][before], minlength=len(accounts))
+        in_window = (movements["date"] >= first) & (movements["date"] <= last)
+        day_idx = movements["date"][in_window].astype(np.int64) - first
+        amounts = movements["amount"][in_window].astype(float)
+        cell = acc_idx[in_window] * days + day_idx
+        projected_from = None
+        if project is not None:
+            scheduled = self._scheduled_items()
+            scheduled = scheduled[np.isin(scheduled["account"], acc_ids)]
+            rows, dates = expand_occurrences(scheduled, max(project, first), last + 1)
+            cell = np.concatenate([cell, np.searchsorted(acc_ids, scheduled["account"][rows]) * days + dates - first])
+            amounts = np.concatenate([amounts, scheduled["amount"][rows].astype(float)])
+            projected_from = max(project, first) - first
+        flows = np.bincount(cell, weights=amounts, minlength=len(accounts) * days).reshape(len(accounts), days)
+        balances = (opening[:, None] + np.cumsum(flows, axis=1)) / 100.0
+        total = balances.sum(axis=0)
+        if rates is not None and rates.converts(accounts):
+            ordinals = np.tile(np.arange(first, last + 1), len(accounts))
+            factor = rates.rates(np.repeat(acc_ids, days), ordinals)
+            if factor is not None:
+                total = (balances * factor.reshape(len(accounts), days)).sum(axis=0)
+        timeline = BalanceTimeline(
+            start=first,
+            account_ids=accounts,
+            names=[info.get(aid, (f"(id:{aid})",))[0] for aid in accounts],
+            balances=balances,
+            total=total,
+            projected_from=projected_from,
+        )
+        with self._lock:
+            if len(self._timelines) >= _CACHE_SIZE:
+                self._timelines.pop(next(iter(self._timelines)))
+            self._timelines[key] = timeline
+        return timeline
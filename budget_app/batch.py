@@ -0,0 +1,93 @@
+"""Batch budget-vs-actual reports over several MMEX databases.
+
+Each (database, year) pair is computed in a ProcessPoolExecutor worker with
+its own SQLite connection; results are merged by category path, since
+CATEGIDs differ between files.
+"""
+
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from .db import pinned_connection
+from .report import iter_report_rows
+
+CONSOLIDATED_FIELDS = ["year", "category", "month", "actual", "budget", "diff", "sources"]
+PER_SOURCE_FIELDS = ["source", "year", "category_id", "category", "month", "actual", "budget", "diff"]
+
+
+@dataclass
+class BatchResult:
+    db_path: str
+    year: str
+    rows: list[dict[str, Any]] = field(default_factory=list)
+    seconds: float = 0.0
+    error: str | None = None
+
+
+def _report_job(db_path: str, year: str, account_ids: list[int] | None) -> BatchResult:
+    start = time.perf_counter()
+    try:
+        with pinned_connection(Path(db_path)):
+            rows = list(iter_report_rows(year, account_ids))
+    except (sqlite3.Error, OSError, RuntimeError) as exc:
+        return BatchResult(db_path, year, seconds=time.perf_counter() - start, error=str(exc))
+    return BatchResult(db_path, year, rows, time.perf_counter() - start)
+
+
+def run_batch(
+    db_paths: list[Path],
+    years: list[str],
+    account_ids: list[int] | None = None,
+    max_workers: int | None = None,
+) -> list[BatchResult]:
+    """Compute every (database, year) report in parallel; results keep input order."""
+    jobs = [(str(Path(p).expanduser()), str(y)) for p in db_paths for y in years]
+    if not jobs:
+        return []
+    workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_report_job, db, year, account_ids) for db, year in jobs]
+        return [f.result() for f in futures]
+
+
+def consolidate(results: list[BatchResult]) -> list[dict[str, Any]]:
+    """Sum successful results per (year, category path, month)."""
+    merged: dict[tuple[str, str, str], dict[str, Any]] = {}
+    for result in results:
+        if result.error:
+            continue
+        for row in result.rows:
+            key = (row["year"], row["category"], row["month"])
+            bucket = merged.get(key)
+            if bucket is None:
+                bucket = {
+                    "year": key[0],
+                    "category": key[1],
+                    "month": key[2],
+                    "actual": 0.0,
+                    "budget": 0.0,
+                    "diff": 0.0,
+                    "sources": 0,
+                }
+                merged[key] = bucket
+            bucket["actual"] += row["actual"]
+            bucket["budget"] += row["budget"]
+            bucket["diff"] += row["diff"]
+            bucket["sources"] += 1
+    consolidated = [merged[key] for key in sorted(merged)]
+    for row in consolidated:
+        for name in ("actual", "budget", "diff"):
+            row[name] = round(row[name], 2)
+    return consolidated
+
+
+def per_source_rows(results: list[BatchResult]) -> Iterator[dict[str, Any]]:
+    for result in results:
+        source = Path(result.db_path).name
+        for row in result.rows:
+            yield {"source": source, **row}
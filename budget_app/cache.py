@@ -0,0 +1,269 @@
+"""Warm-start cache of what the grid needs at launch.
+
+Written on exit into ``budget_cache/`` next to budget.ini: a small JSON
+header per database (path, size, mtime, ``PRAGMA schema_version``, lookup
+tables, currency rates) plus ``.npy`` arrays for transactions and budget
+rows that are memory-mapped on the next launch. A size/mtime mismatch discards the cache
+before any SQL runs; ``check_fresh`` re-validates it against the DB off the
+GUI thread.
+"""
+
+import hashlib
+import json
+import os
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import config
+from .currency import RateTable, rate_table
+from .db import get_conn
+from .repository import (
+    label_year_budgets,
+    load_accounts,
+    load_all_budgets,
+    load_budgetyear_map,
+    load_categories,
+)
+from .store import TRANSACTION_DTYPE, TransactionStore
+
+CACHE_VERSION = 3
+
+BUDGET_DTYPE = np.dtype(
+    [
+        ("entryid", np.int64),
+        ("bid", np.int64),
+        ("categ", np.int64),
+        ("period", "U16"),
+        ("amount", np.float64),
+    ]
+)
+VERSION_DTYPE = np.dtype([("transid", np.int64), ("updated", "U32")])
+
+_ARRAY_DTYPES = {
+    "transactions": TRANSACTION_DTYPE,
+    "versions": VERSION_DTYPE,
+    "budgets": BUDGET_DTYPE,
+}
+
+
+def cache_dir() -> Path:
+    return config.CONFIG_FILE.parent / "budget_cache"
+
+
+def _cache_key(db_path: Path) -> str:
+    return hashlib.sha1(str(Path(db_path).resolve()).encode("utf-8")).hexdigest()[:16]
+
+
+def cache_file(db_path: Path, suffix: str) -> Path:
+    """Per-database file in the cache directory (e.g. ``.search.sqlite``)."""
+    return cache_dir() / f"{_cache_key(db_path)}{suffix}"
+
+
+def _db_stat(db_path: Path) -> tuple[int, int]:
+    stat = Path(db_path).stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _schema_version() -> int:
+    with get_conn() as conn:
+        return int(conn.execute("PRAGMA schema_version").fetchone()[0])
+
+
+def _read_lookups() -> dict:
+    """Budget years, category tree and accounts in JSON-friendly form."""
+    years, per_year_entries, name_to_id = load_budgetyear_map()
+    id2name, children_map, root_ids = load_categories()
+    try:
+        accounts = load_accounts()
+    except Exception:
+        accounts = []
+    with get_conn() as conn:
+        rates = rate_table(conn)
+    return {
+        "years": [str(y) for y in years],
+        "per_year_entries": {
+            str(y): [[int(bid), str(name)] for bid, name in entries] for y, entries in per_year_entries.items()
+        },
+        "name_to_id": {str(name): int(bid) for name, bid in name_to_id.items()},
+        "id2name": {str(int(cid)): str(name) for cid, name in id2name.items()},
+        "children_map": {str(int(cid)): [int(ch) for ch in children] for cid, children in children_map.items()},
+        "root_ids": [int(cid) for cid in root_ids],
+        "accounts": [[int(aid), str(name)] for aid, name in accounts],
+        "currency": rates.to_state(),
+    }
+
+
+def _budget_array(df: pd.DataFrame) -> np.ndarray:
+    out = np.zeros(len(df), dtype=BUDGET_DTYPE)
+    if len(df):
+        out["entryid"] = df["BUDGETENTRYID"].to_numpy(dtype=np.int64)
+        out["bid"] = df["BUDGETYEARID"].to_numpy(dtype=np.int64)
+        out["categ"] = df["CATEGID"].to_numpy(dtype=np.int64)
+        out["period"] = df["PERIOD"].fillna("").astype(str).to_numpy()
+        out["amount"] = pd.to_numeric(df["AMOUNT"], errors="coerce").to_numpy(dtype=np.float64)
+    return out
+
+
+def _same_budgets(a: np.ndarray, b: np.ndarray) -> bool:
+    if a.shape != b.shape:
+        return False
+    return all(np.array_equal(a[f], b[f]) for f in ("entryid", "bid", "categ", "period")) and np.array_equal(
+        a["amount"], b["amount"], equal_nan=True
+    )
+
+
+@dataclass
+class WarmCache:
+    db_path: Path
+    schema_version: int
+    lookups: dict
+    transactions: np.ndarray
+    versions: np.ndarray
+    budgets: np.ndarray
+    split_fingerprint: tuple | None
+
+    def budgetyear_map(self):
+        per_year_entries = {
+            y: [(bid, name) for bid, name in entries] for y, entries in self.lookups["per_year_entries"].items()
+        }
+        return list(self.lookups["years"]), per_year_entries, dict(self.lookups["name_to_id"])
+
+    def categories(self):
+        id2name = {int(cid): name for cid, name in self.lookups["id2name"].items()}
+        children_map = defaultdict(list)
+        for cid, children in self.lookups["children_map"].items():
+            children_map[int(cid)] = list(children)
+        return id2name, children_map, list(self.lookups["root_ids"])
+
+    def accounts(self) -> list[tuple[int, str]]:
+        return [(aid, name) for aid, name in self.lookups["accounts"]]
+
+    def transaction_store(self) -> TransactionStore:
+        versions = dict(zip(self.versions["transid"].tolist(), self.versions["updated"].tolist()))
+        rates = RateTable.from_state(self.lookups["currency"])
+        return TransactionStore.from_state(self.transactions, versions, self.split_fingerprint, rates)
+
+    def budgets_for_year(self, year, per_year_entries) -> pd.DataFrame:
+        """Same frame as ``load_budgets_for_year`` built from the cached rows."""
+        df = pd.DataFrame(
+            {
+                "BUDGETENTRYID": self.budgets["entryid"],
+                "BUDGETYEARID": self.budgets["bid"],
+                "CATEGID": self.budgets["categ"],
+                "PERIOD": self.budgets["period"].astype(object),
+                "AMOUNT": self.budgets["amount"],
+            }
+        )
+        return label_year_budgets(df, year, per_year_entries)
+
+
+def _current_header(db_path: Path) -> dict | None:
+    """Cache header for ``db_path`` if it was written for the file as it is now."""
+    try:
+        header = json.loads((cache_dir() / f"{_cache_key(db_path)}.json").read_text(encoding="utf-8"))
+        if header.get("version") != CACHE_VERSION or header.get("db_path") != str(db_path.resolve()):
+            return None
+        if (header["size"], header["mtime_ns"]) != _db_stat(db_path):
+            return None
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return header
+
+
+def load_warm_cache(db_path) -> WarmCache | None:
+    """Memory-map the cache for ``db_path`` if it still matches the file on disk."""
+    db_path = Path(db_path)
+    header = _current_header(db_path)
+    if header is None:
+        return None
+    base = cache_dir()
+    try:
+        arrays = {}
+        for name, dtype in _ARRAY_DTYPES.items():
+            arr = np.load(base / header["files"][name], mmap_mode="r", allow_pickle=False)
+            if arr.dtype != dtype or arr.ndim != 1:
+                return None
+            arrays[name] = arr
+        fingerprint = header.get("split_fingerprint")
+        return WarmCache(
+            db_path=db_path,
+            schema_version=int(header["schema_version"]),
+            lookups=header["lookups"],
+            split_fingerprint=tuple(fingerprint) if fingerprint is not None else None,
+            **arrays,
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_warm_cache(db_path, store: TransactionStore) -> None:
+    """Write the cache for ``db_path``; lookups and budgets are re-read so they match the file."""
+    db_path = Path(db_path)
+    size, mtime_ns = _db_stat(db_path)
+    schema_version = _schema_version()
+    header = _current_header(db_path)
+    if header is not None and header["schema_version"] == schema_version:
+        return
+    store.refresh()
+    lookups = _read_lookups()
+    budgets = _budget_array(load_all_budgets())
+    data, versions, fingerprint = store.state()
+    version_rows = np.zeros(len(versions), dtype=VERSION_DTYPE)
+    if versions:
+        version_rows["transid"] = list(versions.keys())
+        version_rows["updated"] = list(versions.values())
+
+    base = cache_dir()
+    base.mkdir(parents=True, exist_ok=True)
+    key = _cache_key(db_path)
+    # New file names per DB state: the previous arrays may still be mapped
+    # by this process, and Windows refuses to replace a mapped file.
+    files = {name: f"{key}.{mtime_ns}.{name}.npy" for name in _ARRAY_DTYPES}
+    arrays = {"transactions": np.asarray(data), "versions": version_rows, "budgets": budgets}
+    for name, filename in files.items():
+        tmp = base / f"{filename}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, arrays[name], allow_pickle=False)
+        os.replace(tmp, base / filename)
+
+    header = {
+        "version": CACHE_VERSION,
+        "db_path": str(db_path.resolve()),
+        "size": size,
+        "mtime_ns": mtime_ns,
+        "schema_version": schema_version,
+        "split_fingerprint": list(fingerprint) if fingerprint is not None else None,
+        "files": files,
+        "lookups": lookups,
+    }
+    header_path = base / f"{key}.json"
+    tmp = header_path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(header, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, header_path)
+
+    keep = set(files.values())
+    for stale in base.glob(f"{key}.*.npy"):
+        if stale.name not in keep:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+
+def check_fresh(warm: WarmCache, store: TransactionStore) -> tuple[bool, bool]:
+    """Re-validate a warm start against the DB (run off the GUI thread).
+
+    Returns (lookups_fresh, actuals_changed): lookup tables and budgets are
+    compared with the cached copies, transactions are caught up in ``store``.
+    """
+    lookups_fresh = (
+        _schema_version() == warm.schema_version
+        and _read_lookups() == warm.lookups
+        and _same_budgets(_budget_array(load_all_budgets()), warm.budgets)
+    )
+    actuals_changed = store.refresh()
+    return lookups_fresh, actuals_changed
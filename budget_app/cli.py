@@ -0,0 +1,200 @@
+"""Command line entry point: ``python -m budget_app [report|batch|simulate ...]``.
+
+Without a sub-command the GUI is started. Sub-commands never import PyQt6.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from . import config
+
+
+def parse_account_ids(text: str | None) -> list[int] | None:
+    if not text:
+        return None
+    ids: list[int] = []
+    for token in text.replace(";", ",").split(","):
+        token = token.strip()
+        if not token:
+            continue
+        try:
+            ids.append(int(token))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Invalid account id: {token!r}")
+    return ids or None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="budget_app", description="Budget Manager for MMEX databases.")
+    sub = parser.add_subparsers(dest="command")
+
+    report = sub.add_parser("report", help="Budget vs actual per category and month, streamed as CSV/JSON Lines.")
+    report.add_argument("--db", type=Path, help="MMEX database (.mmb); defaults to db_path in budget.ini")
+    report.add_argument("--year", required=True, help="Budget year, e.g. 2026")
+    report.add_argument("--accounts", type=parse_account_ids, help="Comma separated ACCOUNTIDs (default: all)")
+    report.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    report.add_argument("--output", "-o", type=Path, help="Output file (default: stdout)")
+
+    batch = sub.add_parser("batch", help="Consolidated report over several databases, computed in parallel.")
+    batch.add_argument("--db", type=Path, action="append", required=True, help="MMEX database; repeat for each file")
+    batch.add_argument("--year", action="append", required=True, help="Budget year; repeat for several years")
+    batch.add_argument("--accounts", type=parse_account_ids, help="ACCOUNTIDs applied to every database")
+    batch.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    batch.add_argument("--output", "-o", type=Path, help="Output file (default: stdout)")
+    batch.add_argument("--per-source", action="store_true", help="Emit rows per database instead of merged totals")
+    batch.add_argument("--workers", type=int, help="Worker processes (default: one per core)")
+
+    simulate = sub.add_parser("simulate", help="Monte Carlo P10/P50/P90 year-end totals per category.")
+    simulate.add_argument("--db", type=Path, help="MMEX database (.mmb); defaults to db_path in budget.ini")
+    simulate.add_argument("--year", required=True, help="Budget year, e.g. 2026")
+    simulate.add_argument("--accounts", type=parse_account_ids, help="Comma separated ACCOUNTIDs (default: all)")
+    simulate.add_argument("--trials", type=int, help="Number of trials (default: 20000)")
+    simulate.add_argument("--seed", type=int, help="Random seed; the same seed gives the same result")
+    simulate.add_argument("--workers", type=int, help="Worker processes (default: one per core for large runs)")
+    simulate.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    simulate.add_argument("--output", "-o", type=Path, help="Output file (default: stdout)")
+    simulate.add_argument(
+        "--bench", action="store_true", help="Emit trials per second for 1, 2, 4 ... workers instead of percentiles"
+    )
+    return parser
+
+
+def _use_db(db: Path | None) -> None:
+    if db is not None:
+        config.DB_PATH = db.expanduser()
+
+
+def _open_output(path: Path | None):
+    if path is None:
+        return sys.stdout
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _run_report(args) -> int:
+    from .report import iter_report_rows, write_rows
+
+    _use_db(args.db)
+    out = _open_output(args.output)
+    try:
+        rows = iter_report_rows(args.year, args.accounts, seasonal_categories=config.load_seasonal_categories())
+        write_rows(rows, args.format, out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def _run_batch(args) -> int:
+    from .batch import CONSOLIDATED_FIELDS, PER_SOURCE_FIELDS, consolidate, per_source_rows, run_batch
+    from .report import write_rows
+
+    started = time.perf_counter()
+    results = run_batch(args.db, args.year, args.accounts, args.workers)
+    failed = 0
+    for result in results:
+        if result.error:
+            failed += 1
+            print(f"{result.db_path} [{result.year}]: error: {result.error}", file=sys.stderr)
+        else:
+            print(
+                f"{result.db_path} [{result.year}]: {len(result.rows)} rows in {result.seconds:.3f}s",
+                file=sys.stderr,
+            )
+    out = _open_output(args.output)
+    try:
+        if args.per_source:
+            write_rows(per_source_rows(results), args.format, out, PER_SOURCE_FIELDS)
+        else:
+            write_rows(consolidate(results), args.format, out, CONSOLIDATED_FIELDS)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"total: {len(results)} reports in {time.perf_counter() - started:.3f}s", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def _run_simulate(args) -> int:
+    from datetime import date
+
+    from .forecast import forecast_inputs
+    from .report import category_paths, write_rows
+    from .repository import load_categories
+    from .simulate import DEFAULT_SEED, DEFAULT_TRIALS, run_simulation
+
+    _use_db(args.db)
+    trials = args.trials or DEFAULT_TRIALS
+    seed = DEFAULT_SEED if args.seed is None else args.seed
+    inputs = forecast_inputs(int(args.year), args.accounts, None, date.today())
+    out = _open_output(args.output)
+    try:
+        if args.bench:
+            counts = [1]
+            while counts[-1] * 2 <= (args.workers or os.cpu_count() or 1):
+                counts.append(counts[-1] * 2)
+            rows = []
+            for workers in counts:
+                result = run_simulation(inputs, trials, seed, workers, args.year)
+                print(
+                    f"workers={result.workers}: {result.trials} trials in {result.seconds:.3f}s "
+                    f"({result.trials_per_second:,.0f} trials/s)",
+                    file=sys.stderr,
+                )
+                rows.append(
+                    {
+                        "workers": result.workers,
+                        "trials": result.trials,
+                        "seconds": round(result.seconds, 4),
+                        "trials_per_second": round(result.trials_per_second, 1),
+                    }
+                )
+            write_rows(rows, args.format, out, ["workers", "trials", "seconds", "trials_per_second"])
+            return 0
+
+        result = run_simulation(inputs, trials, seed, args.workers, args.year)
+        id2name, children_map, root_ids = load_categories()
+        names = {cid: path for cid, path in category_paths(id2name, children_map, root_ids)}
+        rows = [
+            {
+                "year": args.year,
+                "category_id": int(cid),
+                "category": names.get(int(cid), id2name.get(int(cid), f"(id:{cid})")),
+                "p10": round(float(p10), 2),
+                "p50": round(float(p50), 2),
+                "p90": round(float(p90), 2),
+            }
+            for cid, (p10, p50, p90) in zip(result.categids, result.percentiles)
+        ]
+        p10, p50, p90 = (round(float(v), 2) for v in result.overall)
+        rows.append({"year": args.year, "category_id": "", "category": "TOTAL", "p10": p10, "p50": p50, "p90": p90})
+        write_rows(rows, args.format, out, ["year", "category_id", "category", "p10", "p50", "p90"])
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(
+        f"{result.trials} trials (seed {result.seed}, {result.workers} workers) in {result.seconds:.3f}s",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        from .app import main as gui_main
+
+        gui_main()
+        return 0
+    handlers = {"report": _run_report, "batch": _run_batch, "simulate": _run_simulate}
+    try:
+        return handlers[args.command](args)
+    except (RuntimeError, FileNotFoundError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # Output piped into e.g. `head`; silence the flush at interpreter exit
+        sys.stdout = open(os.devnull, "w")
+        return 0
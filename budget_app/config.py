@@ -1,6 +1,10 @@
 from pathlib import Path
+import atexit
+import os
 import sys
 import configparser
+import tempfile
+import threading
 from typing import Any
 
 
@@ -16,6 +20,8 @@ def _resolve_config_file() -> Path:
 
 CONFIG_FILE = _resolve_config_file()
 PERIOD_CHOICES = ["Monthly", "Quarterly", "Yearly", "Weekly"]
+# Seconds of quiet before pending settings are written to budget.ini
+FLUSH_DELAY = 0.5
 
 STYLE_DEFAULTS: dict[str, Any] = {
     "category_column_width": 250,
@@ -40,6 +46,7 @@ STYLE_DEFAULTS: dict[str, Any] = {
     "summary_diff_positive_color": "#F8F9FA",
     "summary_diff_negative_bg_color": "#111111",
     "summary_diff_negative_fg_color": "#FFFFFF",
+    "summary_projected_color": "#EDE4FF",
     "detail_font_family": "Courier New",
     "detail_font_size": 14,
 }
@@ -59,108 +66,250 @@ _STYLE_INT_KEYS = {
 _STYLE_FLOAT_KEYS = {"window_scale_ratio"}
 
 
-def _load_cfg() -> configparser.ConfigParser:
-    cfg = configparser.ConfigParser()
-    if CONFIG_FILE.exists():
-        cfg.read(CONFIG_FILE)
-    return cfg
+class ConfigStore:
+    """``budget.ini`` parsed once and kept in memory.
 
+    Setters change the in-memory copy and schedule a debounced flush on a
+    background timer, so bursts of changes (account checkboxes, year
+    switches) cost one write. A flush writes a temporary file and renames
+    it over the ini; if the file changed on disk since it was read, it is
+    re-read first and only the keys changed here are applied on top.
+    """
 
-def _save_cfg(cfg: configparser.ConfigParser) -> None:
-    with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-        cfg.write(f)
+    def __init__(self, path: Path, flush_delay: float = FLUSH_DELAY):
+        self.path = Path(path)
+        self.flush_delay = flush_delay
+        self._lock = threading.RLock()
+        self._timer: threading.Timer | None = None
+        # (section, key) -> value, None for a removed key
+        self._pending: dict[tuple[str, str], str | None] = {}
+        self._cfg, self._signature = self._read()
+
+    def _file_signature(self) -> tuple[int, int] | None:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read(self) -> tuple[configparser.ConfigParser, tuple[int, int] | None]:
+        cfg = configparser.ConfigParser()
+        signature = self._file_signature()
+        if signature is not None:
+            cfg.read(self.path, encoding="utf-8")
+        return cfg, signature
+
+    def get(self, section: str, key: str, fallback: str | None = None) -> str | None:
+        with self._lock:
+            return self._cfg.get(section, key, fallback=fallback)
+
+    def set(self, section: str, key: str, value: str | None) -> None:
+        """Set ``key`` (remove it when ``value`` is None) and schedule a flush."""
+        with self._lock:
+            if self._cfg.get(section, key, fallback=None) == value:
+                return
+            self._apply(self._cfg, section, key, value)
+            self._pending[(section, key)] = value
+            self._schedule()
+
+    @staticmethod
+    def _apply(cfg: configparser.ConfigParser, section: str, key: str, value: str | None) -> None:
+        if value is None:
+            if cfg.has_section(section):
+                cfg.remove_option(section, key)
+            return
+        if not cfg.has_section(section):
+            cfg.add_section(section)
+        cfg.set(section, key, value)
+
+    def _schedule(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.flush_delay, self._flush_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_in_background(self) -> None:
+        try:
+            self.flush()
+        except OSError:
+            # Kept pending: the next change or the exit flush tries again
+            pass
+
+    def flush(self) -> None:
+        """Write the pending changes now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            on_disk = self._file_signature()
+            if on_disk != self._signature:
+                cfg, _ = self._read()
+                for (section, key), value in self._pending.items():
+                    self._apply(cfg, section, key, value)
+                self._cfg = cfg
+            fd, tmp_name = tempfile.mkstemp(prefix=self.path.name, suffix=".tmp", dir=self.path.parent)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    self._cfg.write(f)
+                # mkstemp creates the file private; keep the mode of the one it replaces
+                os.chmod(tmp_name, self.path.stat().st_mode & 0o777 if on_disk is not None else 0o644)
+                os.replace(tmp_name, self.path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+            self._signature = self._file_signature()
+            self._pending.clear()
+
+    # Typed accessors
+    def db_path(self) -> Path | None:
+        db_path = self.get("app", "db_path")
+        if db_path:
+            path = Path(db_path).expanduser()
+            if path.exists():
+                return path
+        return None
+
+    def set_db_path(self, path: Path | None) -> None:
+        self.set("app", "db_path", str(path) if path else None)
+
+    def budget_year(self) -> str | None:
+        return self.get("app", "budget_year")
+
+    def set_budget_year(self, year: str) -> None:
+        self.set("app", "budget_year", str(year))
+
+    def id_list(self, key: str) -> list[int]:
+        raw_value = self.get("app", key, fallback="") or ""
+        tokens = [token.strip() for token in raw_value.replace(";", ",").split(",")]
+        ids: list[int] = []
+        for token in tokens:
+            if not token:
+                continue
+            try:
+                ids.append(int(token))
+            except ValueError:
+                continue
+        return ids
+
+    def set_id_list(self, key: str, ids: list[int] | None) -> None:
+        if not ids:
+            self.set("app", key, None)
+        else:
+            self.set("app", key, ",".join(str(value) for value in sorted({int(value) for value in ids})))
+
+    def flag(self, key: str) -> bool:
+        with self._lock:
+            try:
+                return self._cfg.getboolean("app", key, fallback=False)
+            except ValueError:
+                return False
+
+    def set_flag(self, key: str, enabled: bool) -> None:
+        self.set("app", key, "true" if enabled else None)
+
+    def style_settings(self) -> dict[str, Any]:
+        """STYLE_DEFAULTS overridden by the [style] section; missing or invalid keys are written back."""
+        settings: dict[str, Any] = {}
+        for key, default in STYLE_DEFAULTS.items():
+            raw_value = self.get("style", key)
+            if raw_value is None:
+                self.set("style", key, str(default))
+                raw_value = str(default)
+            try:
+                if key in _STYLE_INT_KEYS:
+                    settings[key] = int(float(raw_value))
+                elif key in _STYLE_FLOAT_KEYS:
+                    settings[key] = float(raw_value)
+                else:
+                    settings[key] = raw_value
+            except (TypeError, ValueError):
+                # Fallback to default on invalid values
+                settings[key] = default
+                self.set("style", key, str(default))
+        return settings
+
+
+_STORE_LOCK = threading.Lock()
+_store: ConfigStore | None = None
+
+
+def config_store() -> ConfigStore:
+    """The store of the current CONFIG_FILE, created on first use."""
+    global _store
+    with _STORE_LOCK:
+        if _store is None or _store.path != Path(CONFIG_FILE):
+            if _store is not None:
+                _store.flush()
+            _store = ConfigStore(CONFIG_FILE)
+        return _store
+
+
+def flush() -> None:
+    """Write any pending configuration change now."""
+    with _STORE_LOCK:
+        store = _store
+    if store is not None:
+        store.flush()
+
+
+atexit.register(flush)
 
 
 def load_last_db() -> Path | None:
-    cfg = _load_cfg()
-    db_path = cfg.get("app", "db_path", fallback=None)
-    if db_path:
-        path = Path(db_path).expanduser()
-        if path.exists():
-            return path
-    return None
+    return config_store().db_path()
 
 
 def save_last_db(path: Path | None) -> None:
-    cfg = _load_cfg()
-    if "app" not in cfg:
-        cfg["app"] = {}
-    if path:
-        cfg["app"]["db_path"] = str(path)
-    else:
-        cfg["app"].pop("db_path", None)
-    _save_cfg(cfg)
+    config_store().set_db_path(path)
 
 
 def load_last_budget_year() -> str | None:
-    cfg = _load_cfg()
-    return cfg.get("app", "budget_year", fallback=None)
+    return config_store().budget_year()
 
 
 def save_last_budget_year(year: str) -> None:
-    cfg = _load_cfg()
-    if "app" not in cfg:
-        cfg["app"] = {}
-    cfg["app"]["budget_year"] = str(year)
-    _save_cfg(cfg)
+    config_store().set_budget_year(year)
 
 
 def load_selected_accounts() -> list[int]:
-    cfg = _load_cfg()
-    raw_value = cfg.get("app", "selected_accounts", fallback="") or ""
-    tokens = [token.strip() for token in raw_value.replace(";", ",").split(",")]
-    ids: list[int] = []
-    for token in tokens:
-        if not token:
-            continue
-        try:
-            ids.append(int(token))
-        except ValueError:
-            continue
-    return ids
+    return config_store().id_list("selected_accounts")
 
 
 def save_selected_accounts(account_ids: list[int] | None) -> None:
-    cfg = _load_cfg()
-    if "app" not in cfg:
-        cfg["app"] = {}
-    if not account_ids:
-        cfg["app"].pop("selected_accounts", None)
-    else:
-        unique_ids = sorted({int(aid) for aid in account_ids})
-        cfg["app"]["selected_accounts"] = ",".join(str(aid) for aid in unique_ids)
-    _save_cfg(cfg)
+    config_store().set_id_list("selected_accounts", account_ids)
+
+
+def load_seasonal_categories() -> list[int]:
+    """CATEGIDs whose yearly budget is spread by their seasonal profile."""
+    return config_store().id_list("seasonal_categories")
+
+
+def save_seasonal_categories(categids: list[int] | None) -> None:
+    config_store().set_id_list("seasonal_categories", categids)
+
+
+def load_rollover_categories() -> list[int]:
+    """CATEGIDs whose unspent or overspent budget carries into the next month."""
+    return config_store().id_list("rollover_categories")
+
+
+def save_rollover_categories(categids: list[int] | None) -> None:
+    config_store().set_id_list("rollover_categories", categids)
+
+
+def load_memory_snapshot() -> bool:
+    return config_store().flag("memory_snapshot")
+
+
+def save_memory_snapshot(enabled: bool) -> None:
+    config_store().set_flag("memory_snapshot", enabled)
 
 
 def load_style_settings() -> dict[str, Any]:
-    cfg = _load_cfg()
-    updated = False
-    if "style" not in cfg:
-        cfg["style"] = {}
-        updated = True
-    section = cfg["style"]
-    settings: dict[str, Any] = {}
-    for key, default in STYLE_DEFAULTS.items():
-        raw_value = section.get(key)
-        if raw_value is None:
-            section[key] = str(default)
-            raw_value = str(default)
-            updated = True
-        try:
-            if key in _STYLE_INT_KEYS:
-                settings[key] = int(float(raw_value))
-            elif key in _STYLE_FLOAT_KEYS:
-                settings[key] = float(raw_value)
-            else:
-                settings[key] = raw_value
-        except (TypeError, ValueError):
-            # Fallback to default on invalid values
-            settings[key] = default
-            section[key] = str(default)
-            updated = True
-    if updated:
-        _save_cfg(cfg)
-    return settings
+    return config_store().style_settings()
 
 
 # Mutable global used by db.get_conn; always reference via config.DB_PATH
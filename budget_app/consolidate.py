@@ -0,0 +1,198 @@
+"""Consolidated budget-vs-actual over several MMEX databases.
+
+Categories are matched by full path ("Main:Sub") because CATEGIDs differ
+between files. Each source is loaded in its own worker thread (with its own
+connection) and cached; the merge is a plain sum over aligned
+source x category x month arrays.
+"""
+
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .db import pinned_connection
+from .report import iter_report_rows
+from .repository import load_budgetyear_map
+
+_CACHE: dict[tuple, "SourceAggregates"] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def year_months(year: str) -> list[str]:
+    return [f"{year}-{m:02d}" for m in range(1, 13)]
+
+
+@dataclass
+class SourceAggregates:
+    db_path: str
+    year: str
+    years: list[str]
+    paths: list[str]
+    actual: np.ndarray  # category x month
+    budget: np.ndarray  # category x month
+
+    @property
+    def name(self) -> str:
+        return Path(self.db_path).name
+
+
+def _cache_key(db_path: Path, year: str) -> tuple:
+    stat = db_path.stat()
+    return (str(db_path.resolve()), stat.st_size, stat.st_mtime_ns, year)
+
+
+def load_source(db_path, year) -> SourceAggregates:
+    """Aggregate one database for ``year``; cached until the file changes."""
+    db_path = Path(db_path)
+    year = str(year)
+    key = _cache_key(db_path, year)
+    with _CACHE_LOCK:
+        cached = _CACHE.get(key)
+    if cached is not None:
+        return cached
+    months = year_months(year)
+    month_index = {m: i for i, m in enumerate(months)}
+    path_index: dict[str, int] = {}
+    cells: list[tuple[int, int, float, float]] = []
+    with pinned_connection(db_path):
+        years, _, _ = load_budgetyear_map()
+        for row in iter_report_rows(year, all_months=True):
+            col = month_index.get(row["month"])
+            if col is None:
+                continue
+            idx = path_index.setdefault(row["category"], len(path_index))
+            cells.append((idx, col, row["actual"], row["budget"]))
+    actual = np.zeros((len(path_index), len(months)))
+    budget = np.zeros((len(path_index), len(months)))
+    if cells:
+        rows, cols, act, bud = (np.asarray(v) for v in zip(*cells))
+        rows = rows.astype(np.intp)
+        cols = cols.astype(np.intp)
+        np.add.at(actual, (rows, cols), act.astype(float))
+        np.add.at(budget, (rows, cols), bud.astype(float))
+    source = SourceAggregates(str(db_path), year, list(years), list(path_index), actual, budget)
+    with _CACHE_LOCK:
+        _CACHE[key] = source
+    return source
+
+
+def load_sources(db_paths, year, max_workers: int | None = None) -> list[SourceAggregates]:
+    """Load every database in parallel worker threads, keeping input order."""
+    db_paths = [Path(p) for p in db_paths]
+    if not db_paths:
+        return []
+    workers = max_workers or len(db_paths)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="budget-source") as pool:
+        return list(pool.map(lambda p: load_source(p, year), db_paths))
+
+
+@dataclass
+class Consolidated:
+    year: str
+    years: list[str]
+    months: list[str]
+    sources: list[str]
+    paths: list[str]
+    per_source_actual: np.ndarray  # source x category x month
+    per_source_budget: np.ndarray
+    actual: np.ndarray  # category x month
+    budget: np.ndarray
+    path_index: dict[str, int] = field(default_factory=dict)
+
+    def layout(self):
+        """Synthetic category tree / budget-year layout keyed by path.
+
+        Returns (id2name, children_map, root_ids, per_year_entries, name_to_id,
+        cid_to_path) shaped like the repository loaders so the grid can render
+        it unchanged.
+        """
+        nodes: set[str] = set()
+        for path in self.paths:
+            parts = path.split(":")
+            for depth in range(1, len(parts) + 1):
+                nodes.add(":".join(parts[:depth]))
+        ordered = sorted(nodes)
+        path_to_cid = {path: idx + 1 for idx, path in enumerate(ordered)}
+        id2name: dict[int, str] = {}
+        children_map: dict[int, list[int]] = defaultdict(list)
+        root_ids: list[int] = []
+        for path, cid in path_to_cid.items():
+            parent_path, _, name = path.rpartition(":")
+            id2name[cid] = name
+            if parent_path:
+                children_map[path_to_cid[parent_path]].append(cid)
+            else:
+                root_ids.append(cid)
+        entries = [(1, self.year)] + [(idx + 2, month) for idx, month in enumerate(self.months)]
+        per_year_entries = {self.year: entries}
+        name_to_id = {name: bid for bid, name in entries}
+        cid_to_path = {cid: path for path, cid in path_to_cid.items()}
+        return id2name, children_map, root_ids, per_year_entries, name_to_id, cid_to_path
+
+    def frames(self, cid_to_path, name_to_id) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Actual/budget frames shaped like fetch_actuals_for_year / load_budgets_for_year."""
+        path_to_cid = {path: cid for cid, path in cid_to_path.items()}
+        cids = np.array([path_to_cid[p] for p in self.paths], dtype=np.int64)
+        cat_idx, month_idx = np.nonzero(self.actual)
+        df_actual = pd.DataFrame(
+            {
+                "month": np.asarray(self.months, dtype=object)[month_idx],
+                "categid": cids[cat_idx],
+                "amount": self.actual[cat_idx, month_idx],
+            }
+        )
+        cat_idx, month_idx = np.nonzero(self.budget)
+        bids = np.array([name_to_id[m] for m in self.months], dtype=np.int64)
+        df_bud = pd.DataFrame(
+            {
+                "BUDGETENTRYID": np.arange(len(cat_idx)),
+                "BUDGETYEARID": bids[month_idx],
+                "CATEGID": cids[cat_idx],
+                "PERIOD": "Monthly",
+                "AMOUNT": self.budget[cat_idx, month_idx],
+            }
+        )
+        return df_actual, df_bud
+
+    def source_breakdown(self, path: str) -> list[tuple[str, float, float]]:
+        """(source name, actual total, budget total) for one category path."""
+        idx = self.path_index.get(path)
+        if idx is None:
+            return [(name, 0.0, 0.0) for name in self.sources]
+        actual = self.per_source_actual[:, idx, :].sum(axis=1)
+        budget = self.per_source_budget[:, idx, :].sum(axis=1)
+        return [(name, float(a), float(b)) for name, a, b in zip(self.sources, actual, budget)]
+
+
+def merge_sources(sources: list[SourceAggregates]) -> Consolidated:
+    year = sources[0].year if sources else ""
+    months = year_months(year)
+    paths = sorted({p for src in sources for p in src.paths})
+    path_index = {p: i for i, p in enumerate(paths)}
+    shape = (len(sources), len(paths), len(months))
+    per_source_actual = np.zeros(shape)
+    per_source_budget = np.zeros(shape)
+    for s_idx, src in enumerate(sources):
+        if not src.paths:
+            continue
+        rows = np.fromiter((path_index[p] for p in src.paths), dtype=np.intp, count=len(src.paths))
+        per_source_actual[s_idx, rows] = src.actual
+        per_source_budget[s_idx, rows] = src.budget
+    years = sorted({y for src in sources for y in src.years} | {year}, reverse=True)
+    return Consolidated(
+        year=year,
+        years=years,
+        months=months,
+        sources=[src.name for src in sources],
+        paths=paths,
+        per_source_actual=per_source_actual,
+        per_source_budget=per_source_budget,
+        actual=per_source_actual.sum(axis=0),
+        budget=per_source_budget.sum(axis=0),
+        path_index=path_index,
+    )
@@ -0,0 +1,175 @@
+"""Conversion of account amounts to the base currency.
+
+MMEX keeps every amount in the currency of its account
+(ACCOUNTLIST_V1.CURRENCYID). Actuals are brought to the base currency
+(INFOTABLE_V1 BASECURRENCYID) with the latest CURRENCYHISTORY_V1 rate on or
+before the transaction date; currencies without history, and dates before
+their first recorded rate, use CURRENCYFORMATS_V1.BASECONVRATE.
+
+Each currency's history is one sorted array of day ordinals, so converting N
+rows is a ``np.searchsorted`` per currency. Rate tables are cached by a
+fingerprint of the currency tables and shared until they change.
+"""
+
+import threading
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_CACHE_SIZE = 8
+
+_FINGERPRINT_SQL = """
+SELECT (SELECT IFNULL(MAX(INFOVALUE), '') FROM infotable_v1 WHERE INFONAME = 'BASECURRENCYID'),
+       (SELECT COUNT(*) || ':' || IFNULL(MAX(CURRHISTID), 0) || ':' || IFNULL(SUM(CURRVALUE * CURRHISTID), 0)
+          || ':' || IFNULL(SUM(CURRENCYID * CAST(replace(substr(CURRDATE, 1, 10), '-', '') AS INTEGER)), 0)
+        FROM currencyhistory_v1),
+       (SELECT group_concat(CURRENCYID || '=' || IFNULL(BASECONVRATE, ''), ',') FROM currencyformats_v1),
+       (SELECT group_concat(ACCOUNTID || '=' || IFNULL(CURRENCYID, ''), ',') FROM accountlist_v1)
+"""
+
+_LOCK = threading.Lock()
+_tables: dict[tuple, "RateTable"] = {}
+
+
+def date_ordinals(dates) -> np.ndarray:
+    """Day ordinals (``date.toordinal()``) of "YYYY-MM-DD..." strings; -1 where unparsable."""
+    text = pd.Series(dates, dtype=object).astype(str).str.slice(0, 10)
+    parsed = pd.to_datetime(text, format="%Y-%m-%d", errors="coerce")
+    days = parsed.to_numpy().astype("datetime64[D]").astype(np.int64) + _EPOCH_ORDINAL
+    return np.where(parsed.notna().to_numpy(), days, -1)
+
+
+class RateTable:
+    """Base-currency rates per account and day."""
+
+    def __init__(
+        self,
+        base_currency: int | None,
+        account_currency: dict[int, int],
+        base_rates: dict[int, float],
+        history: dict[int, tuple[np.ndarray, np.ndarray]],
+    ):
+        self.base_currency = base_currency
+        self.account_currency = dict(account_currency)
+        self.base_rates = dict(base_rates)
+        # Set by ``rate_table``: changes whenever the currency tables do
+        self.fingerprint = ""
+        # CURRENCYID -> (sorted day ordinals, rate in force from that day)
+        self.history = history
+        self.foreign_accounts = {
+            aid for aid, cid in self.account_currency.items() if base_currency is not None and cid != base_currency
+        }
+        self._account_ids = np.array(sorted(self.account_currency), dtype=np.int64)
+        self._account_currencies = np.array(
+            [self.account_currency[aid] for aid in self._account_ids.tolist()], dtype=np.int64
+        )
+
+    @classmethod
+    def load(cls, conn) -> "RateTable":
+        info = conn.execute("SELECT MAX(INFOVALUE) FROM infotable_v1 WHERE INFONAME = 'BASECURRENCYID'").fetchone()
+        try:
+            base_currency = int(info[0]) if info and info[0] is not None else None
+        except (TypeError, ValueError):
+            base_currency = None
+        account_currency = {
+            int(aid): int(cid)
+            for aid, cid in conn.execute("SELECT ACCOUNTID, CURRENCYID FROM accountlist_v1").fetchall()
+            if cid is not None
+        }
+        base_rates = {}
+        for cid, rate in conn.execute("SELECT CURRENCYID, BASECONVRATE FROM currencyformats_v1").fetchall():
+            try:
+                rate = float(rate)
+            except (TypeError, ValueError):
+                continue
+            if rate > 0:
+                base_rates[int(cid)] = rate
+        foreign = sorted({cid for cid in account_currency.values() if cid != base_currency})
+        history: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        if base_currency is not None and foreign:
+            df = pd.read_sql_query(
+                f"SELECT CURRENCYID AS currency, CURRDATE AS day, CURRVALUE AS rate FROM currencyhistory_v1 "
+                f"WHERE CURRENCYID IN ({','.join('?' * len(foreign))}) AND CURRVALUE > 0",
+                conn,
+                params=foreign,
+            )
+            df["day"] = date_ordinals(df["day"])
+            df = df[df["day"] >= 0].sort_values(["currency", "day"], kind="stable")
+            for cid, rows in df.groupby("currency", sort=False):
+                # Several rates on one day: the last one recorded wins
+                rows = rows.drop_duplicates("day", keep="last")
+                history[int(cid)] = (rows["day"].to_numpy(dtype=np.int64), rows["rate"].to_numpy(dtype=float))
+        return cls(base_currency, account_currency, base_rates, history)
+
+    def converts(self, account_ids=None) -> bool:
+        """True when some of ``account_ids`` (default: every account) is not in the base currency."""
+        if not self.foreign_accounts:
+            return False
+        if not account_ids:
+            return True
+        return any(int(aid) in self.foreign_accounts for aid in account_ids)
+
+    def rates(self, accounts, ordinals) -> np.ndarray | None:
+        """Rate per row for (ACCOUNTID, day ordinal) arrays; None when every row is already in base currency."""
+        if not self.foreign_accounts:
+            return None
+        accounts = np.asarray(accounts, dtype=np.int64)
+        ordinals = np.asarray(ordinals, dtype=np.int64)
+        # Accounts without a CURRENCYID count as base currency
+        pos = np.clip(np.searchsorted(self._account_ids, accounts), 0, len(self._account_ids) - 1)
+        known = self._account_ids[pos] == accounts
+        currency = np.where(known, self._account_currencies[pos], -1)
+        foreign = known & (currency != self.base_currency)
+        if not foreign.any():
+            return None
+        out = np.ones(len(accounts))
+        for cid in np.unique(currency[foreign]).tolist():
+            rows = np.nonzero(currency == cid)[0]
+            rate = np.full(len(rows), self.base_rates.get(cid, 1.0))
+            dates, values = self.history.get(cid, (None, None))
+            if dates is not None and len(dates):
+                idx = np.searchsorted(dates, ordinals[rows], side="right") - 1
+                dated = idx >= 0
+                rate[dated] = values[idx[dated]]
+            out[rows] = rate
+        return out
+
+    def to_state(self) -> dict:
+        """JSON-friendly form, stored with the warm-cache lookups."""
+        return {
+            "base_currency": self.base_currency,
+            "account_currency": {str(aid): cid for aid, cid in self.account_currency.items()},
+            "base_rates": {str(cid): rate for cid, rate in self.base_rates.items()},
+            "history": {
+                str(cid): [dates.tolist(), values.tolist()] for cid, (dates, values) in self.history.items()
+            },
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "RateTable":
+        return cls(
+            state.get("base_currency"),
+            {int(aid): int(cid) for aid, cid in state.get("account_currency", {}).items()},
+            {int(cid): float(rate) for cid, rate in state.get("base_rates", {}).items()},
+            {
+                int(cid): (np.asarray(dates, dtype=np.int64), np.asarray(values, dtype=float))
+                for cid, (dates, values) in state.get("history", {}).items()
+            },
+        )
+
+
+def rate_table(conn) -> RateTable:
+    """Rate table of the database behind ``conn``, reused while its currency tables are unchanged."""
+    key = tuple(conn.execute(_FINGERPRINT_SQL).fetchone())
+    with _LOCK:
+        table = _tables.get(key)
+    if table is None:
+        table = RateTable.load(conn)
+        table.fingerprint = "|".join(str(part) for part in key)
+        with _LOCK:
+            if len(_tables) >= _CACHE_SIZE:
+                _tables.pop(next(iter(_tables)))
+            _tables[key] = table
+    return table
@@ -1,12 +1,189 @@
 import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
 from . import config
 
+_local = threading.local()
+_snapshot: "MemorySnapshot | None" = None
 
-def get_conn():
-    """Return a sqlite3 connection to the configured DB path."""
+
+class MemorySnapshot:
+    """RAM copy of the DB file, refreshed with the SQLite backup API.
+
+    The file is copied into a master in-memory database, and every thread
+    reads its own copy of the master, refreshed when the master moves on;
+    a reload never writes into a connection another thread is reading.
+    Reads never touch the (possibly OneDrive-locked) file unless it changed
+    since the last copy; if a refresh fails the previous copy is served.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._master = sqlite3.connect(":memory:", check_same_thread=False)
+        self._version = 0
+        self._signature: tuple[int, int] | None = None
+        self._lock = threading.RLock()
+        # (connection, master version) per thread
+        self._copies = threading.local()
+        self._closed = False
+        self.reload()
+
+    def _file_signature(self) -> tuple[int, int]:
+        stat = self.db_path.stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    def reload(self) -> None:
+        with self._lock:
+            signature = self._file_signature()
+            source = sqlite3.connect(str(self.db_path))
+            try:
+                source.backup(self._master)
+            finally:
+                source.close()
+            self._signature = signature
+            self._version += 1
+
+    def connection(self) -> sqlite3.Connection | None:
+        """This thread's copy, brought up to date; None once the snapshot is closed."""
+        copy = getattr(self._copies, "copy", None)
+        with self._lock:
+            if self._closed:
+                return None
+            try:
+                if self._file_signature() != self._signature:
+                    self.reload()
+            except (OSError, sqlite3.DatabaseError):
+                if self._signature is None:
+                    raise
+            if copy is not None and copy[1] == self._version:
+                return copy[0]
+            conn = copy[0] if copy is not None else sqlite3.connect(":memory:", check_same_thread=False)
+            try:
+                self._master.backup(conn)
+            except sqlite3.DatabaseError:
+                if copy is None:
+                    conn.close()
+                    raise
+                # Still being read by this thread (an open cursor): serve the previous copy
+                return conn
+            self._copies.copy = (conn, self._version)
+            return conn
+
+    def apply(self, operation) -> None:
+        """Replay a write already committed to the file, then mark the copy current."""
+        with self._lock:
+            if self._closed:
+                return
+            operation(self._master.cursor())
+            self._master.commit()
+            self._signature = self._file_signature()
+            self._version += 1
+
+    def close(self) -> None:
+        """Drop the master; threads still reading keep their copies until the snapshot is released."""
+        with self._lock:
+            self._closed = True
+            self._master.close()
+
+
+class DataVersionProbe:
+    """Detect commits by other connections via PRAGMA data_version.
+
+    Keeps one long-lived read-only connection, as data_version is only
+    meaningful when compared on the same connection.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+
+    def version(self) -> int:
+        return int(self.conn.execute("PRAGMA data_version").fetchone()[0])
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def enable_memory_snapshot(db_path: Path | None = None) -> MemorySnapshot:
+    """Serve reads of ``db_path`` (default: config.DB_PATH) from a RAM snapshot."""
+    global _snapshot
+    db_path = Path(db_path or config.DB_PATH)
+    if _snapshot is not None and _snapshot.db_path == db_path:
+        return _snapshot
+    disable_memory_snapshot()
+    _snapshot = MemorySnapshot(db_path)
+    return _snapshot
+
+
+def disable_memory_snapshot() -> None:
+    global _snapshot
+    if _snapshot is not None:
+        _snapshot.close()
+        _snapshot = None
+
+
+def _active_snapshot() -> MemorySnapshot | None:
+    if _snapshot is not None and config.DB_PATH and _snapshot.db_path == Path(config.DB_PATH):
+        return _snapshot
+    return None
+
+
+def get_write_conn():
+    """Return a connection to the DB file itself (never the snapshot)."""
+    pinned = getattr(_local, "conn", None)
+    if pinned is not None:
+        return pinned
     db_path = config.DB_PATH
     if not db_path:
         raise RuntimeError("Database path is not configured. Please choose a DB file.")
     if not db_path.exists():
         raise FileNotFoundError(f"Database file not found: {db_path}")
     return sqlite3.connect(str(db_path))
+
+
+def get_conn():
+    """Return a sqlite3 connection to the configured DB path."""
+    pinned = getattr(_local, "conn", None)
+    if pinned is not None:
+        return pinned
+    snapshot = _active_snapshot()
+    if snapshot is not None:
+        conn = snapshot.connection()
+        if conn is not None:
+            return conn
+    return get_write_conn()
+
+
+def run_write(operation) -> None:
+    """Run ``operation(cursor)`` against the file and mirror it onto the snapshot."""
+    snapshot = None if getattr(_local, "conn", None) is not None else _active_snapshot()
+    if snapshot is not None:
+        # Catch up with external changes first so the replay sees the same rows
+        snapshot.connection()
+    with get_write_conn() as conn:
+        operation(conn.cursor())
+        conn.commit()
+    if snapshot is not None:
+        snapshot.apply(operation)
+
+
+@contextmanager
+def pinned_connection(db_path: Path):
+    """Serve every get_conn() of the current thread from one connection to ``db_path``.
+
+    Lets workers (threads or processes) read different databases at the same
+    time without touching the global ``config.DB_PATH``.
+    """
+    db_path = Path(db_path)
+    if not db_path.exists():
+        raise FileNotFoundError(f"Database file not found: {db_path}")
+    conn = sqlite3.connect(str(db_path))
+    previous = getattr(_local, "conn", None)
+    _local.conn = conn
+    try:
+        yield conn
+    finally:
+        _local.conn = previous
+        conn.close()
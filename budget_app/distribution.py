@@ -0,0 +1,162 @@
+"""Budget distribution rules shared by the GUI and the headless report.
+
+The part of a yearly amount not covered by explicit months is spread
+evenly over the remaining months, or by the given month weights (seasonal
+profiles from ``suggest.seasonal_profiles``). ``distribute_budgets`` applies
+the same rules to many categories at once, ``carried_balances`` turns
+monthly budgets into envelope-style running balances.
+"""
+
+import numpy as np
+
+_EXPECTED_COUNTS = {
+    "Monthly": 12,
+    "Yearly": 12,
+    "Weekly": 12,
+    "Quarterly": 4,
+}
+
+
+def annual_total_from_period(amount, period, months_count):
+    months = months_count or 12
+    if amount is None:
+        return 0.0
+    amount = float(amount)
+    if period == "Yearly":
+        return amount
+    if period == "Quarterly":
+        return amount * 4.0
+    if period == "Weekly":
+        return amount * 52.0
+    return amount * months
+
+
+def _has_annual(year_amount, year_period) -> bool:
+    return year_amount is not None and (year_period not in (None, "", "None"))
+
+
+def compute_budget_distribution(year_amount, year_period, month_bids, overrides, weights=None):
+    """(monthly values, total, over limit, explicit bids) for one category.
+
+    ``weights`` maps month bid -> weight; the remainder follows the weights of
+    the months without an explicit amount, or is spread evenly when they are
+    all zero.
+    """
+    months_count = len(month_bids) or 0
+    expected_count = _EXPECTED_COUNTS.get(year_period, 12 if months_count == 0 else months_count)
+    months_for_total = expected_count or months_count or 12
+
+    annual_total = annual_total_from_period(year_amount, year_period, months_for_total)
+    overrides = {bid: float(val) for bid, val in overrides.items() if val is not None}
+    sum_overrides = sum(overrides.values())
+    missing_bids = [bid for bid in month_bids if bid not in overrides]
+
+    has_annual = _has_annual(year_amount, year_period)
+    if not has_annual:
+        values = {}
+        for bid in month_bids:
+            values[bid] = overrides.get(bid, 0.0)
+        return values, sum_overrides, False, set(overrides.keys())
+
+    limited_view = bool(expected_count) and 0 < len(month_bids) < expected_count
+    over_limit = False
+    if annual_total is not None:
+        over_limit = abs(sum_overrides) > abs(annual_total)
+
+    values = {}
+    if limited_view:
+        for bid in month_bids:
+            values[bid] = overrides.get(bid, 0.0) or 0.0
+        if year_amount is not None:
+            total_display = annual_total
+        else:
+            total_display = sum(values.values())
+            over_limit = False
+        return values, total_display, over_limit, set(overrides.keys())
+
+    if over_limit:
+        total_display = sum_overrides
+        for bid in month_bids:
+            values[bid] = overrides.get(bid, 0.0)
+        return values, total_display, over_limit, set(overrides.keys())
+
+    total_display = annual_total
+    if not missing_bids:
+        for bid in month_bids:
+            values[bid] = overrides.get(bid, 0.0)
+        return values, sum_overrides, over_limit, set(overrides.keys())
+
+    remainder = annual_total - sum_overrides
+    missing_weights = [max(float(weights.get(bid, 0.0)), 0.0) for bid in missing_bids] if weights else []
+    weight_sum = sum(missing_weights)
+    if weight_sum > 0:
+        shares = {bid: remainder * w / weight_sum for bid, w in zip(missing_bids, missing_weights)}
+    else:
+        shares = dict.fromkeys(missing_bids, remainder / len(missing_bids))
+    for bid in month_bids:
+        if bid in overrides:
+            values[bid] = overrides[bid]
+        else:
+            values[bid] = shares[bid]
+    if missing_bids:
+        diff = total_display - sum(values.values())
+        if abs(diff) > 1e-6:
+            last = missing_bids[-1]
+            values[last] += diff
+    return values, total_display, over_limit, set(overrides.keys())
+
+
+def distribute_budgets(year_amounts, year_periods, overrides, weights=None):
+    """``compute_budget_distribution`` for many categories over the same months.
+
+    ``year_amounts`` holds NaN where a category has no yearly amount,
+    ``overrides`` (category x month) NaN where a month has no explicit
+    amount, ``weights`` (category x month) the optional month weights.
+    Returns (values, totals, over_limit, explicit) as arrays.
+    """
+    overrides = np.asarray(overrides, dtype=float)
+    n_cats, months_count = overrides.shape
+    amounts = np.asarray(year_amounts, dtype=float)
+    explicit = ~np.isnan(overrides)
+    values = np.where(explicit, overrides, 0.0)
+    sum_overrides = values.sum(axis=1)
+
+    has_annual = np.zeros(n_cats, dtype=bool)
+    annual = np.zeros(n_cats)
+    limited = np.zeros(n_cats, dtype=bool)
+    for idx, (amount, period) in enumerate(zip(amounts.tolist(), year_periods)):
+        if amount != amount or not _has_annual(amount, period):
+            continue
+        expected = _EXPECTED_COUNTS.get(period, 12 if months_count == 0 else months_count)
+        has_annual[idx] = True
+        annual[idx] = annual_total_from_period(amount, period, expected or months_count or 12)
+        limited[idx] = bool(expected) and 0 < months_count < expected
+
+    over_limit = has_annual & (np.abs(sum_overrides) > np.abs(annual))
+    missing = ~explicit
+    n_missing = missing.sum(axis=1)
+    spread = has_annual & ~limited & ~over_limit & (n_missing > 0)
+    totals = np.where(has_annual & (limited | spread), annual, sum_overrides)
+
+    if spread.any():
+        if weights is None:
+            weight = missing.astype(float)
+        else:
+            weight = np.where(missing, np.clip(np.asarray(weights, dtype=float), 0.0, None), 0.0)
+            # Categories without any weight on their free months fall back to an even spread
+            weight[weight.sum(axis=1) <= 0] = missing[weight.sum(axis=1) <= 0]
+        remainder = np.where(spread, annual - sum_overrides, 0.0)
+        values = values + remainder[:, None] * weight / np.maximum(weight.sum(axis=1), 1e-12)[:, None]
+        rows = np.nonzero(spread)[0]
+        last = months_count - 1 - np.argmax(missing[rows, ::-1], axis=1)
+        values[rows, last] += annual[rows] - values[rows].sum(axis=1)
+    return values, totals, over_limit, explicit
+
+
+def carried_balances(actual, budget) -> np.ndarray:
+    """Envelope balances: running sum of actual - budget over the months (last axis).
+
+    With the grid's signs a positive balance is budget still available, a
+    negative one overspending carried into the following months.
+    """
+    return np.cumsum(np.asarray(actual, dtype=float) - np.asarray(budget, dtype=float), axis=-1)
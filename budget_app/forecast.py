@@ -0,0 +1,151 @@
+"""Year-end forecast per category.
+
+    forecast = actuals to date + remainder of the year
+
+The remainder combines the scheduled transactions still to come
+(``schedule.projected_actuals``) with a seasonal estimate: what the prior
+years booked in the rest of the year, scaled by this year's pace against
+the same part of those years. Recurring schedules are already part of that
+history, so when both point the same way the larger of the two is kept
+instead of their sum. Every step runs over all categories at once; results
+are cached per (year, account set) until the store, the schedules or the
+day change.
+"""
+
+import calendar
+import threading
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from .repository import fetch_actuals_for_years
+from .schedule import projected_actuals, schedules_fingerprint
+
+HISTORY_YEARS = 3
+# This year's pace may scale the seasonal remainder between half and double
+PACE_LIMITS = (0.5, 2.0)
+
+FORECAST_COLUMNS = ["categid", "actual", "scheduled", "seasonal", "forecast"]
+
+_CACHE_LOCK = threading.Lock()
+_cache: dict[tuple, tuple[tuple, pd.DataFrame]] = {}
+
+
+def elapsed_weights(year: int, as_of: date) -> np.ndarray:
+    """Share (0..1) of each month of ``year`` already elapsed at ``as_of``."""
+    if as_of.year > year:
+        return np.ones(12)
+    weights = np.zeros(12)
+    if as_of.year == year:
+        weights[: as_of.month - 1] = 1.0
+        weights[as_of.month - 1] = as_of.day / calendar.monthrange(year, as_of.month)[1]
+    return weights
+
+
+@dataclass
+class ForecastInputs:
+    """What the forecast (and the risk simulation) is built from, per category."""
+
+    categids: np.ndarray
+    actual: np.ndarray  # booked so far this year
+    history: np.ndarray  # prior years with any data, year x month x category
+    done: np.ndarray  # elapsed share of each month
+    pace: np.ndarray  # this year vs the same part of the prior years, clipped
+    scheduled: np.ndarray  # scheduled transactions still to come
+
+
+def forecast_inputs(year: int, account_ids, store, as_of: date, history_years: int = HISTORY_YEARS) -> ForecastInputs:
+    year = int(year)
+    first = year - history_years
+    if store is not None:
+        _, categids, cube = store.year_cube(first, year, account_ids)
+    else:
+        _, categids, cube = fetch_actuals_for_years(first, year, account_ids)
+    done = elapsed_weights(year, as_of)
+    actual = cube[-1].sum(axis=0)
+    history = cube[:-1]
+    history = history[history.reshape(len(history), -1).any(axis=1)]
+
+    df_sched = projected_actuals(year, account_ids=account_ids) if done.min() < 1.0 else None
+    scheduled = np.zeros(len(categids))
+    if df_sched is not None and not df_sched.empty:
+        sched_ids = df_sched["categid"].to_numpy(dtype=np.int64)
+        all_ids = np.union1d(categids, sched_ids)
+        scheduled = np.bincount(
+            np.searchsorted(all_ids, sched_ids),
+            weights=df_sched["amount"].to_numpy(dtype=float),
+            minlength=len(all_ids),
+        )
+        pos = np.searchsorted(all_ids, categids)
+        actual_all = np.zeros(len(all_ids))
+        actual_all[pos] = actual
+        history_all = np.zeros(history.shape[:2] + (len(all_ids),))
+        history_all[:, :, pos] = history
+        categids, actual, history = all_ids, actual_all, history_all
+
+    profile = history.mean(axis=0) if len(history) else np.zeros((12, len(categids)))
+    hist_done = done @ profile
+    comparable = (np.abs(hist_done) > 0.005) & (np.sign(hist_done) == np.sign(actual))
+    pace = np.ones(len(categids))
+    np.divide(actual, hist_done, out=pace, where=comparable)
+    return ForecastInputs(
+        categids=np.asarray(categids, dtype=np.int64),
+        actual=actual,
+        history=history,
+        done=done,
+        pace=np.clip(pace, *PACE_LIMITS),
+        scheduled=scheduled,
+    )
+
+
+def combine_remainder(scheduled: np.ndarray, seasonal: np.ndarray) -> np.ndarray:
+    """Scheduled and seasonal remainder: the larger one when both point the same way."""
+    same_way = np.sign(scheduled) == np.sign(seasonal)
+    larger = np.where(np.abs(scheduled) >= np.abs(seasonal), scheduled, seasonal)
+    return np.where(same_way, larger, scheduled + seasonal)
+
+
+def _compute(year: int, account_ids, store, as_of: date, history_years: int) -> pd.DataFrame:
+    inputs = forecast_inputs(year, account_ids, store, as_of, history_years)
+    profile = inputs.history.mean(axis=0) if len(inputs.history) else np.zeros((12, len(inputs.categids)))
+    seasonal = ((1.0 - inputs.done) @ profile) * inputs.pace
+    actual, scheduled = inputs.actual, inputs.scheduled
+    forecast = actual + combine_remainder(scheduled, seasonal)
+    keep = (actual != 0) | (scheduled != 0) | (seasonal != 0)
+    return pd.DataFrame(
+        {
+            "categid": inputs.categids[keep],
+            "actual": actual[keep],
+            "scheduled": scheduled[keep],
+            "seasonal": seasonal[keep],
+            "forecast": forecast[keep],
+        },
+        columns=FORECAST_COLUMNS,
+    )
+
+
+def year_end_forecast(
+    year, account_ids=None, store=None, as_of: date | None = None, history_years: int = HISTORY_YEARS
+) -> pd.DataFrame:
+    """Expected year-end total per category (columns ``FORECAST_COLUMNS``).
+
+    ``store`` is a ``TransactionStore``; without one the actuals come from
+    SQL and the result is not cached.
+    """
+    year = int(year)
+    as_of = as_of or date.today()
+    accounts = tuple(sorted(int(a) for a in account_ids)) if account_ids else ()
+    if store is None:
+        return _compute(year, list(accounts) or None, None, as_of, history_years)
+    key = (year, accounts, history_years)
+    token = (as_of, store.generation, schedules_fingerprint())
+    with _CACHE_LOCK:
+        cached = _cache.get(key)
+    if cached is not None and cached[0] == token:
+        return cached[1].copy()
+    frame = _compute(year, list(accounts) or None, store, as_of, history_years)
+    with _CACHE_LOCK:
+        _cache[key] = (token, frame)
+    return frame.copy()
@@ -0,0 +1,90 @@
+"""Payee breakdown of one category's actuals (PAYEE_V1).
+
+One grouped query per (category, date range, account set), converted to the
+base currency like the grid, then shaped into a (payee x month) matrix. The
+result is cached until the transaction store or the payee table changes, so
+reopening the detail dialog of a category costs nothing.
+"""
+
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from .db import get_conn
+from .repository import fetch_payee_actuals
+
+DEFAULT_TOP = 5
+OTHERS_LABEL = "Altri"
+NO_PAYEE_LABEL = "(nessun beneficiario)"
+
+_FINGERPRINT_SQL = """
+SELECT COUNT(*) || ':' || IFNULL(SUM(length(PAYEENAME)), 0) || ':' || IFNULL(MAX(PAYEEID), 0) FROM payee_v1
+"""
+
+_LOCK = threading.Lock()
+_cache: dict[tuple, tuple[object, str, "PayeeBreakdown"]] = {}
+
+
+@dataclass
+class PayeeBreakdown:
+    months: list[str]  # "YYYY-MM", in column order
+    payees: list[str]  # by decreasing absolute total
+    values: np.ndarray  # payee x month
+
+    @property
+    def totals(self) -> np.ndarray:
+        return self.values.sum(axis=1)
+
+    def top(self, count: int = DEFAULT_TOP) -> tuple[list[str], np.ndarray]:
+        """First ``count`` payees of the period, the others summed into one "Altri" row."""
+        if len(self.payees) <= count + 1:
+            return list(self.payees), self.values
+        rest = self.values[count:].sum(axis=0, keepdims=True)
+        return self.payees[:count] + [OTHERS_LABEL], np.vstack([self.values[:count], rest])
+
+    def month_top(self, month_idx: int, count: int = DEFAULT_TOP) -> list[tuple[str, float]]:
+        """(payee, amount) of the ``count`` largest payees of one month."""
+        column = self.values[:, month_idx]
+        order = np.argsort(-np.abs(column), kind="stable")[:count]
+        return [(self.payees[i], float(column[i])) for i in order.tolist() if column[i]]
+
+
+def _shape(df, months: list[str]) -> PayeeBreakdown:
+    df = df[df["month"].isin(months)]
+    names = df["payee"].where(df["payee"] != "", NO_PAYEE_LABEL)
+    payees = sorted(set(names.tolist()))
+    values = np.zeros((len(payees), len(months)))
+    if payees:
+        rows = np.searchsorted(np.array(payees, dtype=object), names.to_numpy(dtype=object))
+        cols = np.searchsorted(np.array(months, dtype=object), df["month"].to_numpy(dtype=object))
+        np.add.at(values, (rows, cols), df["amount"].to_numpy(dtype=float))
+    # Largest first; ties keep the alphabetical order
+    order = np.argsort(-np.abs(values.sum(axis=1)), kind="stable")
+    return PayeeBreakdown(months=list(months), payees=[payees[i] for i in order.tolist()], values=values[order])
+
+
+def payee_breakdown(categid, months: list[str], account_ids=None, store=None) -> PayeeBreakdown:
+    """Actuals of ``categid`` per payee over ``months`` ("YYYY-MM", ascending)."""
+    months = [str(m) for m in months]
+    accounts = tuple(sorted(int(a) for a in account_ids)) if account_ids else ()
+    key = (int(categid), tuple(months), accounts)
+    # Without a store there is nothing that tells when the actuals change
+    generation = store.generation if store is not None else None
+    with get_conn() as conn:
+        fingerprint = str(conn.execute(_FINGERPRINT_SQL).fetchone()[0])
+    if generation is not None:
+        with _LOCK:
+            cached = _cache.get(key)
+        if cached is not None and cached[:2] == (generation, fingerprint):
+            return cached[2]
+    date_range = None
+    if months:
+        last_year, last_month = int(months[-1][:4]), int(months[-1][5:7])
+        date_range = (f"{months[0]}-01", f"{last_year + last_month // 12}-{last_month % 12 + 1:02d}-01")
+    df = fetch_payee_actuals(categid, date_range, list(accounts) or None)
+    breakdown = _shape(df, months)
+    if generation is not None:
+        with _LOCK:
+            _cache[key] = (generation, fingerprint, breakdown)
+    return breakdown
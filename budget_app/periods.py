@@ -0,0 +1,81 @@
+"""Weekly and daily columns of a budget year (Qt-free).
+
+A period is a bin of consecutive days clipped to the calendar year, so the
+periods of a year add up to its monthly totals: weeks start on Monday and
+are labelled with their ISO week number, the first and last one may be
+partial. Actuals are binned from day ordinals by ``TransactionStore``;
+monthly budgets are spread evenly over their days and binned the same way.
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+
+GRANULARITIES = ("month", "week", "day")
+_DAYS_PER_PERIOD = {"week": 7, "day": 1}
+
+
+def period_bins(year, granularity: str) -> tuple[int, int, int]:
+    """(ordinal of the first bin's first day, days per bin, bins) covering ``year``."""
+    if granularity not in _DAYS_PER_PERIOD:
+        raise ValueError(f"Unsupported granularity: {granularity}")
+    year = int(year)
+    jan1 = date(year, 1, 1)
+    step = _DAYS_PER_PERIOD[granularity]
+    first = jan1.toordinal() - (jan1.weekday() if granularity == "week" else 0)
+    last = date(year, 12, 31).toordinal()
+    return first, step, (last - first) // step + 1
+
+
+def day_periods(year, granularity: str) -> np.ndarray:
+    """Bin index of every day of ``year``."""
+    first, step, _ = period_bins(year, granularity)
+    start = date(int(year), 1, 1).toordinal()
+    days = date(int(year) + 1, 1, 1).toordinal() - start
+    return (np.arange(start, start + days) - first) // step
+
+
+def period_labels(year, granularity: str) -> list[tuple[str, str]]:
+    """(column label, covered dates) per bin of ``year``."""
+    first, step, count = period_bins(year, granularity)
+    start, end = date(int(year), 1, 1), date(int(year), 12, 31)
+    labels = []
+    for idx in range(count):
+        day = date.fromordinal(first + idx * step)
+        if granularity == "day":
+            labels.append((day.strftime("%d/%m"), day.strftime("%d/%m/%Y")))
+            continue
+        week = (day + timedelta(days=3)).isocalendar()[1]
+        span_start = max(day, start)
+        span_end = min(day + timedelta(days=step - 1), end)
+        labels.append((f"S{week:02d}", f"{span_start:%d/%m/%Y} - {span_end:%d/%m/%Y}"))
+    return labels
+
+
+def prorate_budgets(year, granularity: str, month_budgets: np.ndarray) -> np.ndarray:
+    """(rows x 12) monthly budgets spread over their days and summed per bin."""
+    month_budgets = np.asarray(month_budgets, dtype=float).reshape(-1, 12)
+    year = int(year)
+    start = np.datetime64(f"{year}-01-01")
+    days = (np.datetime64(f"{year + 1}-01-01") - start).astype(int)
+    day_month = (start + np.arange(days)).astype("datetime64[M]").astype(int) % 12
+    month_days = np.bincount(day_month, minlength=12)
+    periods = day_periods(year, granularity)
+    count = period_bins(year, granularity)[2]
+    per_day = month_budgets[:, day_month] / month_days[day_month]
+    out = np.zeros((len(month_budgets), count))
+    np.add.at(out, (slice(None), periods), per_day)
+    return out
+
+
+def cumulative_daily_budget(year, month_budgets, seasonal: bool) -> np.ndarray:
+    """Budget consumed by the end of each day of ``year``.
+
+    Linear spreads the annual total evenly over the days; seasonal follows
+    the monthly budgets, each one spread over its own month.
+    """
+    month_budgets = np.asarray(month_budgets, dtype=float).reshape(12)
+    if seasonal:
+        return prorate_budgets(year, "day", month_budgets)[0].cumsum()
+    days = len(day_periods(year, "day"))
+    return month_budgets.sum() * np.arange(1, days + 1) / days
@@ -0,0 +1,142 @@
+"""Headless budget-vs-actual report.
+
+Reuses the repository queries and the GUI budget distribution rules without
+touching PyQt6 or matplotlib, so it can run from cron / Task Scheduler.
+"""
+
+import csv
+import json
+from typing import Any, Iterable, Iterator, TextIO
+
+import numpy as np
+
+from .distribution import distribute_budgets
+from .repository import (
+    load_budgetyear_map,
+    load_categories,
+    fetch_actuals_for_year,
+    load_budgets_for_year,
+)
+from .suggest import seasonal_profiles
+
+REPORT_FIELDS = ["year", "category_id", "category", "month", "actual", "budget", "diff"]
+REPORT_FORMATS = ["csv", "jsonl"]
+
+
+def category_paths(id2name, children_map, root_ids) -> list[tuple[int, str]]:
+    """Return (CATEGID, "Main:Sub" path) in grid order.
+
+    Main categories are only headers in the GUI, so they are skipped here too.
+    """
+    ordered: list[tuple[int, str]] = []
+
+    def walk(cid, prefix, depth):
+        name = id2name.get(cid, f"(id:{cid})")
+        path = f"{prefix}:{name}" if prefix else name
+        if depth > 0:
+            ordered.append((int(cid), path))
+        for ch in sorted(children_map.get(cid, []), key=lambda x: id2name.get(x, "")):
+            walk(ch, path, depth + 1)
+
+    for r in root_ids:
+        walk(r, "", 0)
+    return ordered
+
+
+def report_months(year: str, per_year_entries) -> list[str]:
+    """Month names shown as grid columns for ``year`` (all 12 if no budget exists)."""
+    months = [name for _, name in per_year_entries.get(year, []) if name != year]
+    if not months:
+        months = [f"{year}-{m:02d}" for m in range(1, 13)]
+    return months
+
+
+def iter_report_rows(
+    year, account_ids=None, all_months: bool = False, seasonal_categories=None
+) -> Iterator[dict[str, Any]]:
+    """Return an iterator over one budget-vs-actual row per (category, month).
+
+    The (small) aggregates are read eagerly so DB errors surface before any
+    output is written; rows themselves are produced lazily. ``all_months``
+    reports the 12 calendar months even when only some have budget entries;
+    yearly budgets of ``seasonal_categories`` follow their seasonal profile.
+    """
+    year = str(year)
+    _, per_year_entries, name_to_id = load_budgetyear_map()
+    id2name, children_map, root_ids = load_categories()
+    if all_months:
+        months = [f"{year}-{m:02d}" for m in range(1, 13)]
+    else:
+        months = report_months(year, per_year_entries)
+
+    df_actual = fetch_actuals_for_year(year, account_ids)
+    df_bud = load_budgets_for_year(year, name_to_id, per_year_entries)
+    actual_map = {
+        (int(cid), month): float(amount or 0.0)
+        for month, cid, amount in zip(df_actual["month"], df_actual["categid"], df_actual["amount"])
+    }
+    budget_map = {}
+    if not df_bud.empty:
+        budget_map = {
+            (int(cid), name): (float(amount or 0), period or "Monthly")
+            for cid, name, amount, period in zip(
+                df_bud["CATEGID"], df_bud["BUDGETYEARNAME"], df_bud["AMOUNT"], df_bud["PERIOD"]
+            )
+        }
+
+    profiles = {}
+    if seasonal_categories and year.isdigit():
+        seasonal = {int(cid) for cid in seasonal_categories}
+        profiles = {cid: w for cid, w in seasonal_profiles(year, account_ids).items() if cid in seasonal}
+
+    paths = category_paths(id2name, children_map, root_ids)
+    return _budget_rows(year, months, paths, actual_map, budget_map, profiles)
+
+
+def _budget_rows(year, months, paths, actual_map, budget_map, profiles=None) -> Iterator[dict[str, Any]]:
+    cids = [cid for cid, _ in paths]
+    year_entries = [budget_map.get((cid, year), (np.nan, "")) for cid in cids]
+    overrides = np.array(
+        [[budget_map.get((cid, month), (np.nan,))[0] for month in months] for cid in cids], dtype=float
+    ).reshape(len(cids), len(months))
+    weights = None
+    if profiles:
+        month_idx = [int(month[5:7]) - 1 if month[5:7].isdigit() else -1 for month in months]
+        weights = np.zeros(overrides.shape)
+        for row, cid in enumerate(cids):
+            if cid in profiles:
+                weights[row] = [profiles[cid][m] if 0 <= m < 12 else 0.0 for m in month_idx]
+    monthly_budget, _, _, _ = distribute_budgets(
+        [amount for amount, _ in year_entries], [period for _, period in year_entries], overrides, weights
+    )
+    for row, (cid, path) in enumerate(paths):
+        for col, month in enumerate(months):
+            actual = actual_map.get((cid, month), 0.0)
+            budget = float(monthly_budget[row, col])
+            yield {
+                "year": year,
+                "category_id": cid,
+                "category": path,
+                "month": month,
+                "actual": round(actual, 2),
+                "budget": round(budget, 2),
+                "diff": round(actual - budget, 2),
+            }
+
+
+def write_rows(rows: Iterable[dict[str, Any]], fmt: str, out: TextIO, fields: list[str] | None = None) -> int:
+    """Stream ``rows`` to ``out`` as CSV or JSON Lines; return the row count."""
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=fields or REPORT_FIELDS, lineterminator="\n")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    elif fmt == "jsonl":
+        for row in rows:
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+            count += 1
+    else:
+        raise ValueError(f"Unsupported report format: {fmt}")
+    return count
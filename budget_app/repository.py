@@ -1,7 +1,11 @@
 from collections import defaultdict
+from typing import Any
+
+import numpy as np
 import pandas as pd
 
-from .db import get_conn
+from .currency import date_ordinals, rate_table
+from .db import get_conn, run_write
 
 
 def load_budgetyear_map():
@@ -61,17 +65,24 @@ def load_accounts():
     return accounts
 
 
-def fetch_actuals_for_year(year, account_ids=None):
+def _actuals_cte(account_ids=None, date_range=None):
+    """``WITH wd`` clause (date, signed amount, categid, account, payee) shared by the actuals queries."""
     account_ids = [int(aid) for aid in account_ids] if account_ids else []
-    account_filter = ""
-    split_filter = ""
-    params = []
+    split_conds, plain_conds = [], ["ca.categid <> -1", "ca.transcode <> 'Transfer'"]
+    split_params, plain_params = [], []
     if account_ids:
         placeholders = ",".join("?" * len(account_ids))
-        split_filter = f" WHERE t1.ACCOUNTID IN ({placeholders})"
-        account_filter = f" AND ca.ACCOUNTID IN ({placeholders})"
-        params.extend(account_ids)
-        params.extend(account_ids)
+        split_conds.append(f"t1.ACCOUNTID IN ({placeholders})")
+        plain_conds.append(f"ca.ACCOUNTID IN ({placeholders})")
+        split_params.extend(account_ids)
+        plain_params.extend(account_ids)
+    if date_range:
+        # Plain range on TRANSDATE so IDX_CHECKINGACCOUNT_TRANSDATE can be used
+        split_conds.append("t1.TRANSDATE >= ? AND t1.TRANSDATE < ?")
+        plain_conds.append("ca.TRANSDATE >= ? AND ca.TRANSDATE < ?")
+        split_params.extend(date_range)
+        plain_params.extend(date_range)
+    split_filter = f" WHERE {' AND '.join(split_conds)}" if split_conds else ""
     sql = f"""
     WITH wd AS (
         SELECT t1.transdate AS date,
@@ -79,7 +90,7 @@ def fetch_actuals_for_year(year, account_ids=None):
                     WHEN t1.TRANSCODE = 'Withdrawal' THEN -1 * t2.splittransamount
                     WHEN t1.TRANSCODE = 'Transfer' AND t1.TOACCOUNTID <> t1.ACCOUNTID THEN -1 * t2.splittransamount
                     ELSE t2.splittransamount END AS amount,
-               t2.categid AS categid
+               t2.categid AS categid, t1.ACCOUNTID AS account, t1.PAYEEID AS payee
         FROM splittransactions_v1 t2
         JOIN checkingaccount_v1 t1 ON t1.TRANSID = t2.TRANSID
         {split_filter}
@@ -89,19 +100,197 @@ def fetch_actuals_for_year(year, account_ids=None):
                     WHEN ca.TRANSCODE = 'Withdrawal' THEN -1 * ca.TRANSAMOUNT
                     WHEN ca.TRANSCODE = 'Transfer' AND ca.TOACCOUNTID <> ca.ACCOUNTID THEN -1 * ca.TRANSAMOUNT
                     ELSE ca.TRANSAMOUNT END AS amount,
-               ca.categid AS categid
+               ca.categid AS categid, ca.ACCOUNTID AS account, ca.PAYEEID AS payee
         FROM checkingaccount_v1 ca
-        WHERE ca.categid <> -1 AND ca.transcode <> 'Transfer'{account_filter}
+        WHERE {' AND '.join(plain_conds)}
+    )
+    """
+    return sql, split_params + plain_params
+
+
+def _converted_daily(conn, account_ids, date_range) -> pd.DataFrame | None:
+    """Daily (day, categid, amount) actuals in base currency.
+
+    None when every account in the filter already is in base currency, so
+    the plain GROUP BY queries can be used as they are.
+    """
+    rates = rate_table(conn)
+    if not rates.converts(account_ids):
+        return None
+    cte, params = _actuals_cte(account_ids, date_range)
+    sql = cte + """
+    SELECT substr(date,1,10) AS day, account, categid, SUM(amount) AS amount
+    FROM wd GROUP BY day, account, categid
+    """
+    df = pd.read_sql_query(sql, conn, params=params)
+    amounts = df["amount"].fillna(0.0).to_numpy(dtype=float)
+    factor = rates.rates(df["account"].to_numpy(dtype=np.int64), date_ordinals(df["day"]))
+    return pd.DataFrame(
+        {"day": df["day"], "categid": df["categid"], "amount": amounts if factor is None else amounts * factor}
+    )
+
+
+TRANSACTION_COLUMNS = ["date", "transid", "splitid", "account", "payee", "notes", "amount"]
+
+
+def fetch_transaction_page(categid, date_range, account_ids=None, after=None, limit=200) -> list[tuple]:
+    """One page of the transactions behind an actuals cell (rows shaped like ``TRANSACTION_COLUMNS``).
+
+    Same rules as ``_actuals_cte``: no plain transfers, signed amounts; void
+    transactions count for nothing there and are left out here. Rows come in
+    (date, TRANSID, SPLITTRANSID) order, plain transactions with SPLITTRANSID 0;
+    ``after`` is that key of the last row already loaded, so every page is an
+    index range scan no matter how deep it is. Amounts are in base currency.
+    """
+    account_ids = [int(aid) for aid in account_ids] if account_ids else []
+    branches = []
+    params: list[Any] = []
+    for split in (True, False):
+        if split:
+            key = "(t1.TRANSDATE, t1.TRANSID, t2.SPLITTRANSID)"
+            select = """
+            SELECT t1.TRANSDATE AS date, t1.TRANSID AS transid, t2.SPLITTRANSID AS splitid,
+                   t1.ACCOUNTID AS accountid, t1.PAYEEID AS payeeid,
+                   COALESCE(NULLIF(t2.NOTES, ''), t1.NOTES) AS notes,
+                   CASE WHEN t1.TRANSCODE = 'Withdrawal' THEN -1 * t2.SPLITTRANSAMOUNT
+                        WHEN t1.TRANSCODE = 'Transfer' AND t1.TOACCOUNTID <> t1.ACCOUNTID THEN -1 * t2.SPLITTRANSAMOUNT
+                        ELSE t2.SPLITTRANSAMOUNT END AS amount
+            FROM splittransactions_v1 t2
+            JOIN checkingaccount_v1 t1 ON t1.TRANSID = t2.TRANSID
+            WHERE t2.CATEGID = ?"""
+            alias = "t1"
+        else:
+            key = "(ca.TRANSDATE, ca.TRANSID, 0)"
+            select = """
+            SELECT ca.TRANSDATE AS date, ca.TRANSID AS transid, 0 AS splitid,
+                   ca.ACCOUNTID AS accountid, ca.PAYEEID AS payeeid, ca.NOTES AS notes,
+                   CASE WHEN ca.TRANSCODE = 'Withdrawal' THEN -1 * ca.TRANSAMOUNT
+                        ELSE ca.TRANSAMOUNT END AS amount
+            FROM checkingaccount_v1 ca
+            WHERE ca.CATEGID = ? AND ca.TRANSCODE <> 'Transfer'"""
+            alias = "ca"
+        conds = [f"{alias}.TRANSDATE >= ? AND {alias}.TRANSDATE < ?", f"IFNULL({alias}.STATUS, '') <> 'V'"]
+        params.extend([int(categid), *date_range])
+        if account_ids:
+            conds.append(f"{alias}.ACCOUNTID IN ({','.join('?' * len(account_ids))})")
+            params.extend(account_ids)
+        if after is not None:
+            conds.append(f"{key} > (?, ?, ?)")
+            params.extend(after)
+        branches.append(f"SELECT * FROM ({select} AND {' AND '.join(conds)} ORDER BY 1, 2, 3 LIMIT ?)")
+        params.append(int(limit))
+    sql = f"""
+    SELECT w.date, w.transid, w.splitid, IFNULL(a.ACCOUNTNAME, ''), IFNULL(p.PAYEENAME, ''),
+           IFNULL(w.notes, ''), w.amount, w.accountid
+    FROM ({' UNION ALL '.join(branches)}) w
+    LEFT JOIN accountlist_v1 a ON a.ACCOUNTID = w.accountid
+    LEFT JOIN payee_v1 p ON p.PAYEEID = w.payeeid
+    ORDER BY w.date, w.transid, w.splitid
+    LIMIT ?
+    """
+    params.append(int(limit))
+    with get_conn() as conn:
+        rows = conn.execute(sql, params).fetchall()
+        rates = rate_table(conn)
+    factor = None
+    if rows and rates.converts([row[-1] for row in rows]):
+        factor = rates.rates([row[-1] for row in rows], date_ordinals([row[0] for row in rows]))
+    if factor is None:
+        return [tuple(row[:-1]) for row in rows]
+    return [(*row[:6], float(row[6] or 0.0) * rate) for row, rate in zip(rows, factor.tolist())]
+
+
+def fetch_payee_actuals(categid, date_range, account_ids=None) -> pd.DataFrame:
+    """Actuals of one category per (month, payee name) in base currency.
+
+    Rows without a payee (e.g. split transfers) get an empty name.
+    """
+    cte, params = _actuals_cte(account_ids, date_range)
+    sql = cte + """
+    SELECT substr(wd.date,1,10) AS day, wd.account, IFNULL(p.PAYEENAME, '') AS payee, SUM(wd.amount) AS amount
+    FROM wd LEFT JOIN payee_v1 p ON p.PAYEEID = wd.payee
+    WHERE wd.categid = ?
+    GROUP BY day, wd.account, payee
+    """
+    params.append(int(categid))
+    with get_conn() as conn:
+        df = pd.read_sql_query(sql, conn, params=params)
+        rates = rate_table(conn)
+    amounts = df["amount"].fillna(0.0).to_numpy(dtype=float)
+    factor = rates.rates(df["account"].to_numpy(dtype=np.int64), date_ordinals(df["day"])) if len(df) else None
+    df = pd.DataFrame(
+        {
+            "month": df["day"].str.slice(0, 7),
+            "payee": df["payee"].fillna("").astype(str).str.strip(),
+            "amount": amounts if factor is None else amounts * factor,
+        }
     )
+    return df.groupby(["month", "payee"], as_index=False)["amount"].sum()
+
+
+def fetch_actuals_for_year(year, account_ids=None):
+    cte, params = _actuals_cte(account_ids)
+    sql = cte + """
     SELECT substr(date,1,7) AS month, categid, SUM(amount) AS amount
     FROM wd WHERE substr(date,1,4) = ? GROUP BY month, categid
     """
     params.append(year)
     with get_conn() as conn:
-        df = pd.read_sql_query(sql, conn, params=params)
+        daily = _converted_daily(conn, account_ids, (f"{int(year)}-01-01", f"{int(year) + 1}-01-01"))
+        if daily is None:
+            df = pd.read_sql_query(sql, conn, params=params)
+    if daily is not None:
+        df = (
+            daily.assign(month=daily["day"].str.slice(0, 7))
+            .groupby(["month", "categid"], as_index=False)["amount"]
+            .sum()
+        )
     return df if not df.empty else pd.DataFrame(columns=["month", "categid", "amount"])
 
 
+def fetch_actuals_for_years(first_year, last_year, account_ids=None):
+    """Actuals for every year in [first_year, last_year] in a single range scan.
+
+    Returns (years, categids, cube) where ``cube[y, m, c]`` is the total of
+    ``categids[c]`` in month ``m + 1`` of ``years[y]``.
+    """
+    first_year, last_year = int(first_year), int(last_year)
+    years = [str(y) for y in range(first_year, last_year + 1)]
+    cte, params = _actuals_cte(account_ids, (f"{first_year}-01-01", f"{last_year + 1}-01-01"))
+    sql = cte + """
+    SELECT CAST(substr(date,1,4) AS INTEGER) AS year, CAST(substr(date,6,2) AS INTEGER) AS month,
+           categid, SUM(amount) AS amount
+    FROM wd GROUP BY year, month, categid
+    """
+    with get_conn() as conn:
+        daily = _converted_daily(conn, account_ids, (f"{first_year}-01-01", f"{last_year + 1}-01-01"))
+        if daily is None:
+            df = pd.read_sql_query(sql, conn, params=params)
+    if daily is not None:
+        df = pd.DataFrame(
+            {
+                "year": pd.to_numeric(daily["day"].str.slice(0, 4), errors="coerce"),
+                "month": pd.to_numeric(daily["day"].str.slice(5, 7), errors="coerce"),
+                "categid": daily["categid"],
+                "amount": daily["amount"],
+            }
+        )
+    df = df[df["month"].between(1, 12) & df["year"].between(first_year, last_year)]
+    categids = np.unique(df["categid"].to_numpy(dtype=np.int64))
+    cube = np.zeros((len(years), 12, len(categids)))
+    if not df.empty:
+        np.add.at(
+            cube,
+            (
+                df["year"].to_numpy(dtype=np.intp) - first_year,
+                df["month"].to_numpy(dtype=np.intp) - 1,
+                np.searchsorted(categids, df["categid"].to_numpy(dtype=np.int64)),
+            ),
+            df["amount"].fillna(0.0).to_numpy(dtype=float),
+        )
+    return years, categids, cube
+
+
 def load_budgets_for_year(year, name_to_id, per_year_entries):
     if year not in per_year_entries:
         return pd.DataFrame(columns=["BUDGETENTRYID", "BUDGETYEARID", "CATEGID", "PERIOD", "AMOUNT"])
@@ -111,39 +300,52 @@ def load_budgets_for_year(year, name_to_id, per_year_entries):
     )
     with get_conn() as conn:
         df = pd.read_sql_query(sql, conn, params=ids)
+    return label_year_budgets(df, year, per_year_entries)
+
+
+def load_all_budgets():
+    with get_conn() as conn:
+        return pd.read_sql_query(
+            "SELECT BUDGETENTRYID,BUDGETYEARID,CATEGID,PERIOD,AMOUNT FROM budgettable_v1", conn
+        )
+
+
+def label_year_budgets(df, year, per_year_entries):
+    """Keep the rows of ``df`` belonging to ``year`` and add BUDGETYEARNAME."""
+    id_to_name = {bid: name for bid, name in per_year_entries.get(year, [])}
+    df = df[df["BUDGETYEARID"].isin(list(id_to_name))].copy()
     if df.empty:
         return pd.DataFrame(columns=["BUDGETENTRYID", "BUDGETYEARID", "CATEGID", "PERIOD", "AMOUNT"])
-    id_to_name = {bid: name for bid, name in per_year_entries[year]}
     df["BUDGETYEARNAME"] = df["BUDGETYEARID"].map(id_to_name)
     return df
 
 
-def upsert_budget_entry(budgetyearid, categid, period, amount):
-    with get_conn() as conn:
-        cur = conn.cursor()
+def _upsert_budget_entry(cur, budgetyearid, categid, period, amount):
+    cur.execute(
+        "SELECT BUDGETENTRYID FROM budgettable_v1 WHERE BUDGETYEARID=? AND CATEGID=?",
+        (budgetyearid, categid),
+    )
+    row = cur.fetchone()
+    if row:
         cur.execute(
-            "SELECT BUDGETENTRYID FROM budgettable_v1 WHERE BUDGETYEARID=? AND CATEGID=?",
-            (budgetyearid, categid),
+            "UPDATE budgettable_v1 SET AMOUNT=?, PERIOD=? WHERE BUDGETENTRYID=?",
+            (float(amount), str(period), row[0]),
         )
-        row = cur.fetchone()
-        if row:
-            cur.execute(
-                "UPDATE budgettable_v1 SET AMOUNT=?, PERIOD=? WHERE BUDGETENTRYID=?",
-                (float(amount), str(period), row[0]),
-            )
-        else:
-            cur.execute(
-                "INSERT INTO budgettable_v1 (BUDGETYEARID,CATEGID,PERIOD,AMOUNT,ACTIVE) VALUES (?,?,?,?,1)",
-                (budgetyearid, categid, str(period), float(amount)),
-            )
-        conn.commit()
+    else:
+        cur.execute(
+            "INSERT INTO budgettable_v1 (BUDGETYEARID,CATEGID,PERIOD,AMOUNT,ACTIVE) VALUES (?,?,?,?,1)",
+            (budgetyearid, categid, str(period), float(amount)),
+        )
+
+
+def upsert_budget_entry(budgetyearid, categid, period, amount):
+    run_write(lambda cur: _upsert_budget_entry(cur, budgetyearid, categid, period, amount))
 
 
 def delete_budget_entry(budgetyearid, categid):
-    with get_conn() as conn:
-        cur = conn.cursor()
-        cur.execute(
+    run_write(
+        lambda cur: cur.execute(
             "DELETE FROM budgettable_v1 WHERE BUDGETYEARID=? AND CATEGID=?",
             (budgetyearid, categid),
         )
-        conn.commit()
+    )
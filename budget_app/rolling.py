@@ -0,0 +1,110 @@
+"""Rolling window of N consecutive months, possibly spanning budget years.
+
+Actuals come from one multi-year aggregate (the transaction store when
+available); budgets are resolved per calendar month by running the budget
+distribution of each BUDGETYEAR_V1 year the window touches.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .distribution import distribute_budgets
+from .repository import fetch_actuals_for_years, load_budgets_for_year
+from .suggest import seasonal_profiles
+
+
+def window_months(start: str, count: int) -> list[str]:
+    """``count`` consecutive "YYYY-MM" names starting at ``start``."""
+    first = int(start[:4]) * 12 + int(start[5:7]) - 1
+    return [f"{idx // 12}-{idx % 12 + 1:02d}" for idx in range(first, first + max(int(count), 1))]
+
+
+def window_entries(months: list[str]) -> list[tuple[int, str]]:
+    """Synthetic (bid, name) entries shaped like ``per_year_entries[year]``.
+
+    Negative ids cannot collide with BUDGETYEAR_V1 ids; the first entry stands
+    in for the year column.
+    """
+    return [(-1, f"{len(months)} mesi")] + [(-(idx + 2), month) for idx, month in enumerate(months)]
+
+
+def window_actuals(months: list[str], account_ids=None, store=None) -> pd.DataFrame:
+    """Actuals frame (month, categid, amount) for the window from a single aggregate."""
+    first_year, last_year = int(months[0][:4]), int(months[-1][:4])
+    if store is not None:
+        years, categids, cube = store.year_cube(first_year, last_year, account_ids)
+    else:
+        years, categids, cube = fetch_actuals_for_years(first_year, last_year, account_ids)
+    year_index = {y: i for i, y in enumerate(years)}
+    names, cids, amounts = [], [], []
+    for month in months:
+        values = cube[year_index[month[:4]], int(month[5:7]) - 1]
+        nonzero = np.nonzero(values)[0]
+        names.extend([month] * len(nonzero))
+        cids.extend(categids[nonzero].tolist())
+        amounts.extend(values[nonzero].tolist())
+    return pd.DataFrame({"month": names, "categid": cids, "amount": amounts}, columns=["month", "categid", "amount"])
+
+
+def window_budgets(months: list[str], name_to_id, per_year_entries, profiles=None) -> dict[tuple[int, str], float]:
+    """Monthly budget per (CATEGID, month) using each budget year's own distribution.
+
+    ``profiles`` maps a year to the CATEGID -> month weights of its seasonal categories.
+    """
+    budgets: dict[tuple[int, str], float] = {}
+    for year in sorted({m[:4] for m in months}):
+        if year not in per_year_entries:
+            continue
+        df_bud = load_budgets_for_year(year, name_to_id, per_year_entries)
+        if df_bud.empty:
+            continue
+        budget_map = {
+            (int(cid), name): (float(amount or 0), period or "Monthly")
+            for cid, name, amount, period in zip(
+                df_bud["CATEGID"], df_bud["BUDGETYEARNAME"], df_bud["AMOUNT"], df_bud["PERIOD"]
+            )
+        }
+        # Full calendar year, so a yearly amount spreads over months with no BUDGETYEAR_V1 row
+        year_months = [f"{year}-{m:02d}" for m in range(1, 13)]
+        in_window = [int(m[5:7]) - 1 for m in months if m[:4] == year]
+        cids = sorted({cid for cid, _ in budget_map})
+        year_entries = [budget_map.get((cid, year), (np.nan, "")) for cid in cids]
+        overrides = np.array(
+            [[budget_map.get((cid, m), (np.nan,))[0] for m in year_months] for cid in cids], dtype=float
+        ).reshape(len(cids), 12)
+        year_profiles = (profiles or {}).get(year) or {}
+        weights = None
+        if year_profiles:
+            weights = np.array([year_profiles.get(cid, np.zeros(12)) for cid in cids]).reshape(len(cids), 12)
+        monthly, _, _, _ = distribute_budgets(
+            [amount for amount, _ in year_entries], [period for _, period in year_entries], overrides, weights
+        )
+        rows, cols = np.nonzero(monthly[:, in_window])
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            budgets[(cids[row], year_months[in_window[col]])] = float(monthly[row, in_window[col]])
+    return budgets
+
+
+def window_frames(months, entries, account_ids, name_to_id, per_year_entries, store=None, seasonal_categories=None):
+    """(df_actual, df_bud) for the grid, with budgets as explicit monthly rows on ``entries`` ids."""
+    df_actual = window_actuals(months, account_ids, store)
+    month_to_bid = {name: bid for bid, name in entries[1:]}
+    profiles = {}
+    if seasonal_categories:
+        seasonal = {int(cid) for cid in seasonal_categories}
+        for year in sorted({m[:4] for m in months}):
+            profiles[year] = {
+                cid: w for cid, w in seasonal_profiles(year, account_ids, store).items() if cid in seasonal
+            }
+    budgets = window_budgets(months, name_to_id, per_year_entries, profiles)
+    df_bud = pd.DataFrame(
+        {
+            "BUDGETENTRYID": np.arange(len(budgets)),
+            "BUDGETYEARID": [month_to_bid[month] for _, month in budgets],
+            "CATEGID": [cid for cid, _ in budgets],
+            "PERIOD": "Monthly",
+            "AMOUNT": list(budgets.values()),
+        },
+        columns=["BUDGETENTRYID", "BUDGETYEARID", "CATEGID", "PERIOD", "AMOUNT"],
+    )
+    return df_actual, df_bud
@@ -0,0 +1,270 @@
+"""Projection of scheduled bills and deposits (BILLSDEPOSITS_V1).
+
+Each schedule is expanded from NEXTOCCURRENCEDATE with NumPy, one pass per
+recurrence family (one-shot, day-stepped, month-stepped), and the amounts
+are summed per (month, category) with the sign rules of the actuals query.
+Amounts are converted to the base currency at each occurrence date. The
+loaded schedules and every projection are cached until the table or the
+currency fingerprint changes.
+"""
+
+import threading
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from .currency import RateTable, rate_table
+from .db import get_conn
+from .store import ordinal_to_month_index, month_index
+
+# REPEATS % 100 (the hundreds carry MMEX's auto-execute flags)
+REPEAT_NONE = 0
+REPEAT_WEEKLY = 1
+REPEAT_BIWEEKLY = 2
+REPEAT_MONTHLY = 3
+REPEAT_BIMONTHLY = 4
+REPEAT_QUARTERLY = 5
+REPEAT_HALFYEARLY = 6
+REPEAT_YEARLY = 7
+REPEAT_FOURMONTHLY = 8
+REPEAT_FOURWEEKLY = 9
+REPEAT_DAILY = 10
+REPEAT_IN_X_DAYS = 11
+REPEAT_IN_X_MONTHS = 12
+REPEAT_EVERY_X_DAYS = 13
+REPEAT_EVERY_X_MONTHS = 14
+REPEAT_MONTHLY_LAST_DAY = 15
+REPEAT_MONTHLY_LAST_BUSINESS_DAY = 16
+
+_ONCE = (REPEAT_NONE, REPEAT_IN_X_DAYS, REPEAT_IN_X_MONTHS)
+_DAY_STEPS = {REPEAT_WEEKLY: 7, REPEAT_BIWEEKLY: 14, REPEAT_FOURWEEKLY: 28, REPEAT_DAILY: 1}
+_MONTH_STEPS = {
+    REPEAT_MONTHLY: 1,
+    REPEAT_BIMONTHLY: 2,
+    REPEAT_QUARTERLY: 3,
+    REPEAT_HALFYEARLY: 6,
+    REPEAT_YEARLY: 12,
+    REPEAT_FOURMONTHLY: 4,
+    REPEAT_MONTHLY_LAST_DAY: 1,
+    REPEAT_MONTHLY_LAST_BUSINESS_DAY: 1,
+}
+# For these NUMOCCURRENCES holds the interval, not a remaining count
+_INTERVAL_KINDS = (REPEAT_IN_X_DAYS, REPEAT_IN_X_MONTHS, REPEAT_EVERY_X_DAYS, REPEAT_EVERY_X_MONTHS)
+
+SCHEDULE_DTYPE = np.dtype(
+    [
+        # Like BDID, MMEX 1.8+ account and category ids are timestamps
+        ("bdid", np.int64),
+        ("account", np.int64),
+        ("categ", np.int64),
+        ("amount", np.int64),  # signed cents
+        ("date", np.int32),  # next occurrence, day ordinal
+        ("kind", np.int16),
+        ("remaining", np.int32),  # -1 = unlimited
+        ("interval", np.int32),
+    ]
+)
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+_SCHEDULES_SQL = """
+SELECT b.BDID AS bdid, b.ACCOUNTID AS account, b.TOACCOUNTID AS toaccount, b.TRANSCODE AS transcode,
+       b.STATUS AS status, COALESCE(b.NEXTOCCURRENCEDATE, b.TRANSDATE) AS nextdate,
+       b.REPEATS AS repeats, b.NUMOCCURRENCES AS numoccurrences,
+       COALESCE(s.CATEGID, b.CATEGID) AS categ, COALESCE(s.SPLITTRANSAMOUNT, b.TRANSAMOUNT) AS amount,
+       s.SPLITTRANSID IS NOT NULL AS is_split
+FROM billsdeposits_v1 b
+LEFT JOIN budgetsplittransactions_v1 s ON s.TRANSID = b.BDID
+"""
+
+_FINGERPRINT_SQL = """
+SELECT (SELECT COUNT(*) || ':' || TOTAL(BDID) || ':' || TOTAL(TRANSAMOUNT) || ':' || TOTAL(REPEATS) || ':'
+               || TOTAL(NUMOCCURRENCES) || ':' || TOTAL(CATEGID) || ':' || TOTAL(ACCOUNTID) || ':'
+               || TOTAL(julianday(substr(NEXTOCCURRENCEDATE, 1, 10))) || ':' || group_concat(STATUS, '')
+        FROM billsdeposits_v1),
+       (SELECT COUNT(*) || ':' || TOTAL(SPLITTRANSAMOUNT) || ':' || TOTAL(CATEGID) FROM budgetsplittransactions_v1)
+"""
+
+_CACHE_LOCK = threading.Lock()
+_cache: dict = {"fingerprint": None, "schedules": None, "rates": None, "projections": {}}
+
+
+def _to_schedules(df: pd.DataFrame) -> np.ndarray:
+    if df.empty:
+        return np.zeros(0, dtype=SCHEDULE_DTYPE)
+    transcode = df["transcode"].astype(str).to_numpy()
+    status = df["status"].fillna("").astype(str).to_numpy()
+    is_split = df["is_split"].fillna(0).to_numpy(dtype=bool)
+    categ = pd.to_numeric(df["categ"], errors="coerce").fillna(-1).to_numpy(dtype=np.int64)
+    # Same rows the actuals count: no voids, plain transfers only through their splits
+    keep = (status != "V") & (is_split | ((categ != -1) & (transcode != "Transfer")))
+    dates = pd.to_datetime(df["nextdate"].astype(str).str.slice(0, 10), format="%Y-%m-%d", errors="coerce")
+    keep &= dates.notna().to_numpy()
+    df = df[keep]
+    transcode, categ, dates = transcode[keep], categ[keep], dates[keep]
+    account = df["account"].to_numpy(dtype=np.int64)
+    toaccount = pd.to_numeric(df["toaccount"], errors="coerce").fillna(-1).to_numpy(dtype=np.int64)
+    negative = (transcode == "Withdrawal") | ((transcode == "Transfer") & (toaccount != account))
+    cents = np.rint(pd.to_numeric(df["amount"], errors="coerce").fillna(0.0).to_numpy() * 100).astype(np.int64)
+    out = np.zeros(len(df), dtype=SCHEDULE_DTYPE)
+    out["bdid"] = df["bdid"].to_numpy(dtype=np.int64)
+    out["account"] = account
+    out["categ"] = categ
+    out["amount"] = np.where(negative, -cents, cents)
+    out["date"] = dates.to_numpy().astype("datetime64[D]").astype(np.int64) + _EPOCH_ORDINAL
+    out["kind"], out["remaining"], out["interval"] = recurrence(df["repeats"], df["numoccurrences"])
+    return out
+
+
+def recurrence(repeats, numoccurrences) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(kind, remaining, interval) columns of SCHEDULE_DTYPE from REPEATS / NUMOCCURRENCES."""
+    repeats = pd.to_numeric(pd.Series(repeats), errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+    numocc = pd.to_numeric(pd.Series(numoccurrences), errors="coerce").fillna(-1).to_numpy(dtype=np.int64)
+    kind = repeats % 100
+    interval_kind = np.isin(kind, _INTERVAL_KINDS)
+    remaining = np.where(interval_kind | (numocc <= 0), -1, numocc)
+    return kind, remaining, np.where(interval_kind, np.maximum(numocc, 1), 1)
+
+
+def _month_start(months: np.ndarray) -> np.ndarray:
+    """Day ordinal of the first day of each month index (months since 1970-01)."""
+    return months.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64) + _EPOCH_ORDINAL
+
+
+def expand_occurrences(schedules: np.ndarray, start: int, end: int) -> tuple[np.ndarray, np.ndarray]:
+    """(schedule row, day ordinal) of every occurrence falling in [start, end)."""
+    kinds = schedules["kind"].astype(np.int64)
+    first = schedules["date"].astype(np.int64)
+    remaining = schedules["remaining"].astype(np.int64)
+    rows_out: list[np.ndarray] = []
+    dates_out: list[np.ndarray] = []
+
+    def collect(idx, n, dates):
+        valid = (dates >= start) & (dates < end)
+        limit = remaining[idx][:, None]
+        valid &= (limit < 0) | (n < limit)
+        rows_out.append(np.broadcast_to(idx[:, None], dates.shape)[valid])
+        dates_out.append(dates[valid])
+
+    idx = np.nonzero(np.isin(kinds, _ONCE))[0]
+    if idx.size:
+        collect(idx, np.zeros((idx.size, 1), dtype=np.int64), first[idx][:, None])
+
+    day_step = np.zeros(len(schedules), dtype=np.int64)
+    for kind, step in _DAY_STEPS.items():
+        day_step[kinds == kind] = step
+    day_step[kinds == REPEAT_EVERY_X_DAYS] = schedules["interval"][kinds == REPEAT_EVERY_X_DAYS]
+    idx = np.nonzero(day_step > 0)[0]
+    if idx.size:
+        step = day_step[idx]
+        # Skip straight to the first occurrence that can reach the window
+        n0 = np.maximum(0, -(-(start - first[idx]) // step))
+        n_end = np.maximum(n0, -(-(end - first[idx]) // step))
+        span = int((n_end - n0).max())
+        if span > 0:
+            n = n0[:, None] + np.arange(span)
+            collect(idx, n, first[idx][:, None] + step[:, None] * n)
+
+    month_step = np.zeros(len(schedules), dtype=np.int64)
+    for kind, step in _MONTH_STEPS.items():
+        month_step[kinds == kind] = step
+    month_step[kinds == REPEAT_EVERY_X_MONTHS] = schedules["interval"][kinds == REPEAT_EVERY_X_MONTHS]
+    idx = np.nonzero(month_step > 0)[0]
+    if idx.size:
+        step = month_step[idx]
+        m0 = ordinal_to_month_index(first[idx])
+        day0 = first[idx] - _month_start(m0) + 1
+        start_m = int(ordinal_to_month_index(np.array([start]))[0])
+        end_m = int(ordinal_to_month_index(np.array([end - 1]))[0]) + 1
+        n0 = np.maximum(0, -(-(start_m - m0) // step))
+        n_end = np.maximum(n0, -(-(end_m - m0) // step))
+        span = int((n_end - n0).max())
+        if span > 0:
+            n = n0[:, None] + np.arange(span)
+            months = m0[:, None] + step[:, None] * n
+            month_first = _month_start(months)
+            days_in_month = _month_start(months + 1) - month_first
+            day = np.minimum(day0[:, None], days_in_month)
+            kind = kinds[idx][:, None]
+            day = np.where(kind == REPEAT_MONTHLY_LAST_DAY, days_in_month, day)
+            last_day = month_first + days_in_month - 1
+            weekday = (last_day + 6) % 7  # Monday = 0
+            business = last_day - np.where(weekday == 5, 1, np.where(weekday == 6, 2, 0))
+            dates = np.where(kind == REPEAT_MONTHLY_LAST_BUSINESS_DAY, business, month_first + day - 1)
+            collect(idx, n, dates)
+
+    if not rows_out:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.int64)
+    return np.concatenate(rows_out), np.concatenate(dates_out)
+
+
+def _schedules() -> tuple[str, np.ndarray, RateTable]:
+    with get_conn() as conn:
+        rates = rate_table(conn)
+        fingerprint = "|".join(str(part) for part in conn.execute(_FINGERPRINT_SQL).fetchone())
+        fingerprint += "|" + rates.fingerprint
+        with _CACHE_LOCK:
+            if _cache["fingerprint"] == fingerprint:
+                return fingerprint, _cache["schedules"], _cache["rates"]
+        schedules = _to_schedules(pd.read_sql_query(_SCHEDULES_SQL, conn))
+    with _CACHE_LOCK:
+        _cache.update(fingerprint=fingerprint, schedules=schedules, rates=rates, projections={})
+    return fingerprint, schedules, rates
+
+
+def schedules_fingerprint() -> str:
+    """Token that changes whenever BILLSDEPOSITS_V1, its splits or the currency rates change."""
+    return _schedules()[0]
+
+
+def projected_actuals(first_year, last_year=None, account_ids=None) -> pd.DataFrame:
+    """Projected (month, categid, amount) for the years [first_year, last_year].
+
+    Same shape as ``fetch_actuals_for_year`` so the grid can map it onto its
+    month columns.
+    """
+    first_year = int(first_year)
+    last_year = int(last_year) if last_year is not None else first_year
+    accounts = tuple(sorted(int(a) for a in account_ids)) if account_ids else ()
+    fingerprint, schedules, rates = _schedules()
+    key = (first_year, last_year, accounts)
+    with _CACHE_LOCK:
+        cached = _cache["projections"].get(key) if _cache["fingerprint"] == fingerprint else None
+    if cached is not None:
+        return cached.copy()
+
+    if accounts:
+        schedules = schedules[np.isin(schedules["account"], accounts)]
+    start = date(first_year, 1, 1).toordinal()
+    end = date(last_year + 1, 1, 1).toordinal()
+    rows, dates = expand_occurrences(schedules, start, end)
+    if rows.size:
+        categ_ids = np.unique(schedules["categ"])
+        cat_idx = np.searchsorted(categ_ids, schedules["categ"][rows])
+        period = ordinal_to_month_index(dates) - month_index(first_year, 1)
+        months_total = (last_year - first_year + 1) * 12
+        amounts = schedules["amount"][rows]
+        factor = rates.rates(schedules["account"][rows], dates)
+        sums = np.bincount(
+            cat_idx * months_total + period,
+            weights=amounts if factor is None else amounts * factor,
+            minlength=len(categ_ids) * months_total,
+        ).reshape(len(categ_ids), months_total) / 100.0
+        cat_pos, month_pos = np.nonzero(sums)
+        names = np.array(
+            [f"{first_year + m // 12}-{m % 12 + 1:02d}" for m in range(months_total)], dtype=object
+        )
+        frame = pd.DataFrame(
+            {
+                "month": names[month_pos],
+                "categid": categ_ids[cat_pos].astype(np.int64),
+                "amount": sums[cat_pos, month_pos],
+            }
+        )
+    else:
+        frame = pd.DataFrame(columns=["month", "categid", "amount"])
+    with _CACHE_LOCK:
+        if _cache["fingerprint"] == fingerprint:
+            _cache["projections"][key] = frame
+    return frame.copy()
@@ -0,0 +1,231 @@
+"""Full-text search over transactions: notes, payee, transaction number, tags.
+
+The index is an FTS5 table in a sidecar SQLite file under ``budget_cache/``
+(never inside the MMEX database). One document per counted transaction row,
+the same rows the actuals use (split rows with their parent's payee and
+number), with its category and date so a hit can point at a grid cell.
+
+``SearchIndex.sync`` follows ``TransactionStore.refresh``: only the
+transactions whose LASTUPDATEDTIME changed (or that appeared or went away)
+are re-indexed; a change in payees, tags or split rows, which does not touch
+LASTUPDATEDTIME, rebuilds everything. Queries are prefix matches on every
+word, answered from the FTS5 prefix indexes.
+"""
+
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from .cache import cache_file
+from .db import get_conn
+
+INDEX_VERSION = 1
+DEFAULT_LIMIT = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS versions (transid INTEGER PRIMARY KEY, updated TEXT);
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    transid INTEGER, splitid INTEGER, categid INTEGER, accountid INTEGER, date TEXT, amount REAL,
+    notes TEXT, payee TEXT, number TEXT, tags TEXT
+);
+CREATE INDEX IF NOT EXISTS docs_transid ON docs (transid);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+    notes, payee, number, tags,
+    content='docs', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS docs_ai AFTER INSERT ON docs BEGIN
+    INSERT INTO docs_fts (rowid, notes, payee, number, tags)
+    VALUES (new.id, new.notes, new.payee, new.number, new.tags);
+END;
+CREATE TRIGGER IF NOT EXISTS docs_ad AFTER DELETE ON docs BEGIN
+    INSERT INTO docs_fts (docs_fts, rowid, notes, payee, number, tags)
+    VALUES ('delete', old.id, old.notes, old.payee, old.number, old.tags);
+END;
+"""
+
+# Tags of the transaction and, for split rows, of the split itself
+_DOCS_SQL = """
+WITH tags AS (
+    SELECT tl.REFTYPE AS reftype, tl.REFID AS refid, group_concat(t.TAGNAME, ' ') AS names
+    FROM taglink_v1 tl JOIN tag_v1 t ON t.TAGID = tl.TAGID
+    GROUP BY tl.REFTYPE, tl.REFID
+)
+SELECT t1.TRANSID, t2.SPLITTRANSID, t2.CATEGID, t1.ACCOUNTID, substr(t1.TRANSDATE, 1, 10),
+       CASE WHEN t1.TRANSCODE = 'Withdrawal' THEN -1 * t2.SPLITTRANSAMOUNT
+            WHEN t1.TRANSCODE = 'Transfer' AND t1.TOACCOUNTID <> t1.ACCOUNTID THEN -1 * t2.SPLITTRANSAMOUNT
+            ELSE t2.SPLITTRANSAMOUNT END,
+       trim(IFNULL(t1.NOTES, '') || ' ' || IFNULL(t2.NOTES, '')), IFNULL(p.PAYEENAME, ''),
+       IFNULL(t1.TRANSACTIONNUMBER, ''), trim(IFNULL(tt.names, '') || ' ' || IFNULL(ts.names, ''))
+FROM splittransactions_v1 t2
+JOIN checkingaccount_v1 t1 ON t1.TRANSID = t2.TRANSID
+LEFT JOIN payee_v1 p ON p.PAYEEID = t1.PAYEEID
+LEFT JOIN tags tt ON tt.reftype = 'Transaction' AND tt.refid = t1.TRANSID
+LEFT JOIN tags ts ON ts.reftype = 'TransactionSplit' AND ts.refid = t2.SPLITTRANSID
+WHERE IFNULL(t1.STATUS, '') <> 'V'{split_where}
+UNION ALL
+SELECT ca.TRANSID, 0, ca.CATEGID, ca.ACCOUNTID, substr(ca.TRANSDATE, 1, 10),
+       CASE WHEN ca.TRANSCODE = 'Withdrawal' THEN -1 * ca.TRANSAMOUNT ELSE ca.TRANSAMOUNT END,
+       IFNULL(ca.NOTES, ''), IFNULL(p.PAYEENAME, ''), IFNULL(ca.TRANSACTIONNUMBER, ''), IFNULL(tt.names, '')
+FROM checkingaccount_v1 ca
+LEFT JOIN payee_v1 p ON p.PAYEEID = ca.PAYEEID
+LEFT JOIN tags tt ON tt.reftype = 'Transaction' AND tt.refid = ca.TRANSID
+WHERE ca.CATEGID <> -1 AND ca.TRANSCODE <> 'Transfer' AND IFNULL(ca.STATUS, '') <> 'V'{plain_where}
+"""
+
+_FINGERPRINT_SQL = """
+SELECT (SELECT COUNT(*) || ':' || IFNULL(SUM(length(PAYEENAME)), 0) || ':' || IFNULL(MAX(PAYEEID), 0) FROM payee_v1),
+       (SELECT COUNT(*) || ':' || IFNULL(SUM(length(TAGNAME)), 0) || ':' || IFNULL(MAX(TAGID), 0) FROM tag_v1),
+       (SELECT COUNT(*) || ':' || IFNULL(SUM(TAGLINKID + TAGID + REFID), 0) FROM taglink_v1),
+       (SELECT COUNT(*) || ':' || IFNULL(SUM(SPLITTRANSID), 0) || ':' || IFNULL(SUM(SPLITTRANSAMOUNT), 0)
+          || ':' || IFNULL(SUM(length(NOTES)), 0) FROM splittransactions_v1)
+"""
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class SearchHit:
+    transid: int
+    splitid: int
+    categid: int
+    date: str
+    amount: float
+    payee: str
+    notes: str
+    number: str
+    tags: str
+
+    @property
+    def month(self) -> str:
+        return self.date[:7]
+
+
+def index_path(db_path: Path) -> Path:
+    return cache_file(db_path, ".search.sqlite")
+
+
+def match_expression(text: str) -> str:
+    """FTS5 query matching every word of ``text`` as a prefix; "" when there is none."""
+    return " ".join(f'"{word}"*' for word in _WORD.findall(text or ""))
+
+
+class SearchIndex:
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.path = index_path(self.db_path)
+        self._sync_lock = threading.Lock()
+        self.ready = self.path.exists()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def sync(self) -> int:
+        """Bring the index up to date with the MMEX database; returns the re-indexed transactions.
+
+        Meant to run off the GUI thread; concurrent calls queue up.
+        """
+        with self._sync_lock:
+            with get_conn() as src:
+                versions = {
+                    int(tid): str(ts)
+                    for tid, ts in src.execute(
+                        "SELECT TRANSID, COALESCE(LASTUPDATEDTIME, '') FROM checkingaccount_v1"
+                    ).fetchall()
+                }
+                fingerprint = "|".join(str(part) for part in src.execute(_FINGERPRINT_SQL).fetchone())
+                conn = self._connect()
+                try:
+                    conn.executescript(_SCHEMA)
+                    info = dict(conn.execute("SELECT key, value FROM info").fetchall())
+                    rebuild = info.get("version") != str(INDEX_VERSION) or info.get("fingerprint") != fingerprint
+                    if rebuild:
+                        changed, deleted = None, []
+                    else:
+                        old = dict(conn.execute("SELECT transid, updated FROM versions").fetchall())
+                        changed = [tid for tid, ts in versions.items() if old.get(tid) != ts]
+                        deleted = [tid for tid in old if tid not in versions]
+                        if not changed and not deleted:
+                            self.ready = True
+                            return 0
+                    docs = self._read_docs(src, changed)
+                    if rebuild:
+                        conn.executescript(
+                            "DROP TABLE IF EXISTS docs_fts; DROP TABLE IF EXISTS docs; DROP TABLE IF EXISTS versions;"
+                            + _SCHEMA
+                        )
+                    with conn:
+                        if not rebuild:
+                            stale = changed + deleted
+                            for start in range(0, len(stale), 500):
+                                chunk = stale[start : start + 500]
+                                marks = ",".join("?" * len(chunk))
+                                conn.execute(f"DELETE FROM docs WHERE transid IN ({marks})", chunk)
+                                conn.execute(f"DELETE FROM versions WHERE transid IN ({marks})", chunk)
+                        conn.executemany(
+                            "INSERT INTO docs (transid, splitid, categid, accountid, date, amount, notes, payee, number, tags) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            docs,
+                        )
+                        written = versions if rebuild else {tid: versions[tid] for tid in changed}
+                        conn.executemany("INSERT INTO versions (transid, updated) VALUES (?, ?)", written.items())
+                        conn.executemany(
+                            "INSERT OR REPLACE INTO info (key, value) VALUES (?, ?)",
+                            [("version", str(INDEX_VERSION)), ("fingerprint", fingerprint), ("db", str(self.db_path))],
+                        )
+                finally:
+                    conn.close()
+            self.ready = True
+            return len(versions) if rebuild else len(changed) + len(deleted)
+
+    @staticmethod
+    def _read_docs(src, transids: list[int] | None) -> list[tuple]:
+        if transids is None:
+            return src.execute(_DOCS_SQL.format(split_where="", plain_where="")).fetchall()
+        docs: list[tuple] = []
+        for start in range(0, len(transids), 500):
+            chunk = transids[start : start + 500]
+            marks = ",".join("?" * len(chunk))
+            sql = _DOCS_SQL.format(
+                split_where=f" AND t1.TRANSID IN ({marks})", plain_where=f" AND ca.TRANSID IN ({marks})"
+            )
+            docs.extend(src.execute(sql, chunk + chunk).fetchall())
+        return docs
+
+    def search(self, text: str, account_ids=None, limit: int = DEFAULT_LIMIT) -> list[SearchHit]:
+        """Most recent transactions matching every word of ``text`` as a prefix."""
+        expression = match_expression(text)
+        if not expression or not self.path.exists():
+            return []
+        account_clause = ""
+        params: list = [expression]
+        if account_ids:
+            account_clause = f" AND d.accountid IN ({','.join('?' * len(account_ids))})"
+            params.extend(int(a) for a in account_ids)
+        params.append(int(limit))
+        conn = sqlite3.connect(self.path)
+        try:
+            rows = conn.execute(
+                f"""
+                SELECT d.transid, d.splitid, d.categid, d.date, d.amount, d.payee, d.notes, d.number, d.tags
+                FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid
+                WHERE docs_fts MATCH ?{account_clause}
+                ORDER BY d.date DESC, d.transid DESC
+                LIMIT ?
+                """,
+                params,
+            ).fetchall()
+        except sqlite3.OperationalError:
+            # Index not built yet
+            return []
+        finally:
+            conn.close()
+        return [SearchHit(*row) for row in rows]
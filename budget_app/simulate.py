@@ -0,0 +1,124 @@
+"""Monte Carlo year-end risk per category.
+
+Each trial rebuilds the rest of the year month by month, drawing for every
+remaining month one of the prior years and one month of its seasonal
+neighbourhood (the whole month across all categories, so the overall total
+keeps their correlation; the neighbours keep a single year of history from
+collapsing to one outcome). The draws are scaled by this year's pace and
+combined with the scheduled transactions exactly like the point forecast in
+``forecast``.
+
+Trials run in fixed-size chunks, each seeded from its own
+``SeedSequence.spawn`` child, so the result for a given seed does not
+depend on how many worker processes share the chunks.
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+
+from .forecast import HISTORY_YEARS, ForecastInputs, combine_remainder, forecast_inputs
+
+DEFAULT_TRIALS = 20000
+DEFAULT_SEED = 20240101
+CHUNK_TRIALS = 2500
+PERCENTILES = (10, 50, 90)
+# A draw for month m may come from months m - 1 .. m + 1 of the drawn year
+SEASON_WINDOW = 1
+# Below this, starting worker processes costs more than the trials themselves
+POOL_MIN_TRIALS = 200000
+
+
+@dataclass
+class SimulationResult:
+    year: str
+    trials: int
+    seed: int
+    workers: int
+    seconds: float
+    categids: np.ndarray
+    percentiles: np.ndarray  # category x (P10, P50, P90)
+    overall: np.ndarray  # (P10, P50, P90) of the summed categories
+
+    @property
+    def trials_per_second(self) -> float:
+        return self.trials / self.seconds if self.seconds > 0 else float("inf")
+
+
+def _simulate_chunk(inputs: ForecastInputs, trials: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """Year-end totals (trials x category) for one chunk."""
+    remaining = np.nonzero(inputs.done < 1.0)[0]
+    n_years = len(inputs.history)
+    if not n_years or not len(remaining):
+        seasonal = np.zeros((trials, len(inputs.categids)))
+    else:
+        rng = np.random.default_rng(seed)
+        drawn = rng.integers(0, n_years, size=(trials, len(remaining)))
+        shift = rng.integers(-SEASON_WINDOW, SEASON_WINDOW + 1, size=(trials, len(remaining)))
+        drawn_months = np.clip(remaining[None, :] + shift, 0, 11)
+        # trials x remaining months x category
+        months = inputs.history[drawn, drawn_months]
+        weights = 1.0 - inputs.done[remaining]
+        seasonal = np.einsum("tmc,m->tc", months, weights) * inputs.pace
+    return inputs.actual + combine_remainder(inputs.scheduled, seasonal)
+
+
+def run_simulation(
+    inputs: ForecastInputs,
+    trials: int = DEFAULT_TRIALS,
+    seed: int = DEFAULT_SEED,
+    workers: int | None = None,
+    year: str = "",
+) -> SimulationResult:
+    """Bootstrap ``trials`` year-end outcomes from ``inputs``, chunks spread over processes.
+
+    ``workers=None`` uses one process per core from ``POOL_MIN_TRIALS``
+    trials up and stays in-process below.
+    """
+    trials = max(int(trials), 1)
+    sizes = [min(CHUNK_TRIALS, trials - start) for start in range(0, trials, CHUNK_TRIALS)]
+    seeds = np.random.SeedSequence(int(seed)).spawn(len(sizes))
+    if workers is None:
+        workers = (os.cpu_count() or 1) if trials >= POOL_MIN_TRIALS else 1
+    workers = max(1, min(workers, len(sizes)))
+    started = time.perf_counter()
+    if workers == 1:
+        chunks = [_simulate_chunk(inputs, size, child) for size, child in zip(sizes, seeds)]
+    else:
+        # spawn: the GUI starts this from a worker thread, and forking a threaded Qt process is unsafe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            chunks = list(pool.map(_simulate_chunk, [inputs] * len(sizes), sizes, seeds))
+    totals = np.concatenate(chunks)
+    percentiles = np.percentile(totals, PERCENTILES, axis=0).T
+    overall = np.percentile(totals.sum(axis=1), PERCENTILES)
+    return SimulationResult(
+        year=str(year),
+        trials=trials,
+        seed=int(seed),
+        workers=workers,
+        seconds=time.perf_counter() - started,
+        categids=inputs.categids,
+        percentiles=percentiles,
+        overall=overall,
+    )
+
+
+def simulate_year_end(
+    year,
+    account_ids=None,
+    store=None,
+    trials: int = DEFAULT_TRIALS,
+    seed: int = DEFAULT_SEED,
+    workers: int | None = None,
+    as_of: date | None = None,
+    history_years: int = HISTORY_YEARS,
+) -> SimulationResult:
+    """P10/P50/P90 year-end totals per category and overall for ``year``."""
+    inputs = forecast_inputs(int(year), account_ids, store, as_of or date.today(), history_years)
+    return run_simulation(inputs, trials, seed, workers, str(year))
@@ -0,0 +1,317 @@
+"""Columnar in-memory copy of CHECKINGACCOUNT_V1 / SPLITTRANSACTIONS_V1.
+
+Rows are loaded once into a NumPy structured array with the sign rules of
+``repository.fetch_actuals_for_year`` already applied; every
+(year, account set, granularity) aggregation is then a masked
+``np.bincount`` instead of a new GROUP BY. ``refresh()`` re-reads only
+the transactions whose LASTUPDATEDTIME changed.
+
+Amounts stay in account currency; aggregations weigh them with the
+per-row base-currency rates of ``currency.RateTable``.
+"""
+
+import itertools
+import threading
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from .currency import RateTable, rate_table
+from .db import get_conn
+from .periods import period_bins
+
+TRANSACTION_DTYPE = np.dtype(
+    [
+        # MMEX 1.8+ ids (transactions, splits, categories, accounts) are
+        # timestamps that do not fit in 32 bits
+        ("transid", np.int64),
+        ("splitid", np.int64),  # SPLITTRANSID, -1 for plain transactions
+        ("date", np.int32),  # proleptic Gregorian ordinal (date.toordinal())
+        ("amount", np.int64),  # signed cents
+        ("categ", np.int64),
+        ("account", np.int64),
+        ("status", "S1"),
+        ("flags", np.uint8),
+    ]
+)
+
+FLAG_VOID = 1
+FLAG_TRANSFER = 2
+FLAG_SPLIT = 4
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Process-wide, so a generation never repeats across stores
+_GENERATIONS = itertools.count(1)
+
+_ROWS_SQL = """
+SELECT t1.TRANSID AS transid, t2.SPLITTRANSID AS splitid, t1.TRANSDATE AS transdate,
+       t1.TRANSCODE AS transcode, t1.STATUS AS status, t1.ACCOUNTID AS account,
+       t1.TOACCOUNTID AS toaccount, t2.CATEGID AS categ, t2.SPLITTRANSAMOUNT AS amount
+FROM splittransactions_v1 t2
+JOIN checkingaccount_v1 t1 ON t1.TRANSID = t2.TRANSID
+{split_where}
+UNION ALL
+SELECT ca.TRANSID, -1, ca.TRANSDATE, ca.TRANSCODE, ca.STATUS, ca.ACCOUNTID,
+       ca.TOACCOUNTID, ca.CATEGID, ca.TRANSAMOUNT
+FROM checkingaccount_v1 ca
+WHERE ca.CATEGID <> -1{plain_where}
+"""
+
+
+def ordinal_to_month_index(ordinals: np.ndarray) -> np.ndarray:
+    """Months since 1970-01 for an array of day ordinals."""
+    days = (ordinals.astype(np.int64) - _EPOCH_ORDINAL).astype("datetime64[D]")
+    return days.astype("datetime64[M]").astype(np.int64)
+
+
+def month_index(year: int, month: int) -> int:
+    return (int(year) - 1970) * 12 + int(month) - 1
+
+
+def _rows_to_array(df: pd.DataFrame) -> np.ndarray:
+    dates = pd.to_datetime(df["transdate"].astype(str).str.slice(0, 10), format="%Y-%m-%d", errors="coerce")
+    valid = dates.notna().to_numpy()
+    df = df[valid]
+    dates = dates[valid]
+    out = np.zeros(len(df), dtype=TRANSACTION_DTYPE)
+    if not len(df):
+        return out
+    transcode = df["transcode"].astype(str).to_numpy()
+    status = df["status"].fillna("").astype(str).to_numpy()
+    account = df["account"].to_numpy(dtype=np.int64)
+    toaccount = pd.to_numeric(df["toaccount"], errors="coerce").fillna(-1).to_numpy(dtype=np.int64)
+    split = df["splitid"].to_numpy(dtype=np.int64) >= 0
+    is_transfer = transcode == "Transfer"
+    negative = (transcode == "Withdrawal") | (is_transfer & (toaccount != account))
+    cents = np.rint(pd.to_numeric(df["amount"], errors="coerce").fillna(0.0).to_numpy() * 100).astype(np.int64)
+
+    out["transid"] = df["transid"].to_numpy(dtype=np.int64)
+    out["splitid"] = df["splitid"].to_numpy(dtype=np.int64)
+    out["date"] = dates.to_numpy().astype("datetime64[D]").astype(np.int64) + _EPOCH_ORDINAL
+    out["amount"] = np.where(negative, -cents, cents)
+    out["categ"] = pd.to_numeric(df["categ"], errors="coerce").fillna(-1).to_numpy(dtype=np.int64)
+    out["account"] = account
+    out["status"] = [code[:1].encode("ascii", "replace") for code in status]
+    out["flags"] = (
+        np.where(status == "V", FLAG_VOID, 0)
+        | np.where(is_transfer, FLAG_TRANSFER, 0)
+        | np.where(split, FLAG_SPLIT, 0)
+    ).astype(np.uint8)
+    return out
+
+
+def _load_rows(conn, transids: list[int] | None = None) -> np.ndarray:
+    split_where = plain_where = ""
+    params: list[int] = []
+    if transids is not None:
+        placeholders = ",".join("?" * len(transids))
+        split_where = f"WHERE t1.TRANSID IN ({placeholders})"
+        plain_where = f" AND ca.TRANSID IN ({placeholders})"
+        params = list(transids) + list(transids)
+    sql = _ROWS_SQL.format(split_where=split_where, plain_where=plain_where)
+    df = pd.read_sql_query(sql, conn, params=params)
+    return _rows_to_array(df)
+
+
+def _load_versions(conn) -> dict[int, str]:
+    cur = conn.execute("SELECT TRANSID, COALESCE(LASTUPDATEDTIME, '') FROM checkingaccount_v1")
+    return {int(tid): str(ts) for tid, ts in cur.fetchall()}
+
+
+def _split_fingerprint(conn) -> tuple:
+    return tuple(
+        conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(SPLITTRANSID), 0), COALESCE(SUM(SPLITTRANSAMOUNT), 0) "
+            "FROM splittransactions_v1"
+        ).fetchone()
+    )
+
+
+class TransactionStore:
+    def __init__(self, data: np.ndarray | None = None, rates: RateTable | None = None):
+        self._lock = threading.RLock()
+        self._data = data if data is not None else np.zeros(0, dtype=TRANSACTION_DTYPE)
+        self._versions: dict[int, str] = {}
+        self._split_fingerprint: tuple | None = None
+        self.rates = rates
+        self.generation = next(_GENERATIONS)
+        self._reindex()
+
+    @classmethod
+    def load(cls) -> "TransactionStore":
+        store = cls()
+        store.reload()
+        return store
+
+    @classmethod
+    def from_state(
+        cls, data: np.ndarray, versions: dict[int, str], split_fingerprint, rates: RateTable | None = None
+    ) -> "TransactionStore":
+        """Rebuild a store from ``state()`` output (e.g. memory-mapped from the warm cache)."""
+        store = cls(data, rates)
+        store._versions = dict(versions)
+        store._split_fingerprint = tuple(split_fingerprint) if split_fingerprint is not None else None
+        return store
+
+    def state(self) -> tuple[np.ndarray, dict[int, str], tuple | None]:
+        with self._lock:
+            return self._data, dict(self._versions), self._split_fingerprint
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data
+
+    def _reindex(self):
+        data = self._data
+        flags = data["flags"]
+        # Same rows fetch_actuals_for_year counts: no voids, no plain transfers
+        self._actual_mask = ((flags & FLAG_VOID) == 0) & ~(
+            ((flags & FLAG_TRANSFER) != 0) & ((flags & FLAG_SPLIT) == 0)
+        )
+        self._month = ordinal_to_month_index(data["date"])
+        self.categ_ids = np.unique(data["categ"])
+        # Signed cents in base currency; integer when no account needs converting
+        rates = self.rates.rates(data["account"], data["date"]) if self.rates is not None and len(data) else None
+        self._amount = data["amount"] if rates is None else data["amount"] * rates
+
+    def reload(self) -> None:
+        with get_conn() as conn:
+            data = _load_rows(conn)
+            versions = _load_versions(conn)
+            fingerprint = _split_fingerprint(conn)
+            rates = rate_table(conn)
+        with self._lock:
+            self._data = data
+            self._versions = versions
+            self._split_fingerprint = fingerprint
+            self.rates = rates
+            self.generation = next(_GENERATIONS)
+            self._reindex()
+
+    def refresh(self) -> bool:
+        """Re-read only the transactions changed since the last load.
+
+        Returns True when the store content or the currency rates changed.
+        """
+        with get_conn() as conn:
+            versions = _load_versions(conn)
+            fingerprint = _split_fingerprint(conn)
+            rates = rate_table(conn)
+            rates_changed = rates is not self.rates and (
+                self.rates is None or rates.to_state() != self.rates.to_state()
+            )
+            old_versions = self._versions
+            changed = [tid for tid, ts in versions.items() if old_versions.get(tid) != ts]
+            deleted = [tid for tid in old_versions if tid not in versions]
+            if fingerprint != self._split_fingerprint and not changed and not deleted:
+                # Split rows edited without touching their parent: start over
+                data = _load_rows(conn)
+                changed_rows = None
+            elif not changed and not deleted:
+                if not rates_changed:
+                    return False
+                data, changed_rows = self._data, None
+            else:
+                changed_rows = _load_rows(conn, changed) if changed else np.zeros(0, dtype=TRANSACTION_DTYPE)
+        with self._lock:
+            if changed_rows is not None:
+                stale = np.isin(self._data["transid"], np.asarray(changed + deleted, dtype=np.int64))
+                data = np.concatenate([self._data[~stale], changed_rows])
+            self._data = data
+            self._versions = versions
+            self._split_fingerprint = fingerprint
+            self.rates = rates
+            self.generation = next(_GENERATIONS)
+            self._reindex()
+        return True
+
+    def _selection(self, start_month: int, end_month: int, account_ids=None) -> np.ndarray:
+        mask = self._actual_mask & (self._month >= start_month) & (self._month < end_month)
+        if account_ids:
+            mask &= np.isin(self._data["account"], np.asarray([int(a) for a in account_ids]))
+        return mask
+
+    def month_matrix(self, year, account_ids=None) -> tuple[np.ndarray, np.ndarray]:
+        """(CATEGIDs, category x 12 month sums in currency units) for ``year``."""
+        with self._lock:
+            start = month_index(int(year), 1)
+            mask = self._selection(start, start + 12, account_ids)
+            categ_ids = self.categ_ids
+            cat_idx = np.searchsorted(categ_ids, self._data["categ"][mask])
+            period = self._month[mask] - start
+            sums = np.bincount(
+                cat_idx * 12 + period,
+                weights=self._amount[mask],
+                minlength=len(categ_ids) * 12,
+            )
+        return categ_ids, sums.reshape(len(categ_ids), 12) / 100.0
+
+    def year_cube(self, first_year, last_year, account_ids=None) -> tuple[list[str], np.ndarray, np.ndarray]:
+        """Same (years, CATEGIDs, year x month x category) result as ``fetch_actuals_for_years``."""
+        first_year, last_year = int(first_year), int(last_year)
+        years = [str(y) for y in range(first_year, last_year + 1)]
+        with self._lock:
+            start = month_index(first_year, 1)
+            mask = self._selection(start, month_index(last_year + 1, 1), account_ids)
+            categ_ids = self.categ_ids
+            cat_idx = np.searchsorted(categ_ids, self._data["categ"][mask])
+            period = self._month[mask] - start
+            sums = np.bincount(
+                period * len(categ_ids) + cat_idx,
+                weights=self._amount[mask],
+                minlength=len(years) * 12 * len(categ_ids),
+            )
+        return years, categ_ids, sums.reshape(len(years), 12, len(categ_ids)) / 100.0
+
+    def year_rows(self, year, account_ids=None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(rows, month 0-11, base-currency amount) of the transactions counted in ``year``."""
+        with self._lock:
+            start = month_index(int(year), 1)
+            mask = self._selection(start, start + 12, account_ids)
+            return self._data[mask], self._month[mask] - start, self._amount[mask] / 100.0
+
+    def period_matrix(self, year, granularity: str, account_ids=None) -> tuple[np.ndarray, np.ndarray]:
+        """(CATEGIDs, category x bin sums) for the weekly or daily bins of ``periods.period_bins``."""
+        first, step, count = period_bins(year, granularity)
+        with self._lock:
+            start = month_index(int(year), 1)
+            mask = self._selection(start, start + 12, account_ids)
+            categ_ids = self.categ_ids
+            cat_idx = np.searchsorted(categ_ids, self._data["categ"][mask])
+            period = (self._data["date"][mask].astype(np.int64) - first) // step
+            sums = np.bincount(
+                cat_idx * count + period,
+                weights=self._amount[mask],
+                minlength=len(categ_ids) * count,
+            )
+        return categ_ids, sums.reshape(len(categ_ids), count) / 100.0
+
+    def day_matrix(self, year, account_ids=None) -> tuple[np.ndarray, np.ndarray]:
+        """(CATEGIDs, category x day-of-year sums) for ``year``."""
+        return self.period_matrix(year, "day", account_ids)
+
+    def week_matrix(self, year, account_ids=None) -> tuple[np.ndarray, np.ndarray]:
+        """(CATEGIDs, category x week sums) for ``year``, weeks starting on Monday."""
+        return self.period_matrix(year, "week", account_ids)
+
+    def aggregate(self, year, account_ids=None, granularity: str = "month") -> tuple[np.ndarray, np.ndarray]:
+        if granularity == "month":
+            return self.month_matrix(year, account_ids)
+        return self.period_matrix(year, granularity, account_ids)
+
+    def actuals_frame(self, year, account_ids=None) -> pd.DataFrame:
+        """Drop-in replacement for ``fetch_actuals_for_year`` backed by the store."""
+        categ_ids, matrix = self.month_matrix(year, account_ids)
+        cat_idx, month_idx = np.nonzero(matrix)
+        if not len(cat_idx):
+            return pd.DataFrame(columns=["month", "categid", "amount"])
+        months = np.array([f"{int(year)}-{m:02d}" for m in range(1, 13)], dtype=object)
+        return pd.DataFrame(
+            {
+                "month": months[month_idx],
+                "categid": categ_ids[cat_idx].astype(np.int64),
+                "amount": matrix[cat_idx, month_idx],
+            }
+        )
@@ -39,3 +39,4 @@ SUMMARY_BUDGET_NEGATIVE_COLOR = QColor(_STYLE["summary_budget_negative_color"])
 SUMMARY_DIFF_POSITIVE_COLOR = QColor(_STYLE["summary_diff_positive_color"])
 SUMMARY_DIFF_NEGATIVE_BG_COLOR = QColor(_STYLE["summary_diff_negative_bg_color"])
 SUMMARY_DIFF_NEGATIVE_FG_COLOR = QColor(_STYLE["summary_diff_negative_fg_color"])
+SUMMARY_PROJECTED_COLOR = QColor(_STYLE["summary_projected_color"])
@@ -0,0 +1,136 @@
+"""Budget suggestions from the previous years' monthly actuals.
+
+The level is a robust statistic of every monthly actual of the last N years
+(median, trimmed mean or a chosen percentile), optionally scaled by the
+linear trend of the yearly totals and spread over the months with the
+average seasonal profile. Everything is one pass over the
+year x month x category cube of the transaction store.
+
+The same profiles, as non-negative month weights, drive the seasonal
+distribution of yearly budgets (``distribution``); they are cached per
+(year, account set) until the store changes.
+"""
+
+import threading
+
+import numpy as np
+
+from .repository import fetch_actuals_for_years
+
+SUGGEST_METHODS = {"median": "Mediana", "trimmed": "Media troncata", "percentile": "Percentile"}
+# The trend may scale the level between half and double
+TREND_LIMITS = (0.5, 2.0)
+PROFILE_YEARS = 3
+
+_PROFILE_LOCK = threading.Lock()
+_profile_cache: dict[tuple, tuple[int, np.ndarray, np.ndarray]] = {}
+
+
+def _level(values: np.ndarray, method: str, percentile: float, trim: float) -> np.ndarray:
+    """Statistic over axis 0 of (samples x category) monthly actuals."""
+    if method == "median":
+        return np.median(values, axis=0)
+    if method == "percentile":
+        return np.percentile(values, percentile, axis=0)
+    if method == "trimmed":
+        cut = int(len(values) * trim)
+        ordered = np.sort(values, axis=0)
+        return ordered[cut : len(values) - cut].mean(axis=0)
+    raise ValueError(f"Unsupported suggestion method: {method}")
+
+
+def _trend_ratio(history: np.ndarray) -> np.ndarray:
+    """Next-year total over the average total, from a least-squares line per category."""
+    totals = history.sum(axis=1)  # year x category
+    mean = totals.mean(axis=0)
+    if len(totals) < 2:
+        return np.ones(totals.shape[1])
+    t = np.arange(len(totals)) - (len(totals) - 1) / 2.0
+    slope = (t @ (totals - mean)) / (t @ t)
+    projected = mean + slope * (len(totals) - (len(totals) - 1) / 2.0)
+    ratio = np.ones(len(mean))
+    comparable = (np.abs(mean) > 0.005) & (np.sign(projected) == np.sign(mean))
+    np.divide(projected, mean, out=ratio, where=comparable)
+    return np.clip(ratio, *TREND_LIMITS)
+
+
+def _seasonal_shares(history: np.ndarray) -> np.ndarray:
+    """Share of the yearly total per month (12 x category), even where there is no total."""
+    profile = history.mean(axis=0)
+    annual = profile.sum(axis=0)
+    shares = np.full(profile.shape, 1.0 / 12.0)
+    np.divide(profile, annual, out=shares, where=np.abs(annual) > 0.005)
+    return shares
+
+
+def _history(year: int, years: int, account_ids, store) -> tuple[np.ndarray, np.ndarray]:
+    """(CATEGIDs, prior years with any actuals as year x month x category)."""
+    first, last = year - max(int(years), 1), year - 1
+    if store is not None:
+        _, categids, cube = store.year_cube(first, last, account_ids)
+    else:
+        _, categids, cube = fetch_actuals_for_years(first, last, account_ids)
+    return np.asarray(categids, dtype=np.int64), cube[cube.reshape(len(cube), -1).any(axis=1)]
+
+
+def seasonal_profiles(year, account_ids=None, store=None, years: int = PROFILE_YEARS) -> dict[int, np.ndarray]:
+    """CATEGID -> 12 month weights summing to 1, from the previous years' actuals.
+
+    Months that went against the yearly sign weigh nothing. ``store`` is a
+    ``TransactionStore``; without one the actuals come from SQL and the
+    result is not cached.
+    """
+    year = int(year)
+    accounts = tuple(sorted(int(a) for a in account_ids)) if account_ids else ()
+    key = (year, accounts, int(years))
+    cached = None
+    if store is not None:
+        with _PROFILE_LOCK:
+            cached = _profile_cache.get(key)
+    if cached is not None and cached[0] == store.generation:
+        _, categids, weights = cached
+    else:
+        categids, history = _history(year, years, list(accounts) or None, store)
+        if len(history) and len(categids):
+            weights = np.clip(_seasonal_shares(history), 0.0, None)
+            weights = (weights / weights.sum(axis=0)).T
+        else:
+            categids, weights = np.zeros(0, dtype=np.int64), np.zeros((0, 12))
+        if store is not None:
+            with _PROFILE_LOCK:
+                _profile_cache[key] = (store.generation, categids, weights)
+    return {cid: row.copy() for cid, row in zip(categids.tolist(), weights)}
+
+
+def suggest_monthly_budgets(
+    year,
+    account_ids=None,
+    store=None,
+    years: int = 3,
+    method: str = "median",
+    percentile: float = 50.0,
+    trim: float = 0.1,
+    trend: bool = False,
+    seasonal: bool = False,
+    step: float = 1.0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """(CATEGIDs, category x 12 suggested monthly budgets) for ``year``.
+
+    Only the previous years with any actuals count; amounts keep the sign
+    of the actuals and are rounded to ``step``.
+    """
+    categids, history = _history(int(year), years, account_ids, store)
+    if not len(history) or not len(categids):
+        return np.zeros(0, dtype=np.int64), np.zeros((0, 12))
+
+    level = _level(history.reshape(-1, len(categids)), method, percentile, trim)
+    if trend:
+        level = level * _trend_ratio(history)
+    if seasonal:
+        monthly = (_seasonal_shares(history) * level * 12.0).T
+    else:
+        monthly = np.repeat(level[:, None], 12, axis=1)
+    if step:
+        monthly = np.round(monthly / step) * step
+    keep = np.any(monthly != 0, axis=1)
+    return categids[keep], monthly[keep]
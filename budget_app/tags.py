@@ -0,0 +1,149 @@
+"""Tag dimension: actuals per MMEX tag (TAG_V1 / TAGLINK_V1).
+
+A tag is linked either to a whole transaction (REFTYPE 'Transaction', every
+split row included) or to a single split (REFTYPE 'TransactionSplit'); a row
+tagged both ways counts once per tag. Links are joined to the transaction
+store rows with sorted searches, then a year is aggregated with one bincount
+per layout into the (rows x 12) arrays the category grid uses, per tag and
+per (tag, category) pair. Aggregates are cached until the store or the tag
+tables change.
+"""
+
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .db import get_conn
+from .store import TransactionStore
+
+TAG_ROOT_ID = -1
+
+_LINKS_SQL = """
+SELECT tl.REFTYPE, tl.REFID, tl.TAGID
+FROM taglink_v1 tl
+WHERE tl.REFTYPE IN ('Transaction', 'TransactionSplit')
+ORDER BY tl.REFTYPE, tl.REFID
+"""
+
+_FINGERPRINT_SQL = """
+SELECT (SELECT COUNT(*) || ':' || IFNULL(SUM(TAGLINKID + TAGID + REFID), 0) FROM taglink_v1),
+       (SELECT COUNT(*) || ':' || IFNULL(SUM(length(TAGNAME)), 0) || ':' || IFNULL(MAX(TAGID), 0) FROM tag_v1)
+"""
+
+_LOCK = threading.Lock()
+_cache: dict[tuple, tuple[int, tuple, "TagAggregates"]] = {}
+
+
+@dataclass
+class TagAggregates:
+    year: str
+    tag_ids: np.ndarray  # TAGID, sorted
+    tag_names: list[str]
+    tag_actual: np.ndarray  # tag x month
+    pair_tag: np.ndarray  # index into tag_ids
+    pair_categ: np.ndarray  # CATEGID
+    pair_actual: np.ndarray  # pair x month
+
+    def layout(self, category_names: dict[int, str], by_category: bool):
+        """Synthetic (id2name, children_map, root_ids) shaped like ``load_categories``.
+
+        Ids are negative so they never collide with CATEGIDs. Tag rows sit
+        under a single "Tag" header, or are the headers of their categories
+        when ``by_category`` is set.
+        """
+        tag_cids = [TAG_ROOT_ID - 1 - idx for idx in range(len(self.tag_ids))]
+        id2name = {cid: name for cid, name in zip(tag_cids, self.tag_names)}
+        children_map: dict[int, list[int]] = {}
+        if not by_category:
+            id2name[TAG_ROOT_ID] = "Tag"
+            children_map[TAG_ROOT_ID] = sorted(tag_cids, key=lambda cid: id2name[cid].lower())
+            return id2name, children_map, [TAG_ROOT_ID]
+        offset = TAG_ROOT_ID - 1 - len(self.tag_ids)
+        for idx, (tag, categ) in enumerate(zip(self.pair_tag.tolist(), self.pair_categ.tolist())):
+            id2name[offset - idx] = category_names.get(categ, f"(id:{categ})")
+            children_map.setdefault(tag_cids[tag], []).append(offset - idx)
+        roots = [cid for cid in tag_cids if cid in children_map]
+        return id2name, children_map, sorted(roots, key=lambda cid: id2name[cid].lower())
+
+    def frames(self, by_category: bool) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Actual/budget frames for ``layout`` ids; tags have no budgets."""
+        if by_category:
+            matrix = self.pair_actual
+            first = TAG_ROOT_ID - 1 - len(self.tag_ids)
+        else:
+            matrix = self.tag_actual
+            first = TAG_ROOT_ID - 1
+        row_idx, month_idx = np.nonzero(matrix)
+        months = np.array([f"{self.year}-{m:02d}" for m in range(1, 13)], dtype=object)
+        df_actual = pd.DataFrame(
+            {"month": months[month_idx], "categid": first - row_idx, "amount": matrix[row_idx, month_idx]},
+            columns=["month", "categid", "amount"],
+        )
+        df_bud = pd.DataFrame(columns=["BUDGETENTRYID", "BUDGETYEARID", "CATEGID", "PERIOD", "AMOUNT"])
+        return df_actual, df_bud
+
+
+def _join(keys: np.ndarray, refids: np.ndarray, tagids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(row, TAGID) for every link whose REFID (sorted ``refids``) equals the row key."""
+    left = np.searchsorted(refids, keys, side="left")
+    counts = np.searchsorted(refids, keys, side="right") - left
+    rows = np.repeat(np.arange(len(keys)), counts)
+    starts = np.repeat(left - (np.cumsum(counts) - counts), counts)
+    return rows, tagids[starts + np.arange(len(rows))]
+
+
+def _aggregate(year: str, rows, period, amount, links: pd.DataFrame, names: dict[int, str]) -> TagAggregates:
+    pairs = []
+    for reftype, key in (("Transaction", "transid"), ("TransactionSplit", "splitid")):
+        scope = links[links["reftype"] == reftype]
+        refids = scope["refid"].to_numpy(dtype=np.int64)
+        pairs.append(_join(rows[key], refids, scope["tagid"].to_numpy(dtype=np.int64)))
+    row_tag = np.stack([np.concatenate([p[0] for p in pairs]), np.concatenate([p[1] for p in pairs])], axis=1)
+    # A row linked both as transaction and as split counts once per tag
+    row_tag = np.unique(row_tag.reshape(-1, 2), axis=0)
+    row_idx, tagid = row_tag[:, 0], row_tag[:, 1]
+    tag_ids = np.unique(tagid)
+    tag_idx = np.searchsorted(tag_ids, tagid)
+    weights, months = amount[row_idx], period[row_idx]
+    tag_actual = np.bincount(tag_idx * 12 + months, weights=weights, minlength=len(tag_ids) * 12)
+
+    categ_ids = np.unique(rows["categ"])
+    ncat = max(len(categ_ids), 1)
+    pair_key = tag_idx * ncat + np.searchsorted(categ_ids, rows["categ"][row_idx])
+    pair_keys, pair_idx = np.unique(pair_key, return_inverse=True)
+    pair_actual = np.bincount(pair_idx.ravel() * 12 + months, weights=weights, minlength=len(pair_keys) * 12)
+    return TagAggregates(
+        year=year,
+        tag_ids=tag_ids,
+        tag_names=[names.get(tid, f"(tag:{tid})") for tid in tag_ids.tolist()],
+        tag_actual=tag_actual.reshape(len(tag_ids), 12),
+        pair_tag=pair_keys // ncat,
+        pair_categ=categ_ids[pair_keys % ncat] if len(pair_keys) else np.zeros(0, dtype=np.int64),
+        pair_actual=pair_actual.reshape(len(pair_keys), 12),
+    )
+
+
+def tag_aggregates(year, account_ids=None, store: TransactionStore | None = None) -> TagAggregates:
+    """Per-tag and per-(tag, category) monthly actuals of ``year``."""
+    year = str(year)
+    if store is None:
+        store = TransactionStore.load()
+    accounts = tuple(sorted(int(a) for a in account_ids)) if account_ids else ()
+    key = (year, accounts)
+    with get_conn() as conn:
+        fingerprint = tuple(conn.execute(_FINGERPRINT_SQL).fetchone())
+        with _LOCK:
+            cached = _cache.get(key)
+        if cached is not None and cached[:2] == (store.generation, fingerprint):
+            return cached[2]
+        links = pd.read_sql_query(_LINKS_SQL, conn)
+        links.columns = ["reftype", "refid", "tagid"]
+        names = {int(tid): str(name) for tid, name in conn.execute("SELECT TAGID, TAGNAME FROM tag_v1").fetchall()}
+    generation = store.generation
+    rows, period, amount = store.year_rows(year, list(accounts) or None)
+    aggregates = _aggregate(year, rows, period, amount, links, names)
+    with _LOCK:
+        _cache[key] = (generation, fingerprint, aggregates)
+    return aggregates
@@ -0,0 +1,50 @@
+"""Run blocking work off the GUI thread and deliver the result back on it."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="budget-bg")
+
+
+class _Dispatcher(QObject):
+    # Emitted from worker threads; Qt queues the call onto the GUI thread
+    deliver = pyqtSignal(object, object)
+
+    def __init__(self):
+        super().__init__()
+        self.deliver.connect(self._on_deliver)
+
+    def _on_deliver(self, callback, payload):
+        callback(payload)
+
+
+_dispatcher: _Dispatcher | None = None
+
+
+def run_in_background(
+    fn: Callable[..., Any],
+    on_done: Callable[[Any], None],
+    on_error: Callable[[BaseException], None] | None = None,
+    *args,
+) -> Future:
+    """Call ``fn(*args)`` in a worker thread; ``on_done``/``on_error`` run on the GUI thread."""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = _Dispatcher()
+    dispatcher = _dispatcher
+    future = _EXECUTOR.submit(fn, *args)
+
+    def _finished(fut: Future):
+        if fut.cancelled():
+            return
+        exc = fut.exception()
+        if exc is not None:
+            if on_error is not None:
+                dispatcher.deliver.emit(on_error, exc)
+            return
+        dispatcher.deliver.emit(on_done, fut.result())
+
+    future.add_done_callback(_finished)
+    return future
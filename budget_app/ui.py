@@ -5,7 +5,7 @@ from pathlib import Path
 from typing import Any, Callable
 
 from PyQt6.QtGui import QStandardItem, QFont, QBrush, QColor, QCursor, QPainter, QPixmap, QPen, QHelpEvent
-from PyQt6.QtCore import Qt, QRect, QSize, QEvent, QTimer, QPoint
+from PyQt6.QtCore import Qt, QRect, QSize, QEvent, QTimer, QPoint, QAbstractTableModel, QModelIndex
 
 try:
     from .config import PERIOD_CHOICES
@@ -38,6 +38,166 @@ def make_item(text="", editable=False, meta=None, bold=False, color=None):
         item.setData(meta, Qt.ItemDataRole.UserRole)
     return item
 
+class TransactionPageModel(QAbstractTableModel):
+    """Read-only transaction list loaded page by page as the view scrolls.
+
+    ``fetch_page(after, limit)`` returns rows shaped like
+    ``repository.TRANSACTION_COLUMNS`` in key order; ``after`` is the
+    (date, transid, splitid) key of the last loaded row.
+    """
+
+    HEADERS = ["Data", "Conto", "Beneficiario", "Note", "Importo"]
+    _FIELDS = [0, 3, 4, 5, 6]
+
+    def __init__(self, fetch_page: Callable[[Any, int], list[tuple]], page_size: int = 200, parent=None):
+        super().__init__(parent)
+        self._fetch_page = fetch_page
+        self._page_size = page_size
+        self._rows: list[tuple] = []
+        self._exhausted = False
+        self.loaded_total = 0.0
+        self.fetchMore(QModelIndex())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        value = self._rows[index.row()][self._FIELDS[index.column()]]
+        is_amount = index.column() == len(self.HEADERS) - 1
+        if role == Qt.ItemDataRole.DisplayRole:
+            if is_amount:
+                return f"{float(value or 0.0):,.2f}"
+            if index.column() == 0:
+                return str(value or "")[:10]
+            return str(value or "")
+        if role == Qt.ItemDataRole.ToolTipRole and index.column() == 3:
+            return str(value or "") or None
+        if role == Qt.ItemDataRole.TextAlignmentRole and is_amount:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        if role == Qt.ItemDataRole.ForegroundRole and is_amount:
+            amount = float(value or 0.0)
+            return QBrush(QColor("#1b5e20") if amount > 0 else QColor("#b71c1c") if amount < 0 else QColor("#000"))
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        after = self._rows[-1][:3] if self._rows else None
+        page = self._fetch_page(after, self._page_size)
+        if len(page) < self._page_size:
+            self._exhausted = True
+        if not page:
+            return
+        self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(page) - 1)
+        self._rows.extend(page)
+        self.loaded_total += sum(float(row[6] or 0.0) for row in page)
+        self.endInsertRows()
+
+    def all_loaded(self) -> bool:
+        return self._exhausted
+
+
+class PeriodGridModel(QAbstractTableModel):
+    """Read-only category x period grid (weeks or days) over NumPy arrays.
+
+    Cells are formatted only when the view asks for them, so a year of daily
+    columns costs no items. ``rows`` are (label, CATEGID, depth); main rows
+    (depth 0) carry no values. ``actual`` and ``budget`` have one row per
+    entry of ``rows`` and one column per entry of ``periods`` (label, tooltip).
+    """
+
+    def __init__(
+        self,
+        rows: list[tuple[str, int, int]],
+        periods: list[tuple[str, str]],
+        actual,
+        budget,
+        diff_brush: Callable[[float], QBrush],
+        main_brush: QBrush,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self._rows = rows
+        self._periods = periods
+        self._actual = actual
+        self._budget = budget
+        self._actual_total = actual.sum(axis=1)
+        self._budget_total = budget.sum(axis=1)
+        self._diff_brush = diff_brush
+        self._main_brush = main_brush
+        self._font = QFont(UI_FONT_FAMILY, UI_BASE_FONT_SIZE)
+        self._bold_font = QFont(UI_FONT_FAMILY, UI_BOLD_FONT_SIZE)
+        self._bold_font.setBold(True)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._periods) + 2
+
+    def category_at(self, row: int) -> int | None:
+        """CATEGID of a category row; None for main rows."""
+        _, cid, depth = self._rows[row]
+        return cid if depth > 0 else None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation != Qt.Orientation.Horizontal:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            if section == 0:
+                return "Category"
+            return "TOTAL" if section == 1 else self._periods[section - 2][0]
+        if role == Qt.ItemDataRole.ToolTipRole and section >= 2:
+            return self._periods[section - 2][1]
+        return None
+
+    def values(self, row: int, column: int) -> tuple[float, float]:
+        if column == 1:
+            return float(self._actual_total[row]), float(self._budget_total[row])
+        return float(self._actual[row, column - 2]), float(self._budget[row, column - 2])
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        label, _, depth = self._rows[row]
+        if role == Qt.ItemDataRole.FontRole:
+            return self._bold_font if column == 0 or depth == 0 else self._font
+        if depth == 0:
+            if role == Qt.ItemDataRole.DisplayRole and column == 0:
+                return label
+            if role == Qt.ItemDataRole.BackgroundRole:
+                return self._main_brush
+            return None
+        if column == 0:
+            return ("    " * depth) + label if role == Qt.ItemDataRole.DisplayRole else None
+        actual, budget = self.values(row, column)
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{actual:,.2f}" if actual else ""
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return QBrush(QColor("#1b5e20") if actual > 0 else QColor("#b71c1c") if actual < 0 else QColor("#000"))
+        if role == Qt.ItemDataRole.BackgroundRole and budget:
+            return self._diff_brush(actual - budget)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f"Reale: {actual:,.2f}\nBudget: {budget:,.2f}\nDiff: {actual - budget:,.2f}"
+        return None
+
+
 class PeriodDelegate(QStyledItemDelegate):
     def createEditor(self, parent, option, index):
         combo = QComboBox(parent)
@@ -0,0 +1,91 @@
+"""Watch the MMEX database for writes made by other programs (MMEX, OneDrive)."""
+
+import sqlite3
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+from .db import DataVersionProbe
+
+
+class DbChangeWatcher(QObject):
+    """Emit ``changed`` once per burst of writes to the watched DB file.
+
+    File system events restart a debounce timer, so the bursts produced by
+    MMEX and sync clients collapse into one notification. A slow poll of
+    PRAGMA data_version catches commits the file watcher misses.
+    """
+
+    changed = pyqtSignal()
+
+    def __init__(self, parent=None, debounce_ms: int = 1500, poll_ms: int = 10000):
+        super().__init__(parent)
+        self._path: Path | None = None
+        self._probe: DataVersionProbe | None = None
+        self._signature: tuple | None = None
+        self._fs_watcher = QFileSystemWatcher(self)
+        self._fs_watcher.fileChanged.connect(self._on_file_event)
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self._check)
+        self._poll = QTimer(self)
+        self._poll.setInterval(poll_ms)
+        self._poll.timeout.connect(self._on_poll)
+
+    def watch(self, path: Path | None) -> None:
+        self.stop()
+        if not path or not Path(path).exists():
+            return
+        self._path = Path(path)
+        self._fs_watcher.addPath(str(self._path))
+        try:
+            self._probe = DataVersionProbe(self._path)
+        except sqlite3.Error:
+            self._probe = None
+        self._signature = self._current_signature()
+        self._poll.start()
+
+    def stop(self) -> None:
+        self._debounce.stop()
+        self._poll.stop()
+        files = self._fs_watcher.files()
+        if files:
+            self._fs_watcher.removePaths(files)
+        if self._probe is not None:
+            self._probe.close()
+            self._probe = None
+        self._path = None
+        self._signature = None
+
+    def _current_signature(self) -> tuple | None:
+        if self._path is None:
+            return None
+        try:
+            stat = self._path.stat()
+        except OSError:
+            return None
+        version = None
+        if self._probe is not None:
+            try:
+                version = self._probe.version()
+            except sqlite3.Error:
+                version = None
+        return stat.st_size, stat.st_mtime_ns, version
+
+    def _on_file_event(self, _path: str) -> None:
+        # Files replaced on save drop out of the watch list; re-add them
+        if self._path is not None and str(self._path) not in self._fs_watcher.files() and self._path.exists():
+            self._fs_watcher.addPath(str(self._path))
+        self._debounce.start()
+
+    def _on_poll(self) -> None:
+        if not self._debounce.isActive():
+            self._check()
+
+    def _check(self) -> None:
+        signature = self._current_signature()
+        if signature is None or signature == self._signature:
+            return
+        self._signature = signature
+        self.changed.emit()